@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Multi-process contention benchmark for the booking engine.
+
+Several worker processes hammer the same resource with overlapping
+"Approved" allocations, then the script checks the invariant (units in use
+never exceed Resource.quantity on any day) and reports throughput.
+
+Run with:
+    python benchmarks/booking_contention.py --workers 8 --requests 200
+    python benchmarks/booking_contention.py --naive     # unlocked check-then-insert, for comparison
+    DATABASE_URL=postgresql://... python benchmarks/booking_contention.py
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+WINDOW_START = date(2025, 1, 1)
+WINDOW_DAYS = 30
+
+
+def _make_app():
+    from app import create_app
+    return create_app()
+
+
+def _naive_allocate(resource_id, sd, ed, units):
+    """The pre-engine behaviour: check, then insert, with nothing held in between."""
+    from models import db, Resource, Booking
+    from utils.booking_engine import check_capacity
+
+    resource = db.session.get(Resource, resource_id)
+    check_capacity(resource, sd, ed, units)
+    db.session.add(Booking(resource_id=resource_id, start_date=sd, end_date=ed,
+                           quantity=units, status="Approved"))
+    db.session.commit()
+
+
+def worker(resource_id, n_requests, seed, naive, start, out):
+    from models import db
+    from utils.booking_engine import allocate, CapacityError
+
+    app = _make_app()
+    rnd = random.Random(seed)
+    ok = full = errors = 0
+    latencies = []
+
+    with app.app_context():
+        start.wait()  # all workers are imported and ready; start together
+        for _ in range(n_requests):
+            sd = WINDOW_START + timedelta(days=rnd.randrange(WINDOW_DAYS))
+            ed = sd + timedelta(days=rnd.randrange(4))
+            units = rnd.randint(1, 2)
+            t0 = time.perf_counter()
+            try:
+                if naive:
+                    _naive_allocate(resource_id, sd, ed, units)
+                else:
+                    allocate(resource_id, sd, ed, units=units, status="Approved")
+                ok += 1
+            except CapacityError:
+                db.session.rollback()
+                full += 1
+            except Exception:
+                db.session.rollback()
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    out.put((ok, full, errors, latencies))
+
+
+def max_daily_usage(resource_id):
+    from models import Booking
+
+    usage = [0] * (WINDOW_DAYS + 4)
+    rows = Booking.query.filter_by(resource_id=resource_id, status="Approved").all()
+    for b in rows:
+        for d in range((b.start_date - WINDOW_START).days, (b.end_date - WINDOW_START).days + 1):
+            usage[d] += b.quantity or 1
+    return max(usage)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="allocations attempted per worker")
+    parser.add_argument("--quantity", type=int, default=5, help="units of the contended resource")
+    parser.add_argument("--naive", action="store_true", help="skip locking (shows overbooking)")
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not os.environ.get("DATABASE_URL"):
+        tmpdir = tempfile.mkdtemp(prefix="booking-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmpdir) / 'bench.db'}"
+
+    from models import db, Resource
+
+    app = _make_app()
+    with app.app_context():
+        db.create_all()
+        res = Resource(name="Benchmark Projector", category="AV", quantity=args.quantity)
+        db.session.add(res)
+        db.session.commit()
+        resource_id = res.id
+
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    start = ctx.Barrier(args.workers + 1)
+    procs = [ctx.Process(target=worker, args=(resource_id, args.requests, i, args.naive, start, out))
+             for i in range(args.workers)]
+
+    for p in procs:
+        p.start()
+    start.wait()
+    t0 = time.perf_counter()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    ok = sum(r[0] for r in results)
+    full = sum(r[1] for r in results)
+    errors = sum(r[2] for r in results)
+    latencies = sorted(l for r in results for l in r[3])
+    attempts = len(latencies)
+
+    with app.app_context():
+        peak = max_daily_usage(resource_id)
+
+    mode = "naive (no lock)" if args.naive else "locked engine"
+    print(f"Booking contention benchmark — {mode}")
+    print(f"  database:   {app.config['SQLALCHEMY_DATABASE_URI']}")
+    print(f"  workers:    {args.workers} x {args.requests} requests, quantity={args.quantity}")
+    print(f"  results:    {ok} allocated, {full} rejected (full), {errors} errors")
+    print(f"  throughput: {attempts / elapsed:.0f} req/s over {elapsed:.2f}s")
+    print(f"  latency:    p50 {latencies[attempts // 2] * 1000:.1f} ms, "
+          f"p95 {latencies[int(attempts * 0.95)] * 1000:.1f} ms")
+
+    if tmpdir:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    if peak <= args.quantity:
+        print(f"✓ Peak daily usage {peak} <= quantity {args.quantity}")
+    else:
+        print(f"✗ OVERBOOKED: peak daily usage {peak} > quantity {args.quantity}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
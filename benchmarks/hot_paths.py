@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Latency and query-count benchmark for the request hot paths.
+
+For each data size a fresh SQLite file is filled by utils.datagen (fixed
+seed and anchor date, so every run sees the same rows), then each
+scenario is driven through the Flask test client: warm-up requests
+first, then timed ones. Per scenario it records p50/p90/p95/p99 latency
+and the number of SQL statements per request.
+
+Results can be saved as the baseline (benchmarks/baseline.json) and later
+runs compared against it: a scenario regresses when its p50 grows by more
+than --tolerance (and by more than --min-delta-ms, to ignore jitter on
+fast paths) or when it issues more queries. With --gate-tail its p95 may
+not grow by more than twice the tolerance either; tails of the write
+paths follow the disk's fsync latency, so that is opt-in. The script
+exits with status 1 on a regression, so CI can gate on it. Latency
+baselines are machine-specific; query counts are not.
+
+Run with:
+    python benchmarks/hot_paths.py                          # small dataset, compare with baseline.json
+    python benchmarks/hot_paths.py --sizes small,medium --requests 200
+    python benchmarks/hot_paths.py --save-baseline          # accept the current numbers
+    python benchmarks/hot_paths.py --only events_search,event_detail
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, select
+
+from app import create_app
+from config import TestingConfig
+from models import db, Event, Resource
+from utils import datagen
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+ANCHOR = date(2025, 1, 15)
+SIZES = {
+    "tiny": dict(users=50, resources=10, events=30, registrations=2_000, bookings=200),
+    "small": dict(users=500, resources=50, events=300, registrations=30_000, bookings=3_000),
+    "medium": dict(users=5_000, resources=200, events=3_000, registrations=300_000, bookings=30_000),
+    "large": dict(users=20_000, resources=500, events=10_000, registrations=1_000_000, bookings=100_000),
+}
+SEARCH_TERMS = ("robotics", "hack", "music night", "coding workshop", "chess", "quantum summit")
+SORTS = ("date", "title_asc", "title_desc")
+
+SCENARIOS = {}
+
+
+def scenario(name, ok=(200,)):
+    def register(fn):
+        SCENARIOS[name] = (fn, ok)
+        return fn
+    return register
+
+
+# ------------------------------------------------------------------
+# Scenarios: fn(client, rnd, data, i) -> response
+# ------------------------------------------------------------------
+@scenario("events_list")
+def events_list(client, rnd, data, i):
+    return client.get("/events", query_string={"sort": SORTS[i % len(SORTS)]})
+
+
+@scenario("events_search")
+def events_search(client, rnd, data, i):
+    return client.get("/events", query_string={"q": SEARCH_TERMS[i % len(SEARCH_TERMS)]})
+
+
+@scenario("event_detail")
+def event_detail(client, rnd, data, i):
+    return client.get(f"/event/{rnd.choice(data['event_ids'])}")
+
+
+@scenario("api_event")
+def api_event(client, rnd, data, i):
+    return client.get(f"/api/event/{rnd.choice(data['event_ids'])}")
+
+
+@scenario("book_resource", ok=(302,))
+def book_resource(client, rnd, data, i):
+    # The most-booked resources, so the capacity check has overlapping rows to look at
+    start = ANCHOR + timedelta(days=rnd.randint(-30, 30))
+    return client.post("/book-resource", data={
+        "resource_id": rnd.choice(data["resource_ids"][:5]), "name": "Bench", "regno": f"B{i}",
+        "event_name": "Benchmark", "purpose": "load", "quantity": 1,
+        "start_date": start.isoformat(), "end_date": (start + timedelta(days=1)).isoformat(),
+    })
+
+
+@scenario("register_event")
+def register_event(client, rnd, data, i):
+    return client.post("/register-event", data={
+        "event_id": rnd.choice(data["event_ids"]), "name": "Bench Student", "regno": f"BENCH{i}",
+        "email": f"bench{i}@example.edu", "year": "2nd",
+    })
+
+
+@scenario("admin_dashboard")
+def admin_dashboard(client, rnd, data, i):
+    return client.get("/admin/dashboard")
+
+
+# ------------------------------------------------------------------
+# Harness
+# ------------------------------------------------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies, queries):
+    latencies = sorted(latencies)
+    ms = lambda s: round(s * 1000, 3)  # noqa: E731
+    return {
+        "requests": len(latencies),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p90_ms": ms(percentile(latencies, 90)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)),
+        "queries": max(queries),
+    }
+
+
+def run_size(counts, requests=50, warmup=5, seed=42, only=None, log=print):
+    """Fill a fresh database with `counts` rows and measure every scenario on it."""
+    tmpdir = tempfile.mkdtemp(prefix="hot-paths-")
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmpdir) / 'bench.db'}"
+        RESPONSE_CACHE = ""  # measure the work, not the cache
+
+    app = create_app(BenchConfig)
+    results = {}
+    try:
+        with app.app_context():
+            db.create_all()
+            t0 = time.perf_counter()
+            datagen.generate(db.engine, counts, seed=seed, fast=True, anchor=ANCHOR, log=lambda msg: None)
+            log(f"  loaded {sum(counts.values()):,} rows in {time.perf_counter() - t0:.1f}s")
+            data = {
+                "event_ids": list(db.session.scalars(select(Event.id))),
+                # datagen's Zipf popularity puts the busiest resources first
+                "resource_ids": list(db.session.scalars(select(Resource.id).order_by(Resource.id))),
+            }
+
+            statements = [0]
+            def count(*args):
+                statements[0] += 1
+            event.listen(db.engine, "before_cursor_execute", count)
+
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess["is_admin"] = True
+                sess["admin_name"] = "bench"
+
+            for name, (fn, ok) in SCENARIOS.items():
+                if only and name not in only:
+                    continue
+                rnd = random.Random(seed)
+                latencies, queries = [], []
+                gc.collect()
+                gc.disable()  # like timeit: a collection landing in one request is noise, not signal
+                try:
+                    for i in range(warmup + requests):
+                        statements[0] = 0
+                        started = time.perf_counter()
+                        response = fn(client, rnd, data, i)
+                        elapsed = time.perf_counter() - started
+                        if response.status_code not in ok:
+                            raise RuntimeError(f"{name}: HTTP {response.status_code}")
+                        if i >= warmup:
+                            latencies.append(elapsed)
+                            queries.append(statements[0])
+                finally:
+                    gc.enable()
+                results[name] = summarize(latencies, queries)
+
+            event.remove(db.engine, "before_cursor_execute", count)
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=2.0, tail=False):
+    """Regressions of `results` against `baseline` ({size: {scenario: summary}}), as messages."""
+    problems = []
+    for size, scenarios in results.items():
+        for name, now in scenarios.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            checks = [("p50_ms", tolerance)]
+            if tail:
+                checks.append(("p95_ms", 2 * tolerance))  # tails are noisier than the median
+            for key, slack in checks:
+                if (now[key] > before[key] * (1 + slack)
+                        and now[key] - before[key] > min_delta_ms):
+                    problems.append(f"{size}/{name}: {key} {before[key]:.2f} -> {now[key]:.2f}")
+            if now["queries"] > before["queries"]:
+                problems.append(f"{size}/{name}: queries {before['queries']} -> {now['queries']}")
+    return problems
+
+
+def print_table(size, results, baseline):
+    print(f"{'scenario':<16} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'queries':>8}   vs baseline p50")
+    for name, r in results.items():
+        before = baseline.get(size, {}).get(name)
+        delta = f"{(r['p50_ms'] / before['p50_ms'] - 1) * 100:+6.1f}%" if before and before["p50_ms"] else "     -"
+        print(f"{name:<16} {r['p50_ms']:8.2f} {r['p90_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} "
+              f"{r['queries']:8d}   {delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="small", help=f"Comma-separated, from {', '.join(SIZES)}.")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default="", help="Comma-separated scenario names.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline.")
+    parser.add_argument("--output", type=Path, help="Also write the results JSON here.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this.")
+    parser.add_argument("--gate-tail", action="store_true", help="Also fail on p95 regressions.")
+    args = parser.parse_args()
+
+    only = {s for s in args.only.split(",") if s}
+    try:
+        baseline_doc = json.loads(args.baseline.read_text())
+    except (OSError, ValueError):
+        baseline_doc = {}
+    baseline = baseline_doc.get("results", {})
+
+    results = {}
+    for size in args.sizes.split(","):
+        print(f"== {size}: {', '.join(f'{k}={v:,}' for k, v in SIZES[size].items())}")
+        results[size] = run_size(SIZES[size], args.requests, args.warmup, args.seed, only)
+        print_table(size, results[size], baseline)
+
+    doc = {
+        "meta": {
+            "date": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.platform(),
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(doc, indent=2) + "\n")
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({"meta": doc["meta"], "results": merged}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    problems = compare(results, baseline, args.tolerance, args.min_delta_ms, tail=args.gate_tail)
+    if not baseline:
+        print("No baseline to compare with (run with --save-baseline to create one).")
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
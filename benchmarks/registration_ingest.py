@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Load test for /register-event: per-request commits vs write-behind batching.
+
+Each mode gets a fresh SQLite file and N client threads posting
+registrations as fast as they can through the Flask test client.
+
+Run with:
+    python benchmarks/registration_ingest.py --threads 32 --requests 2000
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app
+from config import TestingConfig
+from models import db, Event, Registration
+
+
+def run(mode, n_threads, n_requests, batch_size, interval):
+    tmpdir = tempfile.mkdtemp(prefix="ingest-bench-")
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmpdir) / 'bench.db'}"
+        REGISTRATION_WRITE_BEHIND = mode == "batched"
+        REGISTRATION_BATCH_SIZE = batch_size
+        REGISTRATION_FLUSH_INTERVAL = interval
+        REGISTRATION_ACK_TIMEOUT = 30
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        ev = Event(title="Ripples 2024", category="Ripples")
+        db.session.add(ev)
+        db.session.commit()
+        event_id = ev.id
+
+    counter = iter(range(n_requests))
+    counter_lock = threading.Lock()
+    latencies, failures = [], []
+    start = threading.Barrier(n_threads + 1)
+
+    def client_thread():
+        client = app.test_client()
+        start.wait()
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            t0 = time.perf_counter()
+            res = client.post("/register-event", data={
+                "event_id": event_id, "name": f"Student {i}", "regno": f"R{i}",
+                "email": f"s{i}@college.com", "year": "1st"
+            })
+            latencies.append(time.perf_counter() - t0)
+            if res.status_code != 200:
+                failures.append(res.status_code)
+
+    threads = [threading.Thread(target=client_thread) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    writer = app.extensions.get("registration_writer")
+    if writer:
+        writer.stop()
+    with app.app_context():
+        stored = Registration.query.count()
+        db.engine.dispose()
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"{mode:>8}: {n / elapsed:7.0f} req/s   p50 {latencies[n // 2] * 1000:6.1f} ms   "
+          f"p95 {latencies[int(n * 0.95)] * 1000:6.1f} ms   stored {stored}/{n_requests}   "
+          f"failures {len(failures)}")
+    return stored == n_requests and not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.01, help="flush interval in seconds")
+    args = parser.parse_args()
+
+    print(f"Registration ingest — {args.threads} threads, {args.requests} requests")
+    ok = all([
+        run("commit", args.threads, args.requests, args.batch_size, args.interval),
+        run("batched", args.threads, args.requests, args.batch_size, args.interval),
+    ])
+    print("✓ Every registration stored" if ok else "✗ Lost or failed registrations")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
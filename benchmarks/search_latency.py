@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Search latency: ILIKE scans vs the FTS5 index on a large events table.
+
+Fills a fresh SQLite file with N synthetic events (the FTS triggers index
+them as they are inserted), then runs the same prefix searches through
+utils.search with SEARCH_BACKEND=like and =auto and reports p50/p95 for
+the first page of results, in the order /events would show them.
+
+Run with:
+    python benchmarks/search_latency.py --events 100000
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app
+from config import TestingConfig
+from models import db, Event
+from utils import search
+
+WORDS = ("coding contest workshop robotics quiz dance music drama poster paper hackathon expo "
+         "design startup pitch gaming esports treasure hunt photography film debate chess art "
+         "stall food cultural technical seminar webinar alumni freshers farewell sports cricket").split()
+CATEGORIES = ("Ripples", "Technical", "Non-Technical", "Hackathons", "Expo", "Social", "Sports")
+SYLLABLES = ("ka", "lo", "mi", "ter", "van", "sol", "rid", "pe", "nu", "gra", "shi", "tor", "bel", "qua")
+TERMS = ("hack", "robot", "treasure hunt", "photo", "quiz music", "chess", "zzz")
+
+
+def vocabulary(rnd, size=5000):
+    """Event words plus filler words, weighted so a few are common and most are rare (Zipf)."""
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))))
+    rnd.shuffle(words)
+    return words, [1 / (rank + 1) for rank in range(len(words))]
+
+
+def fill(n, seed=7, chunk=5000):
+    rnd = random.Random(seed)
+    words, weights = vocabulary(rnd)
+    table = Event.__table__
+    for lo in range(0, n, chunk):
+        db.session.execute(table.insert(), [{
+            "title": f"{rnd.choice(WORDS).title()} {rnd.choice(words).title()} {i}",
+            "category": rnd.choice(CATEGORIES),
+            "description_short": " ".join(rnd.choices(words, weights, k=8)),
+            "description_long": " ".join(rnd.choices(words, weights, k=40)),
+        } for i in range(lo, min(lo + chunk, n))])
+    db.session.commit()
+
+
+def measure(app, backend, repeat):
+    app.config["SEARCH_BACKEND"] = backend
+    timings = []
+    with app.test_request_context():
+        for _ in range(repeat):
+            for term in TERMS:
+                t0 = time.perf_counter()
+                query, ranked = search.events(Event.query, term)
+                if not ranked:
+                    query = query.order_by(Event.date.asc())  # what /events falls back to
+                query.limit(25).all()
+                timings.append(time.perf_counter() - t0)
+    timings.sort()
+    n = len(timings)
+    p50, p95 = timings[n // 2], timings[int(n * 0.95)]
+    print(f"{backend:>6}: p50 {p50 * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms")
+    return p50, p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="search-bench-")
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmpdir) / 'bench.db'}"
+
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            t0 = time.perf_counter()
+            fill(args.events)
+            print(f"Search latency — {args.events} events (loaded in {time.perf_counter() - t0:.1f}s), "
+                  f"{len(TERMS)} terms x {args.repeat}")
+        like = measure(app, "like", args.repeat)
+        fts = measure(app, "auto", args.repeat)
+        print(f"FTS speed-up: {like[0] / fts[0]:.1f}x at p50, {like[1] / fts[1]:.1f}x at p95")
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Concurrent write throughput on SQLite: default engine vs ProductionConfig.
+
+Forks --workers processes (like gunicorn workers), each with its own app
+and connection pool on one shared SQLite file. Every worker loops for
+--seconds over a read (GET /api/event/<id>) and a registration
+(POST /register-event), through the Flask test client. Reported per
+profile: committed registrations per second, p50/p95 registration
+latency, and failed requests ("database is locked" and other errors).
+
+Run with:
+    python benchmarks/sqlite_writes.py
+    python benchmarks/sqlite_writes.py --workers 8 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select
+
+from app import create_app
+from config import ProductionConfig, TestingConfig
+from models import db, Registration
+from utils import datagen
+
+from benchmarks.hot_paths import ANCHOR, percentile
+
+PROFILES = {
+    "default": {},
+    "production": ProductionConfig.SQLITE_PRAGMAS,
+}
+COUNTS = dict(users=100, resources=10, events=50, registrations=5_000, bookings=0)
+
+
+def make_config(path, pragmas):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLITE_PRAGMAS = pragmas
+        RESPONSE_CACHE = ""
+        PROPAGATE_EXCEPTIONS = False  # a locked database is a 500 here, as in production
+    return BenchConfig
+
+
+def worker(n, path, pragmas, seconds, start_at, results):
+    app = create_app(make_config(path, pragmas))
+    app.logger.disabled = True
+    client = app.test_client()
+    ok, errors, latencies, i = 0, 0, [], 0
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        i += 1
+        event_id = 1 + (n * 7919 + i) % COUNTS["events"]
+        if client.get(f"/api/event/{event_id}").status_code != 200:
+            errors += 1
+        started = time.perf_counter()
+        response = client.post("/register-event", data={
+            "event_id": event_id, "name": "Bench", "regno": f"W{n}-{i}",
+            "email": f"w{n}-{i}@example.edu", "year": "2nd"})
+        latencies.append(time.perf_counter() - started)
+        if response.status_code == 200:
+            ok += 1
+        else:
+            errors += 1
+    results.put((ok, errors, latencies))
+
+
+def run_profile(name, workers, seconds):
+    tmpdir = tempfile.mkdtemp(prefix="sqlite-writes-")
+    path = Path(tmpdir) / "bench.db"
+    pragmas = PROFILES[name]
+    try:
+        app = create_app(make_config(path, pragmas))
+        with app.app_context():
+            db.create_all()
+            datagen.generate(db.engine, COUNTS, seed=1, fast=True, anchor=ANCHOR, log=lambda msg: None)
+            before = db.session.scalar(select(func.count()).select_from(Registration))
+            db.session.remove()
+            db.engine.dispose()
+
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        start_at = time.time() + 1.0
+        procs = [ctx.Process(target=worker, args=(n, path, pragmas, seconds, start_at, results))
+                 for n in range(workers)]
+        for p in procs:
+            p.start()
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        with app.app_context():
+            committed = db.session.scalar(select(func.count()).select_from(Registration)) - before
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    latencies = sorted(l for _, _, ls in collected for l in ls)
+    return {
+        "writes_per_s": round(committed / seconds, 1),
+        "errors": sum(e for _, e, _ in collected),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.seconds:g}s, read + registration per iteration")
+    print(f"{'profile':<12} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for name in PROFILES:
+        r = run_profile(name, args.workers, args.seconds)
+        print(f"{name:<12} {r['writes_per_s']:9.1f} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['errors']:7d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
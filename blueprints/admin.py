@@ -1,11 +1,20 @@
 # blueprints/admin.py
 
+import json
+from datetime import date
+
 from flask import (
     Blueprint, render_template, request, redirect,
-    url_for, flash, session
+    url_for, flash, session, jsonify, Response, stream_with_context
 )
+from sqlalchemy import func, select
 from models import db, User, Event, Resource, Booking, Registration
 from werkzeug.security import check_password_hash
+from utils.pagination import keyset_page, page_size
+from utils import queries
+from utils import aggregates, availability, export, outbox, resource_import
+from utils.booking_engine import approve, approve_many, reject_many, CapacityError
+from utils.db_routing import use_primary
 
 admin_bp = Blueprint("admin_bp", __name__, template_folder="../templates")
 
@@ -61,32 +70,168 @@ def admin_dashboard():
     if not admin_required():
         return redirect(url_for("admin_bp.admin_login"))
 
-    bookings = Booking.query.order_by(Booking.created_at.desc()).all()
-    registrations = Registration.query.order_by(Registration.created_at.desc()).all()
-    resources = Resource.query.order_by(Resource.name.asc()).all()
-    events = Event.query.order_by(Event.date.asc()).all()
-
+    month, utilization = aggregates.resource_utilization()
     return render_template(
         "admin_dashboard.html",
-        bookings=bookings,
-        registrations=registrations,
-        resources=resources,
-        events=events,
+        counts=dashboard_counts(),
+        top_events=aggregates.event_summary(),
+        usage_month=month,
+        utilization=utilization,
         admin=session.get("admin_name")
     )
 
 
+def dashboard_counts():
+    """All four stat counters in one round trip (aggregate COUNTs, no rows loaded)."""
+    def count(model):
+        return select(func.count()).select_from(model).scalar_subquery()
+
+    row = db.session.execute(select(
+        count(Booking).label("bookings"),
+        count(Registration).label("registrations"),
+        count(Resource).label("resources"),
+        count(Event).label("events"),
+    )).one()
+    return row._asdict()
+
+
+# ---------------------------------------------------------
+#  DASHBOARD SECTIONS (keyset-paginated JSON, loaded on demand)
+# ---------------------------------------------------------
+def _page_response(query, sort_col, id_col, serialize, descending=True):
+    try:
+        rows, next_cursor = keyset_page(
+            query, sort_col, id_col,
+            cursor=request.args.get("cursor"),
+            limit=page_size(request.args.get("limit")),
+            descending=descending
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"items": [serialize(r) for r in rows], "next_cursor": next_cursor})
+
+
+@admin_bp.route("/admin/api/bookings")
+def admin_api_bookings():
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+
+    query = queries.admin_bookings()
+    status = request.args.get("status")
+    if status:
+        query = query.filter(Booking.status == status)
+
+    return _page_response(query, Booking.created_at, Booking.id, lambda b: {
+        "id": b.id,
+        "resource": b.resource.name if b.resource else None,
+        "event_name": b.event_name,
+        "start_date": b.start_date.isoformat() if b.start_date else None,
+        "end_date": b.end_date.isoformat() if b.end_date else None,
+        "status": b.status,
+        "approve_url": url_for("admin_bp.admin_approve", bid=b.id),
+        "reject_url": url_for("admin_bp.admin_reject", bid=b.id)
+    })
+
+
+@admin_bp.route("/admin/api/registrations")
+def admin_api_registrations():
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+
+    query = queries.admin_registrations()
+    event_id = request.args.get("event_id", type=int)
+    if event_id:
+        query = query.filter(Registration.event_id == event_id)
+
+    return _page_response(query, Registration.created_at, Registration.id, lambda r: {
+        "id": r.id,
+        "event": r.event.title if r.event else None,
+        "name": r.name,
+        "regno": r.regno,
+        "email": r.email,
+        "created_at": r.created_at.isoformat() if r.created_at else None
+    })
+
+
+@admin_bp.route("/admin/api/resources")
+def admin_api_resources():
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+
+    return _page_response(queries.listed_resources(), Resource.name, Resource.id, lambda r: {
+        "id": r.id,
+        "name": r.name,
+        "category": r.category,
+        "quantity": r.quantity
+    }, descending=False)
+
+
+# ---------------------------------------------------------
+#  CSV EXPORTS (streamed, formula-safe cells; ?excel=1 adds a BOM)
+# ---------------------------------------------------------
+def _date_arg(name):
+    value = request.args.get(name)
+    return date.fromisoformat(value) if value else None
+
+
+def _csv_response(stmt, filename):
+    excel = request.args.get("excel") == "1"
+    response = Response(stream_with_context(export.stream_csv(stmt, excel=excel)),
+                        mimetype="text/csv; charset=utf-8")
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@admin_bp.route("/admin/export/registrations.csv")
+def admin_export_registrations():
+    if not admin_required():
+        return redirect(url_for("admin_bp.admin_login"))
+
+    try:
+        stmt = export.registrations(
+            event_id=request.args.get("event_id", type=int),
+            date_from=_date_arg("from"),
+            date_to=_date_arg("to"),
+        )
+    except ValueError:
+        return jsonify({"error": "Dates must be YYYY-MM-DD"}), 400
+    return _csv_response(stmt, "registrations.csv")
+
+
+@admin_bp.route("/admin/export/bookings.csv")
+def admin_export_bookings():
+    if not admin_required():
+        return redirect(url_for("admin_bp.admin_login"))
+
+    try:
+        stmt = export.bookings(
+            status=request.args.get("status"),
+            resource_id=request.args.get("resource_id", type=int),
+            event=request.args.get("event"),
+            date_from=_date_arg("from"),
+            date_to=_date_arg("to"),
+        )
+    except ValueError:
+        return jsonify({"error": "Dates must be YYYY-MM-DD"}), 400
+    return _csv_response(stmt, "bookings.csv")
+
+
 # ---------------------------------------------------------
 #  APPROVE BOOKING
 # ---------------------------------------------------------
 @admin_bp.route("/admin/booking/<int:bid>/approve")
+@use_primary
 def admin_approve(bid):
     if not admin_required():
         return redirect(url_for("admin_bp.admin_login"))
 
     booking = Booking.query.get_or_404(bid)
-    booking.status = "Approved"
-    db.session.commit()
+    try:
+        approve(booking)
+    except CapacityError as e:
+        flash(f"Cannot approve booking #{bid}: {e}", "danger")
+        return redirect(url_for("admin_bp.admin_dashboard"))
 
     flash("Booking Approved", "success")
     return redirect(url_for("admin_bp.admin_dashboard"))
@@ -96,18 +241,110 @@ def admin_approve(bid):
 #  REJECT BOOKING
 # ---------------------------------------------------------
 @admin_bp.route("/admin/booking/<int:bid>/reject")
+@use_primary
 def admin_reject(bid):
     if not admin_required():
         return redirect(url_for("admin_bp.admin_login"))
 
     booking = Booking.query.get_or_404(bid)
-    booking.status = "Rejected"
+    if booking.status != "Rejected":
+        booking.status = "Rejected"
+        outbox.enqueue(outbox.booking_notices([booking], "Rejected"))
     db.session.commit()
+    availability.invalidate(booking.resource_id)
 
     flash("Booking Rejected", "info")
     return redirect(url_for("admin_bp.admin_dashboard"))
 
 
+# ---------------------------------------------------------
+#  BULK APPROVE / REJECT (JSON)
+# ---------------------------------------------------------
+def _bulk_booking_ids(payload):
+    """
+    Booking ids from {"ids": [...]} or {"filter": {...}}. A filter selects
+    Pending bookings by resource_id, event (event_name) and a date range
+    (from / to, YYYY-MM-DD) that the booking overlaps.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Send a JSON object with 'ids' or 'filter'")
+    if "ids" in payload:
+        ids = payload["ids"]
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise ValueError("'ids' must be a list of booking ids")
+        return ids
+
+    spec = payload.get("filter")
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError("Send 'ids' or a non-empty 'filter'")
+    stmt = select(Booking.id).where(Booking.status == "Pending")
+    if spec.get("resource_id") is not None:
+        stmt = stmt.where(Booking.resource_id == int(spec["resource_id"]))
+    if spec.get("event"):
+        stmt = stmt.where(Booking.event_name == spec["event"])
+    if spec.get("from"):
+        stmt = stmt.where(Booking.end_date >= date.fromisoformat(spec["from"]))
+    if spec.get("to"):
+        stmt = stmt.where(Booking.start_date <= date.fromisoformat(spec["to"]))
+    return db.session.scalars(stmt).all()
+
+
+@admin_bp.route("/admin/api/bookings/approve", methods=["POST"])
+def admin_bulk_approve():
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+    try:
+        ids = _bulk_booking_ids(request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    approved, conflicts = approve_many(ids) if ids else ([], [])
+    return jsonify({"approved": approved, "conflicts": conflicts})
+
+
+@admin_bp.route("/admin/api/bookings/reject", methods=["POST"])
+def admin_bulk_reject():
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+    try:
+        ids = _bulk_booking_ids(request.get_json(silent=True) or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"rejected": reject_many(ids) if ids else []})
+
+
+# ---------------------------------------------------------
+#  IMPORT RESOURCES (CSV / JSON)
+# ---------------------------------------------------------
+@admin_bp.route("/admin/api/resources/import", methods=["POST"])
+def admin_import_resources():
+    """JSON body, a text/csv body, or a multipart upload in the `file` field (.csv or .json)."""
+    if not session.get("is_admin"):
+        return jsonify({"error": "Admin login required"}), 401
+
+    try:
+        upload = request.files.get("file")
+        if upload is not None:
+            text = upload.read().decode("utf-8-sig")
+            if upload.filename.lower().endswith(".json"):
+                records = resource_import.read_json(json.loads(text))
+            else:
+                records = resource_import.read_csv(text)
+        elif request.is_json:
+            records = resource_import.read_json(request.get_json(silent=True))
+        else:
+            records = resource_import.read_csv(request.get_data(as_text=True))
+        rows = resource_import.validate(records)
+    except resource_import.ImportRowsError as e:
+        return jsonify({"error": str(e), "errors": e.errors}), 400
+    except (UnicodeDecodeError, ValueError):
+        return jsonify({"error": "Could not read the file (expected UTF-8 CSV or JSON)"}), 400
+
+    ids = resource_import.import_resources(rows)
+    return jsonify({"created": len(ids), "ids": sorted(ids)}), 201
+
+
 # ---------------------------------------------------------
 #  ADD RESOURCE (You requested “add resources all at once”)
 # ---------------------------------------------------------
@@ -143,6 +380,7 @@ def admin_add_resource():
 #  DELETE RESOURCE
 # ---------------------------------------------------------
 @admin_bp.route("/admin/resource/<int:rid>/delete")
+@use_primary
 def admin_delete_resource(rid):
     if not admin_required():
         return redirect(url_for("admin_bp.admin_login"))
@@ -1,8 +1,13 @@
 # blueprints/events.py
 
-from flask import Blueprint, render_template, request, jsonify
+from concurrent.futures import TimeoutError as FutureTimeout
+from flask import Blueprint, render_template, request, jsonify, current_app
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
 from models import db, Event, Registration
+from utils import queries, response_cache, search, typeahead
+from utils.conditional import conditional, row_version, table_version
+from utils.write_behind import insert_registrations
 
 events_bp = Blueprint("events_bp", __name__, template_folder="../templates")
 
@@ -11,15 +16,21 @@ events_bp = Blueprint("events_bp", __name__, template_folder="../templates")
 # EVENTS LIST PAGE
 # -------------------------
 @events_bp.route("/events")
+@conditional(table_version(Event))
+@response_cache.cached("event")
 def list_events():
     q = request.args.get("q", "")
     category = request.args.get("category", "")
-    sort = request.args.get("sort", "date")
+    # A search defaults to relevance order; browsing defaults to date
+    sort = request.args.get("sort") or ("relevance" if q else "date")
 
-    evs = Event.query
+    evs = queries.listed_events()
 
+    ranked = False
     if q:
-        evs = evs.filter(Event.title.ilike(f"%{q}%"))
+        evs, ranked = search.events(evs, q, ranked=(sort == "relevance"))
+    if sort == "relevance" and not ranked:
+        sort = "date"
 
     if category:
         evs = evs.filter(Event.category == category)
@@ -37,10 +48,20 @@ def list_events():
     return render_template("events.html", events=events_list, q=q, category=category, sort=sort)
 
 
+# -------------------------
+# TYPEAHEAD SUGGESTIONS (?q=prefix)
+# -------------------------
+@events_bp.route("/api/events/suggestions")
+def event_suggestions():
+    return typeahead.suggestions_response("event", "title")
+
+
 # -------------------------
 # EVENT DETAIL
 # -------------------------
 @events_bp.route("/event/<int:event_id>")
+@conditional(row_version(Event, "event_id"))
+@response_cache.cached("event:{event_id}")
 def event_detail(event_id):
     event = Event.query.get_or_404(event_id)
 
@@ -90,6 +111,8 @@ def event_detail(event_id):
 # EVENT DETAILS API (for AJAX modal)
 # -------------------------
 @events_bp.route("/api/event/<int:event_id>")
+@conditional(row_version(Event, "event_id"))
+@response_cache.cached("event:{event_id}")
 def api_event(event_id):
     event = Event.query.get_or_404(event_id)
 
@@ -116,24 +139,54 @@ def register_event():
 
     event_id = data.get("event_id")
     name = data.get("name")
-    regno = data.get("regno")
-    email = data.get("email")
+    regno = (data.get("regno") or "").strip()
+    email = (data.get("email") or "").strip().lower()
     mobile = data.get("mobile")
     year = data.get("year")
 
     if not (event_id and name and regno and email):
         return jsonify({"error": "Missing required fields"}), 400
 
-    reg = Registration(
-        event_id=event_id,
-        name=name,
-        regno=regno,
-        email=email,
-        mobile=mobile,
-        year=year
-    )
-
-    db.session.add(reg)
-    db.session.commit()
-
-    return jsonify({"message": "Registration successful!"})
+    try:
+        event_id = int(event_id)
+    except ValueError:
+        return jsonify({"error": "Invalid event"}), 400
+
+    # Retried request: one indexed lookup, same answer as the first time
+    idempotency_key = request.headers.get("Idempotency-Key", "").strip()[:64] or None
+    if idempotency_key:
+        existing = db.session.query(Registration.id).filter_by(idempotency_key=idempotency_key).first()
+        if existing:
+            return jsonify({"message": "Registration successful!", "registration_id": existing.id})
+
+    row = {
+        "event_id": event_id,
+        "name": name,
+        "regno": regno,
+        "email": email,
+        "mobile": mobile,
+        "year": year,
+        "idempotency_key": idempotency_key,
+        "created_at": datetime.utcnow()
+    }
+
+    writer = current_app.extensions.get("registration_writer")
+    try:
+        if writer is None:
+            registration_id, created = insert_registrations([row])[0]
+        else:
+            # Write-behind: wait for the batched commit that includes this row
+            registration_id, created = writer.submit(row).result(
+                timeout=current_app.config.get("REGISTRATION_ACK_TIMEOUT", 5)
+            )
+    except FutureTimeout:
+        return jsonify({"error": "Registration is busy, please retry"}), 503
+    except SQLAlchemyError:
+        current_app.logger.exception("Registration for event %s failed", event_id)
+        return jsonify({"error": "Registration could not be saved, please retry"}), 503
+
+    if not created:
+        return jsonify({"message": "You are already registered for this event.",
+                        "registration_id": registration_id, "duplicate": True})
+
+    return jsonify({"message": "Registration successful!", "registration_id": registration_id})
@@ -1,9 +1,11 @@
 # blueprints/resources.py
 
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, session
-from datetime import datetime
-from sqlalchemy import and_, or_
+from datetime import date, datetime, timedelta
 from models import db, Resource, Booking
+from utils import availability, queries, response_cache, search, typeahead
+from utils.conditional import conditional, row_version, table_version
+from utils.booking_engine import allocate, allocate_many, CapacityError
 
 resources_bp = Blueprint("resources_bp", __name__, template_folder="../templates")
 
@@ -12,16 +14,21 @@ resources_bp = Blueprint("resources_bp", __name__, template_folder="../templates
 # RESOURCE LIST PAGE (with search + filters)
 # ---------------------------------------------------------
 @resources_bp.route("/resources")
+@conditional(table_version(Resource))
+@response_cache.cached("resource")
 def resources_page():
     q = request.args.get("q", "")
     category = request.args.get("category", "")
-    sort = request.args.get("sort", "az")
+    sort = request.args.get("sort") or ("relevance" if q else "az")
 
-    res = Resource.query
+    res = queries.listed_resources()
 
-    # search
+    # search (ranked full-text where the database supports it)
+    ranked = False
     if q:
-        res = res.filter(Resource.name.ilike(f"%{q}%"))
+        res, ranked = search.resources(res, q, ranked=(sort == "relevance"))
+    if sort == "relevance" and not ranked:
+        sort = "az"
 
     # category filter
     if category:
@@ -55,21 +62,19 @@ def resources_page():
 
 
 # ---------------------------------------------------------
-# API FOR AJAX SUGGESTIONS
+# TYPEAHEAD SUGGESTIONS (?q=prefix)
 # ---------------------------------------------------------
 @resources_bp.route("/api/resources/suggestions")
 def resource_suggestions():
-    data = [
-        "Projector", "Wireless Mic", "PA System",
-        "Decoration Lights", "Laptop", "Gallery Hall"
-    ]
-    return jsonify({"suggestions": data})
+    return typeahead.suggestions_response("resource", "name")
 
 
 # ---------------------------------------------------------
 # API FOR CART SUPPORT (optional)
 # ---------------------------------------------------------
 @resources_bp.route("/api/resource/<int:rid>")
+@conditional(row_version(Resource, "rid"))
+@response_cache.cached("resource:{rid}")
 def api_get_resource(rid):
     r = Resource.query.get_or_404(rid)
     return jsonify({
@@ -81,6 +86,68 @@ def api_get_resource(rid):
     })
 
 
+# ---------------------------------------------------------
+# AVAILABILITY CALENDAR (free units per day)
+# ---------------------------------------------------------
+MAX_WINDOW_DAYS = 366
+
+
+def _window():
+    """(from, to) from the query string: defaults to the next 30 days, at most MAX_WINDOW_DAYS."""
+    sd = _parse_date(request.args["from"]) if request.args.get("from") else date.today()
+    ed = _parse_date(request.args["to"]) if request.args.get("to") else sd + timedelta(days=29)
+    if ed < sd:
+        raise ValueError("'to' is before 'from'")
+    if (ed - sd).days + 1 > MAX_WINDOW_DAYS:
+        raise ValueError(f"Window is limited to {MAX_WINDOW_DAYS} days")
+    return sd, ed
+
+
+@resources_bp.route("/api/resource/<int:rid>/availability")
+def api_resource_availability(rid):
+    resource = db.session.get(Resource, rid)
+    if resource is None:
+        return jsonify({"error": "Resource not found"}), 404
+    try:
+        sd, ed = _window()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    free = availability.daily_free_units([(resource.id, resource.quantity)], sd, ed)[0]
+    return jsonify({
+        "id": resource.id,
+        "quantity": resource.quantity or 1,
+        "from": sd.isoformat(),
+        "to": ed.isoformat(),
+        "free": free.tolist(),  # one entry per day from `from` to `to`
+    })
+
+
+@resources_bp.route("/api/resources/availability")
+def api_resources_availability():
+    """Several resources at once (?ids=1,2,3 for a cart; all resources without ids)."""
+    try:
+        sd, ed = _window()
+        ids = [int(i) for i in request.args.get("ids", "").split(",") if i.strip()]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = db.session.query(Resource.id, Resource.name, Resource.quantity).order_by(Resource.id)
+    if ids:
+        query = query.filter(Resource.id.in_(ids))
+    resources = query.all()
+
+    free = availability.daily_free_units([(r.id, r.quantity) for r in resources], sd, ed)
+    return jsonify({
+        "from": sd.isoformat(),
+        "to": ed.isoformat(),
+        "resources": [
+            {"id": r.id, "name": r.name, "quantity": r.quantity or 1, "free": days.tolist()}
+            for r, days in zip(resources, free)
+        ],
+    })
+
+
 # ---------------------------------------------------------
 # BOOK A RESOURCE (form submission)
 # ---------------------------------------------------------
@@ -106,49 +173,121 @@ def book_resource():
     start_date = form.get("start_date")
     end_date = form.get("end_date")
 
+    try:
+        units = int(form.get("quantity") or 1)
+    except ValueError:
+        units = 0
+    if units < 1:
+        flash("Please enter a valid quantity", "danger")
+        return redirect(url_for("resources_bp.resources_page"))
+
     # Date validation
     if not start_date or not end_date:
         flash("Please select valid dates", "danger")
         return redirect(url_for("resources_bp.resources_page"))
 
-    sd = datetime.fromisoformat(start_date).date()
-    ed = datetime.fromisoformat(end_date).date()
+    try:
+        sd = datetime.fromisoformat(start_date).date()
+        ed = datetime.fromisoformat(end_date).date()
+    except ValueError:
+        flash("Please select valid dates", "danger")
+        return redirect(url_for("resources_bp.resources_page"))
 
     if sd > ed:
         flash("Start date cannot be after End date", "danger")
         return redirect(url_for("resources_bp.resources_page"))
 
     # ---------------------------------------------------------
-    # CONFLICT DETECTION (Approved bookings only)
+    # CAPACITY CHECK + CREATE BOOKING (one locked transaction)
+    # Approved bookings may not use more than Resource.quantity per day
     # ---------------------------------------------------------
-    conflict = Booking.query.filter(
-        Booking.resource_id == resource_id,
-        Booking.status == "Approved",
-        or_(
-            and_(Booking.start_date <= sd, Booking.end_date >= sd),
-            and_(Booking.start_date <= ed, Booking.end_date >= ed),
-            and_(Booking.start_date >= sd, Booking.end_date <= ed),
+    try:
+        allocate(
+            resource_id, sd, ed, units=units,
+            event_name=event_name,
+            purpose=purpose,
+            email=(email or "").strip().lower() or None,
+            status="Pending"  # Admin will approve
         )
-    ).first()
-
-    if conflict:
-        flash("Resource is already booked for selected dates.", "danger")
+    except LookupError:
+        flash("Invalid resource selected", "danger")
+        return redirect(url_for("resources_bp.resources_page"))
+    except CapacityError as e:
+        flash(f"Resource is already booked for selected dates. {e}", "danger")
         return redirect(url_for("resources_bp.resources_page"))
-
-    # ---------------------------------------------------------
-    # CREATE BOOKING
-    # ---------------------------------------------------------
-    booking = Booking(
-        resource_id=resource_id,
-        event_name=event_name,
-        purpose=purpose,
-        start_date=sd,
-        end_date=ed,
-        status="Pending"  # Admin will approve
-    )
-
-    db.session.add(booking)
-    db.session.commit()
 
     flash("Your booking request is submitted. Admin will approve soon.", "success")
     return redirect(url_for("resources_bp.resources_page"))
+
+
+
+# ---------------------------------------------------------
+# BATCH BOOKING (whole cart in one request / one transaction)
+# ---------------------------------------------------------
+MAX_CART_ITEMS = 50
+
+
+def _parse_date(value):
+    return datetime.fromisoformat(value).date()
+
+
+def _whole_number(value):
+    """int() that refuses to truncate: 2, 2.0 and "2" pass, 2.7, "2.7" and true raise ValueError."""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"Not a whole number: {value!r}")
+    return int(value)
+
+
+@resources_bp.route("/api/bookings/batch", methods=["POST"])
+def book_resources_batch():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object with an items list"}), 400
+    items = data.get("items")
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Cart is empty"}), 400
+    if len(items) > MAX_CART_ITEMS:
+        return jsonify({"error": f"At most {MAX_CART_ITEMS} items per request"}), 400
+
+    # Per-item dates fall back to the cart-wide dates
+    parsed, errors = [], []
+    for i, item in enumerate(items):
+        try:
+            sd = _parse_date(item.get("start_date") or data.get("start_date"))
+            ed = _parse_date(item.get("end_date") or data.get("end_date"))
+            quantity = item.get("quantity")
+            parsed.append({
+                "resource_id": _whole_number(item["resource_id"]),
+                "quantity": 1 if quantity is None or quantity == "" else _whole_number(quantity),
+                "start_date": sd,
+                "end_date": ed,
+            })
+        except (AttributeError, KeyError, TypeError, ValueError):
+            errors.append({"index": i, "error": "Invalid resource, quantity or dates"})
+            continue
+        if sd > ed or parsed[-1]["quantity"] < 1:
+            errors.append({"index": i, "error": "Start date cannot be after End date" if sd > ed
+                           else "Please enter a valid quantity"})
+
+    if errors:
+        return jsonify({"error": "Invalid cart", "items": errors}), 400
+
+    try:
+        ok, results = allocate_many(
+            parsed,
+            status="Pending",
+            event_name=data.get("event_name"),
+            purpose=data.get("purpose"),
+            email=str(data.get("email") or "").strip().lower() or None
+        )
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    for i, result in enumerate(results):
+        result["index"] = i
+
+    if not ok:
+        return jsonify({"error": "Some resources are not available", "items": results}), 409
+
+    return jsonify({"message": "Your booking requests are submitted. Admin will approve soon.",
+                    "items": results}), 201
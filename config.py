@@ -27,6 +27,79 @@ class Config:
         str(BASE_DIR / "all_event_images.zip")
     )
 
+    # In-memory interval tree of approved bookings per resource (per worker)
+    AVAILABILITY_CACHE = os.environ.get("AVAILABILITY_CACHE", "0") == "1"
+    AVAILABILITY_CACHE_TTL = int(os.environ.get("AVAILABILITY_CACHE_TTL", "30"))
+
+    # Write-behind registration ingestion: batch commits from a background flusher
+    REGISTRATION_WRITE_BEHIND = os.environ.get("REGISTRATION_WRITE_BEHIND", "0") == "1"
+    REGISTRATION_BATCH_SIZE = int(os.environ.get("REGISTRATION_BATCH_SIZE", "100"))
+    REGISTRATION_FLUSH_INTERVAL = float(os.environ.get("REGISTRATION_FLUSH_INTERVAL", "0.05"))  # seconds
+    REGISTRATION_ACK_TIMEOUT = float(os.environ.get("REGISTRATION_ACK_TIMEOUT", "5"))  # seconds
+
+    # Event/resource search: "auto" (FTS5 on SQLite, tsvector on PostgreSQL) or "like"
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+
+    # Typeahead prefix index: full rebuild interval and client cache lifetime (seconds)
+    TYPEAHEAD_TTL = int(os.environ.get("TYPEAHEAD_TTL", "300"))
+    TYPEAHEAD_MAX_AGE = int(os.environ.get("TYPEAHEAD_MAX_AGE", "60"))
+
+    # Cache rendered public pages: "" (off), "memory" (per-process LRU) or "filesystem"
+    RESPONSE_CACHE = os.environ.get("RESPONSE_CACHE", "")
+    RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "300"))  # seconds
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", "")  # default: <instance>/response_cache
+
+    # Widths (px) generated by `flask build-images` for static/img
+    IMAGE_WIDTHS = tuple(int(w) for w in os.environ.get("IMAGE_WIDTHS", "160,320,640,1280").split(","))
+
+    # Cache lifetime (seconds) for images served from UPLOADED_IMAGES_ZIP via /media/<name>
+    MEDIA_MAX_AGE = int(os.environ.get("MEDIA_MAX_AGE", "86400"))
+
+    # Cache lifetime (seconds) for fingerprinted assets and hashed image variants
+    ASSET_MAX_AGE = int(os.environ.get("ASSET_MAX_AGE", str(365 * 24 * 3600)))
+
+    # Seed the demo admin/events/resources during `flask bootstrap` (and gunicorn start) when missing
+    BOOTSTRAP_SEED_DEMO = os.environ.get("BOOTSTRAP_SEED_DEMO", "1") == "1"
+
+    # Per-request SQL/template timing (Server-Timing header) and Prometheus metrics at METRICS_PATH ("" hides it)
+    INSTRUMENTATION = os.environ.get("INSTRUMENTATION", "1") == "1"
+    METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+    # Bearer token for scrapers; without it /metrics answers admin sessions only
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))  # log statements slower than this; 0 = off
+
+    # SQLite PRAGMAs set on each new connection, and pool sizing for server databases (None = driver default);
+    # see ProductionConfig for the tuned profile
+    SQLITE_PRAGMAS = {}
+    DB_POOL_SIZE = None
+    DB_MAX_OVERFLOW = None
+    DB_POOL_RECYCLE = None
+
+    # Read replicas (comma-separated URLs) for GET requests; after a write the same client reads from the
+    # primary for REPLICA_STICKY_SECONDS
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "10"))
+
+    # Outgoing mail (utils/email_utils.py); without MAIL_SERVER messages are only logged
+    MAIL_SERVER = os.environ.get("MAIL_SERVER", "")
+    MAIL_PORT = int(os.environ.get("MAIL_PORT", "25"))
+    MAIL_USE_TLS = os.environ.get("MAIL_USE_TLS", "0") == "1"
+    MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
+    MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
+    MAIL_DEFAULT_SENDER = os.environ.get("MAIL_DEFAULT_SENDER", "events@college.local")
+    MAIL_TIMEOUT = float(os.environ.get("MAIL_TIMEOUT", "10"))  # seconds
+
+    # Notification outbox (utils/outbox.py): "thread" drains it inside each web process, "" leaves it to
+    # `flask run-outbox`. Failed sends are retried after OUTBOX_RETRY_BASE * 2^n seconds (capped)
+    OUTBOX_WORKER = os.environ.get("OUTBOX_WORKER", "")
+    OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "50"))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get("OUTBOX_POLL_INTERVAL", "1.0"))  # seconds
+    OUTBOX_LEASE = int(os.environ.get("OUTBOX_LEASE", "300"))  # seconds a claimed batch stays reserved
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+    OUTBOX_RETRY_BASE = int(os.environ.get("OUTBOX_RETRY_BASE", "30"))
+    OUTBOX_RETRY_MAX = int(os.environ.get("OUTBOX_RETRY_MAX", "3600"))
+
     # Enable debug mode through env variable (optional)
     DEBUG = os.environ.get("FLASK_DEBUG", "1") == "1"
 
@@ -35,10 +108,32 @@ class DevelopmentConfig(Config):
     DEBUG = True
 
 
+class TestingConfig(Config):
+    TESTING = True
+    DEBUG = False
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
 class ProductionConfig(Config):
     DEBUG = False
     # In production you should override SECRET_KEY and DATABASE_URL using env variables
 
+    # SQLite, applied to every new connection (utils/engine_profile.py): WAL lets readers run alongside
+    # the single writer, NORMAL only fsyncs at checkpoints, and writers wait for the lock instead of
+    # failing with "database is locked"
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", "65536")),  # negative = KiB, per connection
+    }
+
+    # Connection pool for server databases (PostgreSQL); per worker process
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))  # seconds
+
 
 # Select config based on FLASK_ENV
 def get_config():
@@ -0,0 +1,39 @@
+# conftest.py
+"""
+Shared pytest fixtures: a fresh app + SQLite database per test.
+"""
+
+import pytest
+
+from app import create_app
+from config import TestingConfig
+from models import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+
+    yield app
+
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+        sess["admin_name"] = "admin"
+    return client
@@ -0,0 +1,27 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings, picked up automatically by `gunicorn app:app`.
+
+The database bootstrap (schema + demo data, see utils/bootstrap.py) runs
+once in the master before any worker is forked, so workers import the app
+and start serving without touching the database. Set BOOTSTRAP_ON_START=0
+when deploys run `flask bootstrap` as a separate release step.
+"""
+
+import os
+
+
+def on_starting(server):
+    if os.environ.get("BOOTSTRAP_ON_START", "1") != "1":
+        return
+    from app import create_app
+    from utils import bootstrap
+    try:
+        bootstrap.run(create_app(), log=server.log.info)
+    except bootstrap.SchemaError as e:
+        # Workers would fail on every request that touches a newer column
+        server.log.error("Database bootstrap failed: %s", e)
+        raise SystemExit(1)
+    except Exception:
+        # Same as the old import-time auto-init: report, but still serve
+        server.log.exception("Database bootstrap failed")
@@ -0,0 +1,60 @@
+"""full-text search indexes for events and resources
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 06:12:04.118520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Frozen copies of models.fts_ddl() / models.tsvector_sql() at this revision
+SQLITE_DDL = {
+    'event': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5(title, category, description_short, description_long, content='event', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        'CREATE TRIGGER IF NOT EXISTS event_fts_ai AFTER INSERT ON event BEGIN INSERT INTO event_fts(rowid, title, category, description_short, description_long) VALUES (new.id, new.title, new.category, new.description_short, new.description_long); END',
+        "CREATE TRIGGER IF NOT EXISTS event_fts_ad AFTER DELETE ON event BEGIN INSERT INTO event_fts(event_fts, rowid, title, category, description_short, description_long) VALUES ('delete', old.id, old.title, old.category, old.description_short, old.description_long); END",
+        "CREATE TRIGGER IF NOT EXISTS event_fts_au AFTER UPDATE ON event BEGIN INSERT INTO event_fts(event_fts, rowid, title, category, description_short, description_long) VALUES ('delete', old.id, old.title, old.category, old.description_short, old.description_long); INSERT INTO event_fts(rowid, title, category, description_short, description_long) VALUES (new.id, new.title, new.category, new.description_short, new.description_long); END",
+    ],
+    'resource': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS resource_fts USING fts5(name, category, content='resource', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        'CREATE TRIGGER IF NOT EXISTS resource_fts_ai AFTER INSERT ON resource BEGIN INSERT INTO resource_fts(rowid, name, category) VALUES (new.id, new.name, new.category); END',
+        "CREATE TRIGGER IF NOT EXISTS resource_fts_ad AFTER DELETE ON resource BEGIN INSERT INTO resource_fts(resource_fts, rowid, name, category) VALUES ('delete', old.id, old.name, old.category); END",
+        "CREATE TRIGGER IF NOT EXISTS resource_fts_au AFTER UPDATE ON resource BEGIN INSERT INTO resource_fts(resource_fts, rowid, name, category) VALUES ('delete', old.id, old.name, old.category); INSERT INTO resource_fts(rowid, name, category) VALUES (new.id, new.name, new.category); END",
+    ],
+}
+
+POSTGRES_DDL = {
+    'event': "CREATE INDEX IF NOT EXISTS ix_event_fts ON event USING gin (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(category, '') || ' ' || coalesce(description_short, '') || ' ' || coalesce(description_long, '')))",
+    'resource': "CREATE INDEX IF NOT EXISTS ix_resource_fts ON resource USING gin (to_tsvector('english', coalesce(name, '') || ' ' || coalesce(category, '')))",
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SQLITE_DDL:
+        if dialect == "sqlite":
+            for statement in SQLITE_DDL[table]:
+                op.execute(statement)
+            # Index the rows that existed before the triggers
+            op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        elif dialect == "postgresql":
+            op.execute(POSTGRES_DDL[table])
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SQLITE_DDL:
+        if dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_fts")
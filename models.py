@@ -3,7 +3,10 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, date
 from werkzeug.security import generate_password_hash, check_password_hash
 
-db = SQLAlchemy()
+from utils.db_routing import RoutingSession
+
+# RoutingSession sends read-only requests to DATABASE_REPLICA_URLS when configured
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # ---------------------------------------------------
 # USER MODEL
@@ -42,6 +45,9 @@ class Event(db.Model):
     team_size = db.Column(db.String(100))
     fee = db.Column(db.String(100))
 
+    # Bumped on every change; drives ETag / Last-Modified (utils/conditional.py)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
     registrations = db.relationship("Registration", backref="event", lazy=True)
 
 
@@ -49,6 +55,12 @@ class Event(db.Model):
 # REGISTRATION MODEL
 # ---------------------------------------------------
 class Registration(db.Model):
+    __table_args__ = (
+        # One registration per student per event; retries hit these instead of adding rows
+        db.Index("uq_registration_event_regno", "event_id", "regno", unique=True),
+        db.Index("uq_registration_event_email", "event_id", "email", unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey("event.id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
@@ -59,7 +71,10 @@ class Registration(db.Model):
     mobile = db.Column(db.String(50))
     year = db.Column(db.String(20))
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Client-supplied Idempotency-Key header of the request that created the row
+    idempotency_key = db.Column(db.String(64), unique=True, index=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
 
 # ---------------------------------------------------
@@ -67,11 +82,13 @@ class Registration(db.Model):
 # ---------------------------------------------------
 class Resource(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
+    name = db.Column(db.String(200), nullable=False, index=True)
     category = db.Column(db.String(100))  # Audio, AV, Decoration, Hall, etc.
     image = db.Column(db.String(255))
     quantity = db.Column(db.Integer, default=1)
 
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
     bookings = db.relationship("Booking", backref="resource", lazy=True)
 
 
@@ -79,17 +96,121 @@ class Resource(db.Model):
 # BOOKING MODEL
 # ---------------------------------------------------
 class Booking(db.Model):
+    __table_args__ = (
+        # Conflict checks filter on resource + status and compare both dates
+        db.Index("ix_booking_resource_status_dates", "resource_id", "status", "start_date", "end_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     resource_id = db.Column(db.Integer, db.ForeignKey("resource.id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
 
     event_name = db.Column(db.String(200))  # e.g., Ripples Coding Contest
     purpose = db.Column(db.Text)
+    email = db.Column(db.String(120))  # requester; gets the approval / rejection notice
 
     start_date = db.Column(db.Date)
     end_date = db.Column(db.Date)
+    quantity = db.Column(db.Integer, default=1, server_default="1")  # units of the resource
 
     status = db.Column(db.String(30), default="Pending")  
     # Pending / Approved / Rejected
 
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+# ---------------------------------------------------
+# AGGREGATES (maintained by utils/aggregates.py)
+# ---------------------------------------------------
+class EventStats(db.Model):
+    """Registrations per event and study year ("" when not given)."""
+    __tablename__ = "event_stats"
+
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id", ondelete="CASCADE"), primary_key=True)
+    year = db.Column(db.String(20), primary_key=True, default="")
+    registrations = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ResourceUsage(db.Model):
+    """Approved booking days per resource and calendar month (first day of the month)."""
+    __tablename__ = "resource_usage"
+
+    resource_id = db.Column(db.Integer, db.ForeignKey("resource.id", ondelete="CASCADE"), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)
+    approved_days = db.Column(db.Integer, nullable=False, default=0)  # booking-days
+    unit_days = db.Column(db.Integer, nullable=False, default=0)      # booking-days x quantity
+
+
+# ---------------------------------------------------
+# NOTIFICATION OUTBOX (drained by utils/outbox.py)
+# ---------------------------------------------------
+class NotificationOutbox(db.Model):
+    """An email to send, written in the same transaction as the change it announces."""
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # The worker claims due rows: status in (pending, sending) and next_attempt_at <= now
+        db.Index("ix_notification_outbox_due", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)        # registration_confirmed, booking_approved, ...
+    recipient = db.Column(db.String(120), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)  # what the message template needs
+
+    status = db.Column(db.String(20), nullable=False, default="pending")  # pending / sending / sent / failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+
+# ---------------------------------------------------
+# FULL-TEXT SEARCH INDEXES
+# ---------------------------------------------------
+# SQLite: FTS5 external-content tables mirroring the searchable columns,
+# kept in sync by triggers. PostgreSQL: GIN indexes on the tsvector of the
+# same columns. utils/search.py builds the matching queries.
+FTS_COLUMNS = {
+    "event": ("title", "category", "description_short", "description_long"),
+    "resource": ("name", "category"),
+}
+
+
+def fts_ddl(table):
+    """SQLite statements creating `<table>_fts` and its sync triggers."""
+    cols = FTS_COLUMNS[table]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({col_list}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def tsvector_sql(table):
+    """PostgreSQL document expression; utils/search.py must build the same one."""
+    parts = " || ' ' || ".join(f"coalesce({c}, '')" for c in FTS_COLUMNS[table])
+    return f"to_tsvector('english', {parts})"
+
+
+for _model in (Event, Resource):
+    _name = _model.__tablename__
+    for _stmt in fts_ddl(_name):
+        db.event.listen(_model.__table__, "after_create", db.DDL(_stmt).execute_if(dialect="sqlite"))
+    db.event.listen(_model.__table__, "after_create", db.DDL(
+        f"CREATE INDEX IF NOT EXISTS ix_{_name}_fts ON {_name} USING gin ({tsvector_sql(_name)})"
+    ).execute_if(dialect="postgresql"))
+    db.event.listen(_model.__table__, "before_drop", db.DDL(
+        f"DROP TABLE IF EXISTS {_name}_fts"
+    ).execute_if(dialect="sqlite"))
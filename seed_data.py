@@ -5,6 +5,7 @@ Run with: python seed_data.py
 """
 
 from app import create_app
+from utils import bootstrap
 from models import db, Event, Resource, User
 from datetime import datetime, timedelta
 
@@ -12,6 +13,7 @@ def seed_database():
     """Add sample events, resources, and admin user"""
     
     app = create_app()
+    bootstrap.run(app, seed=False)  # schema only; this script brings its own data
     
     with app.app_context():
         # Clear existing data (optional)
@@ -15,26 +15,51 @@ document.addEventListener("DOMContentLoaded", () => {
 });
 
 /* ============================================================
-   SEARCH BAR — LIVE FILTERING (EVENTS + RESOURCES)
+   SEARCH BAR — TYPEAHEAD (EVENTS + RESOURCES)
+   Suggestions come from the server's prefix index
+   (/api/events/suggestions, /api/resources/suggestions)
    ============================================================ */
-function setupLiveSearch(searchInputId, cardSelector) {
+function setupTypeahead(searchInputId) {
     const searchInput = document.getElementById(searchInputId);
-    if (!searchInput) return;
+    if (!searchInput || !searchInput.dataset.suggestUrl) return;
+
+    const list = document.getElementById(searchInput.getAttribute("list"));
+    const labelKey = searchInput.dataset.suggestLabel || "name";
+    let timer = null;
+    let pending = null;
 
     searchInput.addEventListener("input", () => {
-        let term = searchInput.value.toLowerCase();
-        document.querySelectorAll(cardSelector).forEach(card => {
-            let text = card.innerText.toLowerCase();
-            card.style.display = text.includes(term) ? "block" : "none";
-        });
+        clearTimeout(timer);
+        const term = searchInput.value.trim();
+        if (!term) {
+            list.replaceChildren();
+            return;
+        }
+
+        timer = setTimeout(() => {
+            if (pending) pending.abort();
+            pending = new AbortController();
+            const url = searchInput.dataset.suggestUrl + "?q=" + encodeURIComponent(term);
+
+            fetch(url, { signal: pending.signal })
+                .then(res => res.json())
+                .then(data => {
+                    list.replaceChildren(...data.suggestions.map(item => {
+                        const option = document.createElement("option");
+                        option.value = item[labelKey];
+                        return option;
+                    }));
+                })
+                .catch(() => {});
+        }, 120);
     });
 }
 
 // Events page search
-setupLiveSearch("event-search", ".event-card");
+setupTypeahead("event-search");
 
 // Resource page search
-setupLiveSearch("resource-search", ".resource-card");
+setupTypeahead("resource-search");
 
 /* ============================================================
    CATEGORY SELECT FILTER
@@ -120,7 +145,7 @@ document.addEventListener("click", e => {
    RESOURCE CART HANDLER (FRONTEND LOGIC)
    ============================================================ */
 
-let cart = [];
+let cart = [];  // [{ id, name, quantity }]
 
 function updateCartUI() {
     const list = document.getElementById("cart-items");
@@ -134,11 +159,15 @@ function updateCartUI() {
         let li = document.createElement("li");
         li.className = "cart-list-item";
 
-        li.innerHTML = `
-            <span>${item}</span>
-            <button class="btn btn-sm btn-danger remove-item" data-item="${item}">×</button>
-        `;
+        const label = document.createElement("span");
+        label.textContent = item.quantity > 1 ? `${item.name} × ${item.quantity}` : item.name;
+
+        const remove = document.createElement("button");
+        remove.className = "btn btn-sm btn-danger remove-item";
+        remove.dataset.id = item.id;
+        remove.textContent = "×";
 
+        li.append(label, remove);
         list.appendChild(li);
     });
 
@@ -148,24 +177,47 @@ function updateCartUI() {
 // Handle Add-to-Cart buttons
 document.addEventListener("click", e => {
     if (e.target.classList.contains("add-to-cart")) {
-        let resource = e.target.getAttribute("data-name");
+        const id = e.target.getAttribute("data-id");
+        const existing = cart.find(r => r.id === id);
 
-        if (!cart.includes(resource)) {
-            cart.push(resource);
-            updateCartUI();
+        if (existing) {
+            existing.quantity += 1;
+        } else {
+            cart.push({ id, name: e.target.getAttribute("data-name"), quantity: 1 });
         }
+        updateCartUI();
     }
 });
 
 // Remove items from cart
 document.addEventListener("click", e => {
     if (e.target.classList.contains("remove-item")) {
-        let name = e.target.getAttribute("data-item");
-        cart = cart.filter(r => r !== name);
+        let id = e.target.getAttribute("data-id");
+        cart = cart.filter(r => r.id !== id);
         updateCartUI();
     }
 });
 
+// Book the whole cart in one request (all-or-nothing).
+// `details` holds the shared fields: start_date, end_date, event_name, purpose...
+async function checkoutCart(details) {
+    const res = await fetch("/api/bookings/batch", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+            ...details,
+            items: cart.map(item => ({ resource_id: item.id, quantity: item.quantity }))
+        })
+    });
+    const result = await res.json();
+
+    if (res.ok) {
+        cart = [];
+        updateCartUI();
+    }
+    return { ok: res.ok, ...result };
+}
+
 /* ============================================================
    DARK / LIGHT MODE TOGGLE
    ============================================================ */
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the dashboard aggregates (event_stats / resource_usage) and `flask rebuild-stats`
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from models import db, Booking, Event, EventStats, Registration, Resource, ResourceUsage
+from utils import aggregates, datagen
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([
+            Event(id=1, title="Hackathon", category="Tech", date=date(2025, 3, 1)),
+            Event(id=2, title="Expo", category="Expo", date=date(2025, 3, 2)),
+            Resource(id=1, name="Projector", category="AV", quantity=2),
+        ])
+        db.session.commit()
+
+
+def _event_stats():
+    return {(r.event_id, r.year): r.registrations for r in EventStats.query if r.registrations}
+
+
+def _usage():
+    return {(r.resource_id, r.month): (r.approved_days, r.unit_days)
+            for r in ResourceUsage.query if r.approved_days}
+
+
+def _register(client, event_id, regno, year="2nd"):
+    return client.post("/register-event", data={
+        "event_id": event_id, "name": "S", "regno": regno, "email": f"{regno}@x.edu", "year": year})
+
+
+def _rebuilt(app):
+    """Incremental state, then the same after a full recompute."""
+    with app.app_context():
+        incremental = _event_stats(), _usage()
+        with db.engine.begin() as conn:
+            aggregates.rebuild(conn)
+        db.session.expire_all()
+        return incremental, (_event_stats(), _usage())
+
+
+def test_month_spans():
+    assert list(aggregates.month_spans(date(2025, 1, 30), date(2025, 3, 1))) == [
+        (date(2025, 1, 1), 2), (date(2025, 2, 1), 28), (date(2025, 3, 1), 1)]
+    assert list(aggregates.month_spans(date(2025, 2, 2), date(2025, 2, 1))) == []
+
+
+def test_registrations_are_counted_once_per_year(app, client, catalog):
+    _register(client, 1, "R1")
+    _register(client, 1, "R2", year="1st")
+    _register(client, 1, "R1")  # duplicate: not counted again
+    _register(client, 2, "R3", year="")
+    with app.app_context():
+        assert _event_stats() == {(1, "2nd"): 1, (1, "1st"): 1, (2, ""): 1}
+
+        # ORM updates and deletes move the counts too
+        reg = Registration.query.filter_by(regno="R2").one()
+        reg.year = "2nd"
+        db.session.commit()
+        assert _event_stats() == {(1, "2nd"): 2, (2, ""): 1}
+        db.session.delete(Registration.query.filter_by(regno="R3").one())
+        db.session.commit()
+        assert _event_stats() == {(1, "2nd"): 2}
+
+
+def test_approve_and_reject_move_resource_usage(app, admin_client, catalog):
+    with app.app_context():
+        db.session.add(Booking(id=1, resource_id=1, event_name="E", quantity=2,
+                               start_date=date(2025, 1, 30), end_date=date(2025, 2, 2)))
+        db.session.commit()
+        assert _usage() == {}
+
+    admin_client.get("/admin/booking/1/approve")
+    with app.app_context():
+        assert _usage() == {(1, date(2025, 1, 1)): (2, 4), (1, date(2025, 2, 1)): (2, 4)}
+
+    admin_client.get("/admin/booking/1/reject")
+    with app.app_context():
+        assert _usage() == {}
+
+
+def test_rolled_back_writes_leave_no_trace(app, catalog):
+    with app.app_context():
+        db.session.add(Registration(event_id=1, name="S", regno="R9", email="r9@x.edu", year="3rd"))
+        db.session.flush()
+        db.session.rollback()
+        assert _event_stats() == {}
+
+
+def test_core_bulk_bookings_are_recorded(app, catalog):
+    from utils.booking_engine import allocate_many
+    with app.app_context():
+        ok, _ = allocate_many([{"resource_id": 1, "start_date": date(2025, 4, 1), "end_date": date(2025, 4, 3),
+                                "quantity": 1}], status="Approved", event_name="E")
+        assert ok
+        assert _usage() == {(1, date(2025, 4, 1)): (3, 3)}
+
+
+def test_rebuild_matches_incremental_counts(app, client, catalog):
+    for i in range(6):
+        _register(client, 1 + i % 2, f"R{i}", year=("1st", "2nd", "3rd")[i % 3])
+    incremental, rebuilt = _rebuilt(app)
+    assert incremental == rebuilt
+
+
+def test_generated_data_is_aggregated(app):
+    with app.app_context():
+        datagen.generate(db.engine, {"users": 20, "resources": 5, "events": 10, "registrations": 500,
+                                     "bookings": 200}, seed=3, anchor=date(2025, 1, 15), log=lambda msg: None)
+        assert sum(_event_stats().values()) == 500
+        approved = db.session.execute(
+            select(Booking.resource_id).where(Booking.status == "Approved")).all()
+        assert bool(_usage()) == bool(approved)
+    incremental, rebuilt = _rebuilt(app)
+    assert incremental == rebuilt
+
+
+def test_cli_and_dashboard(app, admin_client, catalog):
+    with app.app_context():
+        db.session.add(Registration(event_id=2, name="S", regno="R1", email="r1@x.edu", year="4th"))
+        db.session.commit()
+        db.session.execute(EventStats.__table__.delete())  # drift
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["rebuild-stats"])
+    assert result.exit_code == 0, result.output
+    assert "event_stats: 1 rows" in result.output
+
+    page = admin_client.get("/admin/dashboard").get_data(as_text=True)
+    assert "Top Events by Registrations" in page
+    assert "4th: 1" in page and "Projector" in page
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test fingerprinted static assets and their caching headers
+"""
+
+import gzip
+import json
+
+import pytest
+
+from utils import assets
+from utils.images import ManifestFile
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css" / "site.css").write_text("body { color: red; }\n" * 50)
+    (tmp_path / "js" / "app.js").write_text("console.log('hi');\n" * 50)
+    return tmp_path
+
+
+@pytest.fixture
+def built_app(app, static_dir):
+    assets.build(static_dir, log=lambda m: None)
+    app.static_folder = str(static_dir)
+    app.extensions["asset_manifest"] = ManifestFile(static_dir / "dist" / "manifest.json")
+    return app
+
+
+def test_build_fingerprints_and_compresses(static_dir):
+    manifest = assets.build(static_dir, log=lambda m: None)
+    target = manifest["css/site.css"]
+    assert target.startswith("css/site.") and target.endswith(".css") and len(target) == len("css/site.12345678.css")
+
+    dist = static_dir / "dist"
+    assert gzip.decompress((dist / (target + ".gz")).read_bytes()) == (static_dir / "css" / "site.css").read_bytes()
+    assert json.loads((dist / "manifest.json").read_text()) == manifest
+
+
+def test_changed_file_gets_new_name_and_prune_drops_old(static_dir):
+    old = assets.build(static_dir, log=lambda m: None)["js/app.js"]
+    (static_dir / "js" / "app.js").write_text("console.log('changed');\n")
+    new = assets.build(static_dir, log=lambda m: None)["js/app.js"]
+    assert new != old and (static_dir / "dist" / old).exists()  # kept for pages rendered before the deploy
+
+    assets.build(static_dir, prune=True, log=lambda m: None)
+    assert not (static_dir / "dist" / old).exists() and not (static_dir / "dist" / (old + ".gz")).exists()
+    assert (static_dir / "dist" / new).exists()
+
+
+def test_asset_url_resolves_fingerprint(built_app):
+    with built_app.test_request_context():
+        assert assets.asset_url("css/site.css").startswith("/static/dist/css/site.")
+        assert assets.asset_url("css/unknown.css") == "/static/css/unknown.css"
+
+
+@pytest.mark.parametrize("accept, encoding", [("gzip, deflate", "gzip"), ("", None)])
+def test_serves_precompressed_with_immutable_cache(built_app, static_dir, accept, encoding):
+    client = built_app.test_client()
+    with built_app.test_request_context():
+        url = assets.asset_url("js/app.js")
+
+    res = client.get(url, headers={"Accept-Encoding": accept})
+    assert res.status_code == 200
+    assert res.headers.get("Content-Encoding") == encoding
+    assert res.headers["Content-Type"].startswith("text/javascript")
+    assert res.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert "Accept-Encoding" in res.headers["Vary"]
+    body = gzip.decompress(res.data) if encoding else res.data
+    assert body == (static_dir / "js" / "app.js").read_bytes()
+
+
+def test_image_variants_are_immutable(built_app, static_dir):
+    (static_dir / "img" / "variants").mkdir(parents=True)
+    (static_dir / "img" / "variants" / "hall-320-abc.webp").write_bytes(b"RIFF")
+    res = built_app.test_client().get("/static/img/variants/hall-320-abc.webp")
+    assert res.headers["Cache-Control"] == "public, max-age=31536000, immutable"
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test the hot-path benchmark harness (benchmarks/hot_paths.py)
+"""
+
+import json
+
+from benchmarks import hot_paths
+
+
+def test_every_scenario_runs_and_counts_queries():
+    results = hot_paths.run_size(hot_paths.SIZES["tiny"], requests=3, warmup=1, log=lambda msg: None)
+    assert set(results) == set(hot_paths.SCENARIOS)
+    for name, summary in results.items():
+        assert summary["requests"] == 3
+        assert 0 < summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+        assert summary["queries"] >= 1, name
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert hot_paths.percentile(values, 50) == 50
+    assert hot_paths.percentile(values, 95) == 95
+    assert hot_paths.percentile([7], 99) == 7
+
+
+def test_compare_flags_slowdowns_and_extra_queries():
+    base = {"small": {"event_detail": {"p50_ms": 4.0, "p95_ms": 6.0, "queries": 2}}}
+    same = {"small": {"event_detail": {"p50_ms": 4.5, "p95_ms": 7.0, "queries": 2}}}
+    slower = {"small": {"event_detail": {"p50_ms": 9.0, "p95_ms": 7.0, "queries": 2}}}
+    chattier = {"small": {"event_detail": {"p50_ms": 4.0, "p95_ms": 6.0, "queries": 3}}}
+
+    assert hot_paths.compare(same, base) == []
+    assert hot_paths.compare(slower, base) == ["small/event_detail: p50_ms 4.00 -> 9.00"]
+    assert hot_paths.compare(chattier, base) == ["small/event_detail: queries 2 -> 3"]
+    tail = {"small": {"event_detail": {"p50_ms": 4.0, "p95_ms": 20.0, "queries": 2}}}
+    assert hot_paths.compare(tail, base) == []
+    assert hot_paths.compare(tail, base, tail=True) == ["small/event_detail: p95_ms 6.00 -> 20.00"]
+    # Sub-threshold jitter on a fast path is not a regression
+    assert hot_paths.compare({"small": {"event_detail": {"p50_ms": 5.5, "p95_ms": 6.0, "queries": 2}}},
+                             base, tolerance=0.25, min_delta_ms=2.0) == []
+
+
+def test_stored_baseline_covers_every_scenario():
+    baseline = json.loads(hot_paths.BASELINE.read_text())["results"]
+    assert set(baseline["small"]) == set(hot_paths.SCENARIOS)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Test resource booking conflict detection
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models import db, Resource, Booking
+from utils.availability import IntervalTree
+
+
+def test_interval_tree_matches_brute_force():
+    rnd = random.Random(7)
+    intervals = []
+    for i in range(500):
+        start = rnd.randint(0, 1000)
+        intervals.append((start, start + rnd.randint(0, 30), i))
+    tree = IntervalTree(intervals)
+
+    for _ in range(300):
+        qs = rnd.randint(-10, 1040)
+        qe = qs + rnd.randint(0, 20)
+        expected = {p for s, e, p in intervals if s <= qe and e >= qs}
+        assert set(tree.overlapping(qs, qe)) == expected
+        assert (tree.first_overlap(qs, qe) is not None) == bool(expected)
+
+
+def test_interval_tree_empty():
+    assert IntervalTree([]).first_overlap(1, 5) is None
+
+
+def _booking_form(resource_id, sd, ed):
+    return {"resource_id": resource_id, "name": "Asha", "regno": "R1", "email": "a@college.com",
+            "event_name": "Ripples", "start_date": sd.isoformat(), "end_date": ed.isoformat()}
+
+
+@pytest.fixture(params=[False, True], ids=["sql", "interval-cache"])
+def booking_app(request, app):
+    if request.param:
+        app.config["AVAILABILITY_CACHE"] = True
+        from utils import availability
+        availability.init_app(app)
+    with app.app_context():
+        res = Resource(name="Main Hall", category="Hall", quantity=1)
+        db.session.add(res)
+        db.session.flush()
+        db.session.add(Booking(resource_id=res.id, start_date=date(2024, 12, 10),
+                               end_date=date(2024, 12, 12), status="Approved"))
+        db.session.commit()
+        app.resource_id = res.id
+    return app
+
+
+@pytest.mark.parametrize("sd,ed,conflict", [
+    (date(2024, 12, 1), date(2024, 12, 9), False),
+    (date(2024, 12, 13), date(2024, 12, 20), False),
+    (date(2024, 12, 8), date(2024, 12, 10), True),    # overlaps the start
+    (date(2024, 12, 12), date(2024, 12, 15), True),   # overlaps the end
+    (date(2024, 12, 11), date(2024, 12, 11), True),   # inside
+    (date(2024, 12, 1), date(2024, 12, 31), True),    # covers it
+])
+def test_book_resource_conflicts(booking_app, sd, ed, conflict):
+    client = booking_app.test_client()
+    client.post("/book-resource", data=_booking_form(booking_app.resource_id, sd, ed))
+    with booking_app.app_context():
+        pending = Booking.query.filter_by(status="Pending").count()
+    assert pending == (0 if conflict else 1)
+
+
+def test_book_resource_rejects_malformed_dates(app, client):
+    form = dict(_booking_form(1, date(2024, 12, 1), date(2024, 12, 2)), start_date="bad")
+    res = client.post("/book-resource", data=form)
+    assert res.status_code == 302
+    with client.session_transaction() as sess:
+        assert ("danger", "Please select valid dates") in sess["_flashes"]
+    with app.app_context():
+        assert Booking.query.count() == 0
+
+
+def test_approval_invalidates_cache(booking_app):
+    client = booking_app.test_client()
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+    sd, ed = date(2024, 12, 20), date(2024, 12, 21)
+    client.post("/book-resource", data=_booking_form(booking_app.resource_id, sd, ed))
+    with booking_app.app_context():
+        bid = Booking.query.filter_by(status="Pending").one().id
+    client.get(f"/admin/booking/{bid}/approve")
+
+    client.post("/book-resource", data=_booking_form(booking_app.resource_id, sd, ed))
+    with booking_app.app_context():
+        assert Booking.query.filter_by(status="Pending").count() == 0
+
+
+def test_overlap_query_uses_composite_index(app):
+    from sqlalchemy import text
+    from utils.availability import approved_overlaps
+
+    with app.app_context():
+        query = approved_overlaps(1, date(2024, 1, 1), date(2024, 1, 2))
+        sql = str(query.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(str(r) for r in db.session.execute(text("EXPLAIN QUERY PLAN " + sql)))
+    assert "ix_booking_resource_status_dates" in plan
+
+
+def _resource(app, quantity, approved=()):
+    with app.app_context():
+        res = Resource(name="Projector", category="AV", quantity=quantity)
+        db.session.add(res)
+        db.session.flush()
+        for sd, ed, units in approved:
+            db.session.add(Booking(resource_id=res.id, start_date=sd, end_date=ed,
+                                   quantity=units, status="Approved"))
+        db.session.commit()
+        return res.id
+
+
+def test_allocate_counts_units_per_day(app):
+    from utils.booking_engine import allocate, CapacityError
+
+    # 3 projectors: 1 out on Dec 1-5, 1 out on Dec 4-8 -> only Dec 4-5 has 2 in use
+    rid = _resource(app, 3, [(date(2024, 12, 1), date(2024, 12, 5), 1),
+                             (date(2024, 12, 4), date(2024, 12, 8), 1)])
+    with app.app_context():
+        allocate(rid, date(2024, 12, 1), date(2024, 12, 3), units=2, status="Approved")
+        with pytest.raises(CapacityError) as err:
+            allocate(rid, date(2024, 12, 5), date(2024, 12, 6), units=2)
+        assert err.value.available == 1
+        allocate(rid, date(2024, 12, 5), date(2024, 12, 6), units=1)
+        allocate(rid, date(2024, 12, 9), date(2024, 12, 9), units=3)
+
+
+def test_approve_rechecks_capacity(app):
+    from utils.booking_engine import allocate, approve, CapacityError
+
+    rid = _resource(app, 2)
+    with app.app_context():
+        first = allocate(rid, date(2024, 12, 1), date(2024, 12, 2), units=2)
+        second = allocate(rid, date(2024, 12, 2), date(2024, 12, 3), units=1)
+        approve(first)
+        with pytest.raises(CapacityError):
+            approve(second)
+        assert db.session.get(Booking, second.id).status == "Pending"
+
+
+def test_concurrent_allocations_never_overbook(app):
+    import threading
+    from utils.booking_engine import allocate, CapacityError
+
+    rid = _resource(app, 3)
+    results = []
+
+    def worker():
+        with app.app_context():
+            try:
+                allocate(rid, date(2024, 12, 1), date(2024, 12, 2), status="Approved")
+                results.append("ok")
+            except CapacityError:
+                results.append("full")
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count("ok") == 3
+    assert results.count("full") == 7
+    with app.app_context():
+        assert Booking.query.filter_by(resource_id=rid, status="Approved").count() == 3
+
+
+def _cart(*items, **fields):
+    return dict({"start_date": "2024-12-01", "end_date": "2024-12-03", "event_name": "Ripples"},
+                items=[{"resource_id": rid, "quantity": q} for rid, q in items], **fields)
+
+
+def test_batch_booking_creates_all_in_one_transaction(app, client):
+    from utils.query_counter import QueryCounter
+
+    rids = [_resource(app, 2) for _ in range(10)]
+    with app.app_context():
+        with QueryCounter(db.engine) as qc:
+            res = client.post("/api/bookings/batch", json=_cart(*[(rid, 1) for rid in rids]))
+    assert res.status_code == 201
+    assert all(item["ok"] and item["booking_id"] for item in res.get_json()["items"])
+    # lock + resources, one conflict query, one bulk insert — not one of each per item
+    assert qc.count <= 4
+
+    with app.app_context():
+        assert Booking.query.filter_by(status="Pending").count() == 10
+
+
+def test_batch_booking_is_all_or_nothing(app, client):
+    free = _resource(app, 2)
+    busy = _resource(app, 2, [(date(2024, 12, 2), date(2024, 12, 2), 2)])
+
+    res = client.post("/api/bookings/batch", json=_cart((free, 1), (busy, 1)))
+    assert res.status_code == 409
+    items = res.get_json()["items"]
+    assert items[0]["ok"] is True
+    assert items[1] == {**items[1], "ok": False, "available": 0, "index": 1}
+
+    with app.app_context():
+        assert Booking.query.filter_by(status="Pending").count() == 0
+
+
+def test_batch_counts_earlier_cart_items(app, client):
+    rid = _resource(app, 2)
+    res = client.post("/api/bookings/batch", json=_cart((rid, 1), (rid, 2)))
+    assert res.status_code == 409
+    assert [i["ok"] for i in res.get_json()["items"]] == [True, False]
+
+
+def test_batch_rejects_invalid_items(client):
+    assert client.post("/api/bookings/batch", json={"items": []}).status_code == 400
+    res = client.post("/api/bookings/batch", json=_cart((1, 1), start_date="2024-12-05"))
+    assert res.status_code == 400
+    res = client.post("/api/bookings/batch", json=_cart((1, 0), (1, -2), (1, 2.7), (1, "2.7"), (1, True)))
+    assert res.status_code == 400
+    assert [i["index"] for i in res.get_json()["items"]] == [0, 1, 2, 3, 4]
+    assert client.post("/api/bookings/batch", json=[{"resource_id": 1}]).status_code == 400
+
+
+def test_batch_with_unknown_resource_is_not_found(app, client):
+    rid = _resource(app, 2)
+    res = client.post("/api/bookings/batch", json=_cart((rid, 1), (rid + 100, 1)))
+    assert res.status_code == 404
+    assert res.get_json()["error"] == f"Resource {rid + 100} not found"
+    with app.app_context():
+        assert Booking.query.count() == 0
+
+
+def test_availability_calendar_counts_free_units(app, client):
+    # 3 projectors: 1 out on Dec 1-5, 2 out on Dec 4-8, a pending one ignored
+    rid = _resource(app, 3, [(date(2024, 12, 1), date(2024, 12, 5), 1),
+                             (date(2024, 12, 4), date(2024, 12, 8), 2)])
+    with app.app_context():
+        db.session.add(Booking(resource_id=rid, start_date=date(2024, 12, 2), end_date=date(2024, 12, 2),
+                               quantity=3, status="Pending"))
+        db.session.commit()
+
+    res = client.get(f"/api/resource/{rid}/availability?from=2024-11-30&to=2024-12-09")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert (data["from"], data["to"], data["quantity"]) == ("2024-11-30", "2024-12-09", 3)
+    assert data["free"] == [3, 2, 2, 2, 0, 0, 1, 1, 1, 3]
+
+
+@pytest.mark.parametrize("in_list_limit", [50, 0], ids=["in-list", "scan"])
+def test_availability_calendar_matches_per_day_count(app, client, monkeypatch, in_list_limit):
+    from utils import availability
+    monkeypatch.setattr(availability, "IN_LIST_LIMIT", in_list_limit)
+
+    rnd = random.Random(3)
+    start = date(2025, 1, 1)
+    booked = []
+    for _ in range(60):
+        sd = start + timedelta(days=rnd.randint(-20, 60))
+        booked.append((sd, sd + timedelta(days=rnd.randint(0, 10)), rnd.randint(1, 2)))
+    rid = _resource(app, 40, booked)
+    other = _resource(app, 1, [(start, start, 1)])
+
+    res = client.get(f"/api/resources/availability?ids={other},{rid}&from=2025-01-01&to=2025-02-28")
+    rows = {r["id"]: r["free"] for r in res.get_json()["resources"]}
+    expected = []
+    for i in range(59):
+        day = start + timedelta(days=i)
+        expected.append(40 - sum(u for sd, ed, u in booked if sd <= day <= ed))
+    assert rows[rid] == expected
+    assert rows[other][:2] == [0, 1]
+
+
+def test_availability_calendar_rejects_bad_windows(app, client):
+    rid = _resource(app, 1)
+    assert client.get(f"/api/resource/{rid}/availability?from=2025-02-01&to=2025-01-01").status_code == 400
+    assert client.get(f"/api/resource/{rid}/availability?from=2025-01-01&to=2026-06-01").status_code == 400
+    assert client.get(f"/api/resource/{rid}/availability?from=soon").status_code == 400
+    assert client.get("/api/resource/999/availability").status_code == 404
+    assert len(client.get(f"/api/resource/{rid}/availability").get_json()["free"]) == 30
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test side-effect-free startup and the one-shot database bootstrap
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import create_app
+from config import TestingConfig
+from models import db, Event, Resource, User
+from utils import bootstrap
+from utils.startup import parse_importtime
+
+ROOT = Path(__file__).resolve().parent
+
+
+def _env(db_path):
+    return dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", FLASK_APP="app")
+
+
+def _config(db_path):
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+    return _Config
+
+
+def test_import_and_create_app_do_not_touch_the_database(tmp_path):
+    db_path = tmp_path / "untouched.db"
+    probe = ("import sys, app; assert 'models' not in sys.modules and 'flask_migrate' not in sys.modules; "
+             "app.create_app(); application = app.app; "
+             "assert 'flask_migrate' not in sys.modules and 'alembic' not in sys.modules")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=_env(db_path),
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert not db_path.exists()
+
+
+def test_bootstrap_creates_stamps_and_seeds_once(tmp_path):
+    db_path = tmp_path / "boot.db"
+    app = create_app(_config(db_path))
+    bootstrap.run(app, seed=True, log=lambda msg: None)
+    bootstrap.run(app, seed=True, log=lambda msg: None)  # second deploy: nothing to do
+
+    with app.app_context():
+        assert "alembic_version" in inspect(db.engine).get_table_names()
+        assert db.session.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0008"
+        assert Event.query.count() == 5
+        assert Resource.query.count() == 10
+        assert User.query.filter_by(email="admin@example.com").count() == 1
+        db.engine.dispose()
+
+
+def test_bootstrap_without_seed_leaves_tables_empty(tmp_path):
+    app = create_app(_config(tmp_path / "bare.db"))
+    bootstrap.run(app, seed=False, log=lambda msg: None)
+    with app.app_context():
+        assert Event.query.count() == 0
+        db.engine.dispose()
+
+
+def test_concurrent_bootstraps_seed_once(tmp_path):
+    db_path = tmp_path / "race.db"
+    procs = [subprocess.Popen([sys.executable, "-m", "flask", "bootstrap"], cwd=ROOT, env=_env(db_path),
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+             for _ in range(3)]
+    outputs = [p.communicate(timeout=60)[0] for p in procs]
+    assert all(p.returncode == 0 for p in procs), outputs
+    assert sum("Seeded sample events." in out for out in outputs) == 1
+
+    app = create_app(_config(db_path))
+    with app.app_context():
+        assert Event.query.count() == 5
+        assert Resource.query.count() == 10
+        db.engine.dispose()
+
+
+def test_unique_registration_migration_keeps_removed_duplicates(tmp_path, capfd):
+    from flask_migrate import Migrate, upgrade
+
+    app = create_app(_config(tmp_path / "dupes.db"))
+    Migrate(app, db, directory=bootstrap.MIGRATIONS_DIR)
+    with app.app_context():
+        upgrade(directory=bootstrap.MIGRATIONS_DIR, revision="0003")
+        db.session.execute(text(
+            "INSERT INTO registration (id, event_id, name, regno, email) VALUES "
+            "(1, 7, 'A', 'R1', 'Asha@X.edu '), (2, 7, 'A', ' R1', 'a2@x.edu'), "
+            "(3, 7, 'B', 'R2', 'asha@x.edu'), (4, 8, 'C', 'R1', 'c@x.edu'), (5, 8, 'D', 'R2', '  ')"))
+        db.session.commit()
+        upgrade(directory=bootstrap.MIGRATIONS_DIR, revision="0004")
+
+        rows = db.session.execute(text("SELECT id, regno, email FROM registration ORDER BY id")).all()
+        assert [tuple(r) for r in rows] == [(1, "R1", "asha@x.edu"), (4, "R1", "c@x.edu"), (5, "R2", None)]
+        kept = db.session.execute(text("SELECT id, regno, email FROM registration_duplicates_0004 ORDER BY id")).all()
+        assert [tuple(r) for r in kept] == [(2, " R1", "a2@x.edu"), (3, "R2", "asha@x.edu")]  # as they were
+        db.engine.dispose()
+    assert "Removed 2 duplicate registration(s) of event 7" in capfd.readouterr().err
+
+
+def test_bootstrap_migrates_a_pre_migration_database(tmp_path):
+    from flask_migrate import Migrate, upgrade
+
+    app = create_app(_config(tmp_path / "legacy.db"))
+    Migrate(app, db, directory=bootstrap.MIGRATIONS_DIR)
+    with app.app_context():
+        upgrade(directory=bootstrap.MIGRATIONS_DIR, revision="0001")
+        db.session.execute(text("DROP TABLE alembic_version"))  # as left by the old create_all()
+        db.session.execute(text("INSERT INTO event (id, title, category) VALUES (1, 'Old', 'Tech')"))
+        db.session.commit()
+
+    bootstrap.run(app, seed=False, log=lambda msg: None)
+    with app.app_context():
+        assert db.session.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0008"
+        assert Event.query.one().title == "Old"
+        db.engine.dispose()
+
+
+def test_bootstrap_refuses_an_unknown_unversioned_schema(tmp_path):
+    app = create_app(_config(tmp_path / "odd.db"))
+    with app.app_context():
+        db.session.execute(text("CREATE TABLE event (id INTEGER PRIMARY KEY, title TEXT)"))
+        db.session.commit()
+    with pytest.raises(bootstrap.SchemaError):
+        bootstrap.run(app, seed=False, log=lambda msg: None)
+
+
+def test_startup_profile_needs_at_least_one_run(app):
+    result = app.test_cli_runner().invoke(args=["startup-profile", "--runs", "0"])
+    assert result.exit_code == 2 and "--runs" in result.output
+
+
+def test_parse_importtime_sums_self_time_per_package():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     sqlalchemy.sql",
+        "import time:       250 |        350 |   sqlalchemy",
+        "import time:        40 |         40 | models",
+    ])
+    assert parse_importtime(stderr) == pytest.approx({"sqlalchemy": 0.00035, "models": 0.00004})
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test bulk booking approval / rejection and resource import
+"""
+
+import io
+from datetime import date
+
+import pytest
+
+from models import db, Booking, Resource, ResourceUsage
+from utils import aggregates
+
+
+@pytest.fixture
+def pending(app):
+    """2 projectors; three pending requests on overlapping days and one on other dates."""
+    with app.app_context():
+        projector = Resource(id=1, name="Projector", category="AV", quantity=2)
+        db.session.add(projector)
+        db.session.flush()
+        for i, (sd, ed, units, event) in enumerate([
+            (date(2025, 3, 1), date(2025, 3, 3), 1, "Hackathon"),
+            (date(2025, 3, 2), date(2025, 3, 4), 1, "Hackathon"),
+            (date(2025, 3, 3), date(2025, 3, 3), 1, "Expo"),      # third unit on Mar 3: conflict
+            (date(2025, 4, 1), date(2025, 4, 2), 2, "Expo"),
+        ], 1):
+            db.session.add(Booking(id=i, resource_id=1, start_date=sd, end_date=ed, quantity=units,
+                                   event_name=event, status="Pending"))
+        db.session.commit()
+
+
+def _statuses():
+    return {b.id: b.status for b in Booking.query.order_by(Booking.id)}
+
+
+def _usage():
+    return {(r.resource_id, r.month): (r.approved_days, r.unit_days) for r in ResourceUsage.query if r.approved_days}
+
+
+def test_bulk_approve_checks_the_batch_against_itself(app, admin_client, pending):
+    res = admin_client.post("/admin/api/bookings/approve", json={"ids": [1, 2, 3, 4, 99]})
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["approved"] == [1, 2, 4]
+    assert [(c["id"], c["available"]) for c in data["conflicts"]] == [(3, 0)]
+
+    with app.app_context():
+        assert _statuses() == {1: "Approved", 2: "Approved", 3: "Pending", 4: "Approved"}
+        assert _usage() == {(1, date(2025, 3, 1)): (6, 6), (1, date(2025, 4, 1)): (2, 4)}
+
+    # Approving again changes nothing
+    again = admin_client.post("/admin/api/bookings/approve", json={"ids": [1, 2]}).get_json()
+    assert again == {"approved": [], "conflicts": []}
+
+
+def test_bulk_approve_reports_bookings_of_deleted_resources(app, admin_client, pending):
+    with app.app_context():
+        db.session.add(Booking(id=5, resource_id=42, start_date=date(2025, 3, 1), end_date=date(2025, 3, 1),
+                               quantity=1, status="Pending"))
+        db.session.commit()
+    res = admin_client.post("/admin/api/bookings/approve", json={"ids": [1, 5]})
+    assert res.status_code == 200
+    assert res.get_json() == {"approved": [1], "conflicts": [{"id": 5, "available": 0, "error": "Resource not found"}]}
+    with app.app_context():
+        assert _statuses()[5] == "Pending"
+
+
+def test_bulk_approve_by_filter(app, admin_client, pending):
+    res = admin_client.post("/admin/api/bookings/approve",
+                            json={"filter": {"event": "Expo", "from": "2025-03-01", "to": "2025-03-31"}})
+    assert res.get_json()["approved"] == [3]
+    with app.app_context():
+        assert _statuses()[3] == "Approved" and _statuses()[4] == "Pending"
+
+
+def test_bulk_reject_releases_units(app, admin_client, pending):
+    admin_client.post("/admin/api/bookings/approve", json={"ids": [1, 2]})
+    res = admin_client.post("/admin/api/bookings/reject", json={"ids": [2, 3]})
+    assert sorted(res.get_json()["rejected"]) == [2, 3]
+
+    with app.app_context():
+        assert _statuses() == {1: "Approved", 2: "Rejected", 3: "Rejected", 4: "Pending"}
+        assert _usage() == {(1, date(2025, 3, 1)): (3, 3)}
+        with db.engine.begin() as conn:
+            aggregates.rebuild(conn)
+        assert _usage() == {(1, date(2025, 3, 1)): (3, 3)}
+
+
+def test_bulk_endpoints_validate_input(app, admin_client, pending):
+    assert admin_client.post("/admin/api/bookings/approve", json={}).status_code == 400
+    assert admin_client.post("/admin/api/bookings/approve", json={"ids": "1,2"}).status_code == 400
+    res = admin_client.post("/admin/api/bookings/reject", json=[1, 2])
+    assert res.status_code == 400 and "error" in res.get_json()
+    assert admin_client.post("/admin/api/bookings/reject",
+                             json={"filter": {"from": "March"}}).status_code == 400
+
+    assert app.test_client().post("/admin/api/bookings/approve", json={"ids": [1]}).status_code == 401
+
+
+def test_import_resources_from_json(app, admin_client):
+    admin_client.get("/api/resources/suggestions?q=spe")  # builds the index; the import must update it
+    res = admin_client.post("/admin/api/resources/import", json={"resources": [
+        {"name": "Speaker", "category": "Audio", "quantity": 4},
+        {"name": "Banner"},
+    ]})
+    assert res.status_code == 201
+    assert res.get_json()["created"] == 2
+
+    with app.app_context():
+        rows = {r.name: (r.category, r.quantity, r.image) for r in Resource.query}
+    assert rows == {"Speaker": ("Audio", 4, "placeholder.jpg"), "Banner": (None, 1, "placeholder.jpg")}
+    assert "Speaker" in admin_client.get("/api/resources/suggestions?q=spe").get_data(as_text=True)
+
+
+def test_import_resources_from_csv_upload(app, admin_client):
+    body = "\ufeffName,Category,Quantity,Notes\nMic,Audio,6,wireless\nStage,Hall,,\n".encode("utf-8")
+    res = admin_client.post("/admin/api/resources/import",
+                            data={"file": (io.BytesIO(body), "resources.csv")},
+                            content_type="multipart/form-data")
+    assert res.status_code == 201
+    with app.app_context():
+        assert {r.name: r.quantity for r in Resource.query} == {"Mic": 6, "Stage": 1}
+
+
+def test_import_is_all_or_nothing(app, admin_client):
+    res = admin_client.post("/admin/api/resources/import", data="name,quantity\nMic,2\n,1\nStage,-3\n",
+                            content_type="text/csv")
+    assert res.status_code == 400
+    assert res.get_json()["errors"] == ["Row 2: name is required", "Row 3: quantity must be a positive integer"]
+    with app.app_context():
+        assert Resource.query.count() == 0
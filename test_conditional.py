@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test ETag / Last-Modified validation on event and resource views
+"""
+
+from datetime import date
+
+import pytest
+
+from models import db, Event, Resource
+from utils.query_counter import QueryCounter
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([
+            Event(title="Hackathon 2024", category="Hackathons", date=date(2024, 12, 28),
+                  description_long="24-hour coding contest."),
+            Resource(name="Projector", category="AV", quantity=3),
+        ])
+        db.session.commit()
+
+
+@pytest.mark.parametrize("url", ["/api/event/1", "/event/1", "/events", "/api/resource/1", "/resources"])
+def test_matching_etag_gets_304(client, catalog, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["ETag"] and first.headers["Last-Modified"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and again.data == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+    since = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+
+def test_304_reads_only_the_version_column(app, client, catalog):
+    etag = client.get("/api/event/1").headers["ETag"]
+    with app.app_context(), QueryCounter(db.engine) as counter:
+        assert client.get("/api/event/1", headers={"If-None-Match": etag}).status_code == 304
+    assert counter.count == 1
+    assert "updated_at" in counter.statements[0] and "description_long" not in counter.statements[0]
+
+
+def test_changes_move_the_validators(app, client, catalog):
+    detail = client.get("/api/event/1").headers["ETag"]
+    listing = client.get("/events").headers["ETag"]
+
+    with app.app_context():
+        db.session.get(Event, 1).fee = "200"
+        db.session.commit()
+    res = client.get("/api/event/1", headers={"If-None-Match": detail})
+    assert res.status_code == 200 and res.get_json()["fee"] == "200"
+    assert client.get("/events", headers={"If-None-Match": listing}).status_code == 200
+
+    listing = client.get("/events").headers["ETag"]
+    with app.app_context():
+        db.session.add(Event(title="Expo 2024", category="Expo"))
+        db.session.commit()
+    assert client.get("/events", headers={"If-None-Match": listing}).status_code == 200
+
+    listing = client.get("/events").headers["ETag"]
+    with app.app_context():
+        db.session.delete(db.session.get(Event, 2))
+        db.session.commit()
+    assert client.get("/events", headers={"If-None-Match": listing}).status_code == 200
+
+
+def test_missing_row_is_404_without_validators(client, catalog):
+    res = client.get("/api/event/999", headers={"If-None-Match": "*"})
+    assert res.status_code == 404 and "ETag" not in res.headers
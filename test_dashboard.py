@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the admin dashboard counters and its keyset-paginated JSON sections
+"""
+
+import base64
+import json
+from datetime import date, datetime, timedelta
+
+from models import db, Event, Resource, Booking, Registration
+from utils.query_counter import QueryCounter
+
+
+def _seed(app, n_bookings=0, n_regs=0):
+    with app.app_context():
+        ev = Event(title="Ripples 2024", category="Ripples", date=date(2024, 12, 30))
+        resources = [Resource(name=f"Projector {i}", category="AV", quantity=3) for i in range(5)]
+        db.session.add(ev)
+        db.session.add_all(resources)
+        db.session.flush()
+
+        base = datetime(2024, 12, 1)
+        for i in range(n_bookings):
+            # Spread bookings over several resources so lazy loads could not hit the identity map
+            db.session.add(Booking(resource_id=resources[i % 5].id, event_name=f"Event {i}",
+                                   start_date=date(2024, 12, 1), end_date=date(2024, 12, 2),
+                                   created_at=base + timedelta(minutes=i)))
+        for i in range(n_regs):
+            # Several rows share a timestamp so the id tie-breaker matters
+            db.session.add(Registration(event_id=ev.id, name=f"Student {i}", regno=f"R{i}",
+                                        email=f"s{i}@college.com", created_at=base + timedelta(minutes=i // 3)))
+        db.session.commit()
+
+
+def test_dashboard_requires_admin(client):
+    assert client.get("/admin/dashboard").status_code == 302
+    assert client.get("/admin/api/bookings").status_code == 401
+
+
+def test_dashboard_counts(app, admin_client):
+    _seed(app, n_bookings=4, n_regs=7)
+
+    html = admin_client.get("/admin/dashboard").get_data(as_text=True)
+    assert '<div class="stat-number">4</div>' in html
+    assert '<div class="stat-number">7</div>' in html
+
+
+def test_registrations_keyset_pages_cover_every_row_once(app, admin_client):
+    _seed(app, n_regs=23)
+
+    seen, cursor = [], None
+    while True:
+        url = "/admin/api/registrations?limit=5" + (f"&cursor={cursor}" if cursor else "")
+        data = admin_client.get(url).get_json()
+        assert len(data["items"]) <= 5
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 23
+    assert len(set(seen)) == 23
+    # newest first
+    assert seen[0] > seen[-1]
+
+
+def test_resources_page_ascending_by_name(app, admin_client):
+    with app.app_context():
+        db.session.add_all([Resource(name=n, quantity=1) for n in ("Mic", "Hall", "Projector")])
+        db.session.commit()
+
+    data = admin_client.get("/admin/api/resources?limit=2").get_json()
+    assert [r["name"] for r in data["items"]] == ["Hall", "Mic"]
+    data = admin_client.get(f"/admin/api/resources?cursor={data['next_cursor']}").get_json()
+    assert [r["name"] for r in data["items"]] == ["Projector"]
+    assert data["next_cursor"] is None
+
+
+def test_bad_cursor_is_rejected(admin_client):
+    assert admin_client.get("/admin/api/bookings?cursor=garbage").status_code == 400
+    # Well-formed JSON, but not a timestamp where created_at is expected
+    for value in (123, "March"):
+        token = base64.urlsafe_b64encode(json.dumps([value, 1]).encode()).decode()
+        assert admin_client.get(f"/admin/api/registrations?cursor={token}").status_code == 400
+
+
+def _queries_for(app, client, url):
+    with app.app_context():
+        with QueryCounter(db.engine) as qc:
+            assert client.get(url).status_code == 200
+    return qc.count
+
+
+def test_bookings_section_runs_constant_queries(app, admin_client):
+    _seed(app, n_bookings=5, n_regs=5)
+    small = _queries_for(app, admin_client, "/admin/api/bookings?limit=50")
+    regs_small = _queries_for(app, admin_client, "/admin/api/registrations?limit=50")
+
+    _seed(app, n_bookings=40, n_regs=40)
+    assert _queries_for(app, admin_client, "/admin/api/bookings?limit=50") == small == 1
+    assert _queries_for(app, admin_client, "/admin/api/registrations?limit=50") == regs_small == 1
+
+
+def test_dashboard_page_runs_constant_queries(app, admin_client):
+    _seed(app, n_bookings=3)
+    small = _queries_for(app, admin_client, "/admin/dashboard")
+    _seed(app, n_bookings=30, n_regs=30)
+    assert _queries_for(app, admin_client, "/admin/dashboard") == small
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the synthetic data generator behind `flask generate-data`
+"""
+
+from datetime import date
+
+from sqlalchemy import func, inspect, select
+
+from models import db, Booking, Event, Registration, Resource, User
+from utils import datagen
+
+COUNTS = {"users": 50, "resources": 8, "events": 20, "registrations": 3000, "bookings": 200}
+ANCHOR = date(2025, 1, 15)
+
+
+def _generate(fast, counts=COUNTS, seed=7):
+    return datagen.generate(db.engine, counts, seed=seed, chunk=500, fast=fast, anchor=ANCHOR, log=lambda msg: None)
+
+
+def _registrations():
+    return db.session.execute(select(
+        Registration.event_id, Registration.user_id, Registration.name, Registration.regno,
+        Registration.year, Registration.created_at
+    ).order_by(Registration.id)).all()
+
+
+def test_generates_requested_counts_with_valid_references(app):
+    with app.app_context():
+        stats = _generate(fast=False)
+        assert {table: n for table, (n, _) in stats.items()} == {
+            "user": 50, "resource": 8, "event": 20, "registration": 3000, "booking": 200}
+
+        event_ids = set(db.session.scalars(select(Event.id)))
+        user_ids = set(db.session.scalars(select(User.id)))
+        assert set(db.session.scalars(select(Registration.event_id))) <= event_ids
+        assert set(db.session.scalars(select(Registration.user_id))) <= user_ids
+        assert set(db.session.scalars(select(Booking.resource_id))) <= set(db.session.scalars(select(Resource.id)))
+        assert db.session.scalar(select(func.count()).where(Booking.end_date < Booking.start_date)) == 0
+
+
+def test_popularity_is_skewed(app):
+    with app.app_context():
+        _generate(fast=False)
+        counts = sorted(db.session.execute(
+            select(func.count()).select_from(Registration).group_by(Registration.event_id)).scalars(), reverse=True)
+        assert counts[0] > 5 * counts[len(counts) // 2]
+
+
+def test_fast_path_stores_the_same_rows_and_restores_indexes(app):
+    with app.app_context():
+        _generate(fast=False)
+        portable = _registrations()
+
+        for model in (Booking, Registration, Event, Resource, User):
+            db.session.execute(model.__table__.delete())
+        db.session.commit()
+        indexes = {ix["name"] for ix in inspect(db.engine).get_indexes("registration")}
+
+        _generate(fast=True)
+        fast = _registrations()
+        assert len(fast) == len(portable) == 3000
+        # Same seed, same rows: also proves the raw path writes dates the way SQLAlchemy does
+        assert [row[2:] for row in fast] == [row[2:] for row in portable]
+        assert isinstance(fast[0].created_at, type(portable[0].created_at))
+        assert {ix["name"] for ix in inspect(db.engine).get_indexes("registration")} == indexes
+
+
+def test_appending_keeps_unique_keys_unique(app):
+    with app.app_context():
+        _generate(fast=True)
+        _generate(fast=True, counts={"registrations": 1000})  # reuses the existing events
+        assert Registration.query.count() == 4000
+        assert db.session.scalar(select(func.count(func.distinct(Registration.email)))) == 4000
+
+
+def test_cli(app):
+    result = app.test_cli_runner().invoke(args=[
+        "generate-data", "--users", "5", "--resources", "2", "--events", "3",
+        "--registrations", "40", "--bookings", "10", "--fast", "--anchor", "2025-01-15"])
+    assert result.exit_code == 0, result.output
+    assert "registration" in result.output
+    with app.app_context():
+        assert Registration.query.count() == 40
+
+
+def test_demo_rows_come_from_the_seed_file():
+    data = datagen.demo_rows()
+    assert len(data["events"]) == 5 and len(data["resources"]) == 10
+    assert all(isinstance(row["date"], date) for row in data["events"])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test read-replica routing with two SQLite files (primary + replica copy)
+"""
+
+import shutil
+from datetime import date
+
+import pytest
+
+from app import create_app
+from config import ProductionConfig, TestingConfig
+from models import db, Booking, Event, Registration, Resource
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary}"
+        DATABASE_REPLICA_URLS = [f"sqlite:///{replica}"]
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Event(title="Replicated", category="Tech", date=date(2025, 3, 1)))
+        db.session.commit()
+        db.engine.dispose()
+    shutil.copy(primary, replica)  # "replication" up to here
+
+    with app.app_context():
+        # Lagging change: only on the primary
+        db.session.add(Event(title="Primary only", category="Tech", date=date(2025, 3, 2)))
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.engine.dispose()
+    for engine in app.extensions["db_routing"]:
+        engine.dispose()
+
+
+def test_safe_requests_read_from_the_replica(replicated):
+    client = replicated.test_client()
+    assert client.get("/api/event/1").status_code == 200
+    assert client.get("/api/event/2").status_code == 404  # not replicated yet
+    assert "db_primary" not in client.get("/events").headers.get("Set-Cookie", "")
+
+
+def test_search_stays_on_the_replica(replicated):
+    client = replicated.test_client()
+    for url in ("/events?q=replicated", "/events?q=primary", "/resources?q=projector"):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "db_primary" not in response.headers.get("Set-Cookie", "")
+    assert "Primary only" not in client.get("/events?q=primary").get_data(as_text=True)
+
+
+def test_writes_go_to_the_primary_and_stick(replicated):
+    client = replicated.test_client()
+    # The replica connection is query_only, so a misrouted INSERT would fail here
+    response = client.post("/register-event", data={
+        "event_id": 2, "name": "Asha", "regno": "R1", "email": "asha@example.edu", "year": "2nd"})
+    assert response.status_code == 200
+    assert "db_primary=1" in response.headers["Set-Cookie"]
+
+    # Read-your-writes: the same client now sees the primary
+    assert client.get("/api/event/2").status_code == 200
+    # Another client still reads the replica
+    assert replicated.test_client().get("/api/event/2").status_code == 404
+
+    with replicated.app_context():
+        assert Registration.query.count() == 1  # outside requests: primary
+
+
+def test_writing_get_views_use_the_primary(replicated):
+    with replicated.app_context():
+        resource = Resource(name="Projector", category="AV", quantity=1)
+        db.session.add(resource)
+        db.session.flush()
+        db.session.add(Booking(resource_id=resource.id, event_name="E", quantity=1,
+                               start_date=date(2025, 3, 1), end_date=date(2025, 3, 1)))
+        db.session.commit()
+
+    client = replicated.test_client()
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+    assert client.get("/admin/booking/1/approve").status_code == 302
+    with replicated.app_context():
+        assert db.session.get(Booking, 1).status == "Approved"
+
+
+def test_production_pragmas_leave_the_replica_read_only(tmp_path):
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        DATABASE_REPLICA_URLS = [f"sqlite:///{tmp_path / 'primary.db'}"]
+        SQLITE_PRAGMAS = ProductionConfig.SQLITE_PRAGMAS
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    replica = app.extensions["db_routing"][0]
+    with replica.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    replica.dispose()
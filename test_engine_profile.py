@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the engine profile: SQLite PRAGMAs per connection, pool options for server databases
+"""
+
+from flask import Flask
+
+from app import create_app
+from config import ProductionConfig, TestingConfig
+from models import db
+from utils import engine_profile
+
+
+def _pragma(name):
+    return db.session.connection().exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_production_pragmas_apply_to_every_connection(tmp_path):
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'prod.db'}"
+        SQLITE_PRAGMAS = ProductionConfig.SQLITE_PRAGMAS
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+        assert _pragma("journal_mode") == "wal"
+        assert _pragma("synchronous") == 1  # NORMAL
+        assert _pragma("busy_timeout") == ProductionConfig.SQLITE_PRAGMAS["busy_timeout"]
+        assert _pragma("cache_size") == ProductionConfig.SQLITE_PRAGMAS["cache_size"]
+        db.session.remove()
+        db.engine.dispose()
+        # A brand-new connection is tuned again
+        assert _pragma("synchronous") == 1
+        db.engine.dispose()
+
+
+def test_flask_env_production_selects_the_tuned_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv("FLASK_ENV", "production")
+    monkeypatch.setattr(ProductionConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'prod.db'}")
+
+    app = create_app()  # what `gunicorn app:app` runs
+    assert app.config["SQLITE_PRAGMAS"] == ProductionConfig.SQLITE_PRAGMAS
+    with app.app_context():
+        assert _pragma("journal_mode") == "wal"
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_default_profile_leaves_sqlite_alone(app):
+    with app.app_context():
+        assert _pragma("journal_mode") == "delete"
+        assert _pragma("synchronous") == 2  # FULL
+
+
+def test_server_databases_get_pool_options():
+    app = Flask(__name__)
+    app.config.from_object(ProductionConfig)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://event_hub@db/event_hub"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": 20}
+    engine_profile.configure(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {
+        "pool_pre_ping": True, "pool_size": 20,
+        "max_overflow": ProductionConfig.DB_MAX_OVERFLOW, "pool_recycle": ProductionConfig.DB_POOL_RECYCLE}
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///x.db"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {}
+    engine_profile.configure(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {}
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the streamed admin CSV exports
+"""
+
+import csv
+import io
+from datetime import date, datetime
+
+import pytest
+
+from models import db, Booking, Event, Registration, Resource
+
+
+@pytest.fixture
+def rows(app):
+    with app.app_context():
+        hack = Event(title="Hackathon", category="Tech", date=date(2025, 3, 1))
+        expo = Event(title="Expo", category="Expo", date=date(2025, 3, 2))
+        projector = Resource(name="Projector", category="AV", quantity=2)
+        db.session.add_all([hack, expo, projector])
+        db.session.flush()
+        db.session.add_all([
+            Registration(event_id=hack.id, name="Asha", regno="R1", email="asha@x.edu",
+                         created_at=datetime(2025, 1, 10, 9, 30)),
+            Registration(event_id=hack.id, name="=HYPERLINK(1)", regno="R2", email="b@x.edu",
+                         created_at=datetime(2025, 2, 1, 12, 0)),
+            Registration(event_id=expo.id, name="Zoë", regno="R3", email="z@x.edu",
+                         created_at=datetime(2025, 2, 5, 8, 0)),
+            Booking(resource_id=projector.id, event_name="Hackathon", quantity=1, status="Approved",
+                    start_date=date(2025, 3, 1), end_date=date(2025, 3, 2)),
+            Booking(resource_id=projector.id, event_name="Expo", quantity=1, status="Pending",
+                    start_date=date(2025, 4, 1), end_date=date(2025, 4, 1)),
+        ])
+        db.session.commit()
+        return {"hack": hack.id, "expo": expo.id}
+
+
+def _csv(response):
+    assert response.status_code == 200
+    assert response.is_streamed
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True).lstrip("\ufeff"))))
+
+
+def test_requires_admin(client, rows):
+    assert client.get("/admin/export/registrations.csv").status_code == 302
+
+
+def test_registrations_export_and_filters(admin_client, rows):
+    response = admin_client.get("/admin/export/registrations.csv")
+    assert response.headers["Content-Disposition"] == 'attachment; filename="registrations.csv"'
+    data = _csv(response)
+    assert [r["regno"] for r in data] == ["R1", "R2", "R3"]
+    assert data[0]["event"] == "Hackathon" and data[0]["created_at"] == "2025-01-10 09:30:00"
+
+    by_event = _csv(admin_client.get(f"/admin/export/registrations.csv?event_id={rows['hack']}"))
+    assert [r["regno"] for r in by_event] == ["R1", "R2"]
+    by_date = _csv(admin_client.get("/admin/export/registrations.csv?from=2025-02-01&to=2025-02-01"))
+    assert [r["regno"] for r in by_date] == ["R2"]
+    assert admin_client.get("/admin/export/registrations.csv?from=soon").status_code == 400
+
+
+def test_formulas_are_always_defused(admin_client, rows):
+    plain = admin_client.get("/admin/export/registrations.csv").get_data(as_text=True)
+    assert not plain.startswith("\ufeff") and "'=HYPERLINK" in plain
+
+    body = admin_client.get("/admin/export/registrations.csv?excel=1").get_data()
+    assert body.startswith("\ufeff".encode())
+    text = body.decode("utf-8-sig")
+    assert "'=HYPERLINK" in text and "Zoë" in text
+
+
+def test_bookings_export_filters(admin_client, rows):
+    assert len(_csv(admin_client.get("/admin/export/bookings.csv"))) == 2
+    approved = _csv(admin_client.get("/admin/export/bookings.csv?status=Approved"))
+    assert [(b["event_name"], b["resource"]) for b in approved] == [("Hackathon", "Projector")]
+    # Date range keeps bookings overlapping it
+    april = _csv(admin_client.get("/admin/export/bookings.csv?from=2025-03-15&to=2025-04-30"))
+    assert [b["event_name"] for b in april] == ["Expo"]
+    assert [b["event_name"] for b in _csv(admin_client.get("/admin/export/bookings.csv?event=Expo"))] == ["Expo"]
+
+
+def test_rows_are_streamed_in_batches(app, rows):
+    from utils import export
+    with app.test_request_context():
+        chunks = list(export.stream_csv(export.registrations(), batch=1))
+    assert len(chunks) == 4  # header + one chunk per row
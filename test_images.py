@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the responsive image build step and template helpers
+"""
+
+import json
+
+import pytest
+from PIL import Image
+
+from utils import images
+
+
+@pytest.fixture
+def img_dir(tmp_path):
+    Image.new("RGB", (900, 600), "orange").save(tmp_path / "stage.jpg")
+    Image.new("RGBA", (200, 200), (0, 0, 0, 0)).save(tmp_path / "logo.png")
+    (tmp_path / "notes.txt").write_text("not an image")
+    return tmp_path
+
+
+def test_build_writes_variants_and_manifest(img_dir):
+    built, skipped, removed = images.build(img_dir, widths=(160, 320, 640, 1280), workers=2, log=lambda m: None)
+    assert (built, skipped, removed) == (2, 0, 0)
+
+    manifest = json.loads((img_dir / "variants" / "manifest.json").read_text())
+    stage = manifest["stage.jpg"]
+    # Never upscaled: 1280 is dropped, the original width takes its place
+    assert sorted(int(w) for w in stage["variants"]["webp"]) == [160, 320, 640, 900]
+    assert stage["fallback"] == "jpeg"
+    with Image.open(img_dir / stage["variants"]["jpeg"]["320"]) as im:
+        assert im.size == (320, 213) and im.format == "JPEG"
+
+    # Transparent sources fall back to PNG instead of JPEG
+    logo = manifest["logo.png"]
+    assert logo["fallback"] == "png" and list(logo["variants"]["png"]) == ["160", "200"]
+
+
+def test_build_is_incremental(img_dir):
+    images.build(img_dir, widths=(160, 320), workers=1, log=lambda m: None)
+    assert images.build(img_dir, widths=(160, 320), workers=1, log=lambda m: None) == (0, 2, 0)
+
+    Image.new("RGB", (900, 600), "blue").save(img_dir / "stage.jpg")
+    (img_dir / "logo.png").unlink()
+    built, skipped, removed = images.build(img_dir, widths=(160, 320), workers=1, log=lambda m: None)
+    assert (built, skipped) == (1, 0)
+    assert removed == 4 + 4  # old stage variants + logo variants
+    assert list(json.loads((img_dir / "variants" / "manifest.json").read_text())) == ["stage.jpg"]
+
+
+def test_helpers_fall_back_to_original(app, tmp_path):
+    app.extensions["image_manifest"] = images.ManifestFile(tmp_path / "missing.json")
+    with app.test_request_context():
+        assert images.image_url("ripples.jpg", 320) == "/static/img/ripples.jpg"
+        assert images.image_srcset("ripples.jpg") == ""
+
+
+def test_helpers_pick_variants(app, img_dir):
+    images.build(img_dir, widths=(160, 320, 640), workers=1, log=lambda m: None)
+    app.extensions["image_manifest"] = images.ManifestFile(img_dir / "variants" / "manifest.json")
+    with app.test_request_context():
+        assert images.image_url("stage.jpg", 300).startswith("/static/img/variants/stage-320-")
+        assert images.image_url("stage.jpg", 5000).startswith("/static/img/variants/stage-640-")
+        srcset = images.image_srcset("stage.jpg")
+        assert srcset.count(".webp") == 3 and srcset.endswith(" 640w")
+        assert images.image_type("logo.png") == "image/png"
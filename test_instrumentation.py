@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test per-request instrumentation: Server-Timing, /metrics and slow-query logging
+"""
+
+import logging
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from models import db
+
+
+def _timings(response):
+    header = response.headers["Server-Timing"]
+    return {m.group(1): m.group(0) for m in re.finditer(r"([\w-]+);dur=[\d.]+[^,]*", header)}
+
+
+def test_server_timing_reports_queries_and_templates(client):
+    response = client.get("/events")
+    assert response.status_code == 200
+    timings = _timings(response)
+    assert set(timings) >= {"db", "db-max", "tpl", "app"}
+    assert re.search(r'desc="[1-9]\d* queries"', timings["db"])
+
+
+def test_metrics_endpoint_counts_requests_per_route(client, admin_client):
+    client.get("/event/1")
+    client.get("/event/2")
+    body = admin_client.get("/metrics").get_data(as_text=True)
+
+    assert "# TYPE http_requests_total counter" in body
+    assert 'http_requests_total{endpoint="/event/<int:event_id>",method="GET",status="404"} 2' in body
+    assert 'http_request_duration_seconds_count{endpoint="/event/<int:event_id>"} 2' in body
+    assert 'db_queries_per_request_bucket{endpoint="/event/<int:event_id>",le="+Inf"} 2' in body
+    assert re.search(r'http_response_size_bytes_sum\{endpoint="/event/<int:event_id>"\} [1-9]', body)
+
+
+def test_metrics_need_an_admin_or_the_token(app, client):
+    assert client.get("/metrics").status_code == 403
+    app.config["METRICS_TOKEN"] = "s3cret"
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200 and "http_requests_total" in response.get_data(as_text=True)
+
+
+def test_failed_statements_do_not_leak_start_times(app):
+    with app.app_context(), db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info["query_start"] == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start"] == []
+
+
+def test_slow_queries_are_logged(app, caplog):
+    app.config["SLOW_QUERY_MS"] = 0.000001
+    with app.app_context(), caplog.at_level(logging.WARNING, logger=app.logger.name):
+        db.session.execute(text("SELECT 42"))
+    assert any("Slow query" in r.getMessage() and "SELECT 42" in r.getMessage() for r in caplog.records)
+    assert "db_slow_queries_total 1" in app.extensions["instrumentation"].render()
+
+
+def test_can_be_switched_off(tmp_path):
+    from app import create_app
+    from config import TestingConfig
+
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'off.db'}"
+        INSTRUMENTATION = False
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    assert "Server-Timing" not in client.get("/events").headers
+    assert client.get("/metrics").status_code == 404
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_streamed_responses_are_not_buffered(app):
+    consumed = []
+
+    def body():
+        for chunk in ("one", "two", "three"):
+            consumed.append(chunk)
+            yield chunk
+
+    app.add_url_rule("/stream-probe", "stream_probe", lambda: app.response_class(body()))
+    response = app.test_client().get("/stream-probe", buffered=False)
+    assert "Server-Timing" in response.headers
+    assert len(consumed) < 3  # headers went out before the body was produced
+    assert response.get_data(as_text=True) == "onetwothree"
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test the notification outbox against a local SMTP stand-in
+"""
+
+import socket
+import socketserver
+import threading
+import time
+from datetime import date, datetime, timedelta
+from email import message_from_bytes
+
+import pytest
+from sqlalchemy import update
+
+from models import db, Booking, Event, NotificationOutbox, Resource
+from utils import outbox
+from utils.email_utils import SMTPMailer
+from utils.write_behind import insert_registrations
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough SMTP to accept mail; recipients containing "bounce" are refused with 550."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.port = self.server_address[1]
+        self.connections = 0
+        self.messages = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 stand-in ready")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 stand-in")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                if "bounce" in command:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(command)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    chunk = self.rfile.readline()
+                    if not chunk:
+                        return
+                    data += chunk
+                self.server.messages.append(message_from_bytes(data[:-5]))
+                self.reply("250 Queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:  # RSET, NOOP
+                self.reply("250 OK")
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    with SMTPStandIn() as server:
+        yield server
+
+
+@pytest.fixture
+def mail_app(app, smtp):
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=smtp.port, OUTBOX_BATCH_SIZE=50)
+    with app.app_context():
+        db.session.add(Event(id=1, title="Hackathon", category="Tech", date=date(2025, 3, 1), location="Lab 2"))
+        db.session.add(Resource(id=1, name="Projector", category="AV", quantity=1))
+        db.session.commit()
+    return app
+
+
+def _outbox():
+    return NotificationOutbox.query.order_by(NotificationOutbox.id).all()
+
+
+def _register(n, start=0):
+    return insert_registrations([{"event_id": 1, "name": f"S{i}", "regno": f"R{i}", "email": f"s{i}@x.edu"}
+                                 for i in range(start, start + n)])
+
+
+def test_registration_queues_instead_of_sending(mail_app, client, smtp):
+    res = client.post("/register-event", data={"event_id": 1, "name": "Asha", "regno": "R1", "email": "asha@x.edu"})
+    assert res.status_code == 200
+    assert smtp.connections == 0  # nothing left the request
+
+    with mail_app.app_context():
+        (row,) = _outbox()
+        assert (row.kind, row.recipient, row.status) == ("registration_confirmed", "asha@x.edu", "pending")
+
+    result = mail_app.test_cli_runner().invoke(args=["run-outbox", "--once"])
+    assert "Processed 1 message" in result.output
+    (message,) = smtp.messages
+    assert message["To"] == "asha@x.edu"
+    assert message["Subject"] == "Registration confirmed: Hackathon"
+    assert "Lab 2" in message.get_payload()
+    with mail_app.app_context():
+        assert _outbox()[0].status == "sent"
+
+
+def test_batches_share_one_connection(mail_app, smtp):
+    with mail_app.app_context():
+        _register(120)
+        mailer = SMTPMailer("127.0.0.1", smtp.port)
+        assert outbox.drain(mailer, mail_app.config) == 120
+        _register(5, start=200)
+        assert outbox.drain(mailer, mail_app.config) == 5
+        mailer.close()
+
+    assert len(smtp.messages) == 125
+    assert smtp.connections == mailer.connections == 1
+
+
+def test_unreachable_server_backs_off(mail_app, smtp):
+    mail_app.config.update(MAIL_PORT=_closed_port(), OUTBOX_RETRY_BASE=60)
+    with mail_app.app_context():
+        _register(3)
+        before = datetime.utcnow()
+        assert outbox.drain(SMTPMailer("127.0.0.1", mail_app.config["MAIL_PORT"]), mail_app.config) == 3
+        rows = _outbox()
+        assert {(r.status, r.attempts) for r in rows} == {("pending", 1)}
+        assert all(before + timedelta(seconds=45) < r.next_attempt_at < before + timedelta(seconds=75) for r in rows)
+        assert "ConnectionRefusedError" in rows[0].last_error
+
+        # Not due yet: nothing is claimed
+        assert outbox.drain(SMTPMailer("127.0.0.1", smtp.port), mail_app.config) == 0
+
+        db.session.execute(update(NotificationOutbox).values(next_attempt_at=datetime.utcnow()))
+        db.session.commit()
+        assert outbox.drain(SMTPMailer("127.0.0.1", smtp.port), mail_app.config) == 3
+        assert {(r.status, r.attempts) for r in _outbox()} == {("sent", 2)}
+    assert len(smtp.messages) == 3
+
+
+def test_refused_recipient_fails_without_retry(mail_app, smtp):
+    with mail_app.app_context():
+        outbox.enqueue([{"kind": "plain", "recipient": "bounce@x.edu", "payload": {"subject": "a", "body": "b"}},
+                        {"kind": "plain", "recipient": "ok@x.edu", "payload": {"subject": "c", "body": "d"}}])
+        db.session.commit()
+        mailer = SMTPMailer("127.0.0.1", smtp.port)
+        outbox.drain(mailer, mail_app.config)
+        assert [(r.recipient, r.status, r.attempts) for r in _outbox()] == [
+            ("bounce@x.edu", "failed", 1), ("ok@x.edu", "sent", 1)]
+    assert smtp.connections == 1
+
+
+def test_claimed_rows_wait_for_their_lease(mail_app):
+    with mail_app.app_context():
+        _register(2)
+        with db.engine.begin() as conn:
+            assert len(outbox.claim(conn, 10, lease=300)) == 2
+            assert outbox.claim(conn, 10, lease=300) == []  # a second worker gets nothing
+        db.session.execute(update(NotificationOutbox).values(next_attempt_at=datetime.utcnow()))
+        db.session.commit()
+        with db.engine.begin() as conn:
+            assert len(outbox.claim(conn, 10, lease=300)) == 2  # the first worker died: taken over
+
+
+def test_booking_decisions_are_queued_with_the_change(mail_app, admin_client, smtp):
+    form = {"resource_id": 1, "name": "Asha", "regno": "R1", "email": "Asha@X.edu", "event_name": "Ripples",
+            "start_date": "2025-03-01", "end_date": "2025-03-02"}
+    admin_client.post("/book-resource", data=form)
+    admin_client.post("/book-resource", data=dict(form, email="b@x.edu"))
+    with mail_app.app_context():
+        first, second = (b.id for b in Booking.query.order_by(Booking.id))
+
+    # One unit: the second approval conflicts and queues nothing
+    res = admin_client.post("/admin/api/bookings/approve", json={"ids": [first, second]}).get_json()
+    assert res["approved"] == [first]
+    admin_client.post("/admin/api/bookings/reject", json={"ids": [second]})
+
+    with mail_app.app_context():
+        assert [(r.kind, r.recipient) for r in _outbox()] == [
+            ("booking_approved", "asha@x.edu"), ("booking_rejected", "b@x.edu")]
+        outbox.drain(SMTPMailer("127.0.0.1", smtp.port), mail_app.config)
+    assert [m["Subject"] for m in smtp.messages] == [
+        f"Booking #{first} approved: Projector", f"Booking #{second} rejected: Projector"]
+
+
+def test_thread_worker_sends_after_commit(mail_app, client, smtp):
+    mail_app.config["OUTBOX_WORKER"] = "thread"
+    mail_app.extensions["outbox_worker"] = worker = outbox.OutboxWorker(mail_app)
+    try:
+        client.post("/register-event", data={"event_id": 1, "name": "Asha", "regno": "R1", "email": "a@x.edu"})
+        deadline = time.monotonic() + 5
+        while not smtp.messages and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+    assert [m["To"] for m in smtp.messages] == ["a@x.edu"]
+
+
+def test_thread_worker_delivers_rows_queued_before_it_started(mail_app, client, smtp):
+    with mail_app.app_context():
+        _register(2)  # no worker yet: e.g. queued by a process that died
+    mail_app.config.update(OUTBOX_WORKER="thread", OUTBOX_POLL_INTERVAL=60)
+    outbox.init_app(mail_app)
+    try:
+        client.get("/events")  # any request starts the thread; nothing new is queued
+        deadline = time.monotonic() + 5
+        while len(smtp.messages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        mail_app.extensions["outbox_worker"].stop()
+    assert sorted(m["To"] for m in smtp.messages) == ["s0@x.edu", "s1@x.edu"]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test event registration, including write-behind (batched) ingestion
+"""
+
+import threading
+from datetime import date
+
+import pytest
+
+from models import db, Event, Registration
+
+
+@pytest.fixture
+def event_id(app):
+    with app.app_context():
+        ev = Event(title="Code Hackathon 2024", category="Hackathons", date=date(2024, 12, 28))
+        db.session.add(ev)
+        db.session.commit()
+        return ev.id
+
+
+def _form(event_id, i=0, **extra):
+    return dict({"event_id": event_id, "name": f"Student {i}", "regno": f"R{i}",
+                 "email": f"s{i}@college.com", "mobile": "99999", "year": "2nd"}, **extra)
+
+
+def test_register_returns_id(app, client, event_id):
+    res = client.post("/register-event", data=_form(event_id))
+    assert res.status_code == 200
+    with app.app_context():
+        reg = db.session.get(Registration, res.get_json()["registration_id"])
+        assert reg.regno == "R0" and reg.created_at is not None
+
+
+def test_register_validates_fields(client, event_id):
+    assert client.post("/register-event", data={"event_id": event_id}).status_code == 400
+    assert client.post("/register-event", data=_form("abc")).status_code == 400
+
+
+def test_write_behind_batches_concurrent_registrations(app, event_id):
+    from utils import write_behind
+    from utils.query_counter import QueryCounter
+
+    app.config.update(REGISTRATION_WRITE_BEHIND=True, REGISTRATION_BATCH_SIZE=50,
+                      REGISTRATION_FLUSH_INTERVAL=0.2)
+    write_behind.init_app(app)
+
+    ids, barrier = [], threading.Barrier(40)
+
+    def register(i):
+        client = app.test_client()
+        barrier.wait()
+        res = client.post("/register-event", data=_form(event_id, i))
+        assert res.status_code == 200
+        ids.append(res.get_json()["registration_id"])
+
+    with app.app_context():
+        with QueryCounter(db.engine) as qc:
+            threads = [threading.Thread(target=register, args=(i,)) for i in range(40)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    app.extensions["registration_writer"].stop()
+
+    assert len(set(ids)) == 40
+    inserts = [s for s in qc.statements if s.startswith("INSERT INTO registration")]
+    assert len(inserts) < 40
+
+    with app.app_context():
+        rows = {r.id: r.regno for r in Registration.query}
+    assert len(rows) == 40
+    assert sorted(rows[i] for i in ids) == sorted(f"R{i}" for i in range(40))
+
+
+def test_duplicate_registration_returns_existing_row(app, client, event_id):
+    first = client.post("/register-event", data=_form(event_id)).get_json()
+    again = client.post("/register-event", data=_form(event_id, email="S0@College.com ")).get_json()
+    same_email = client.post("/register-event", data=_form(event_id, regno="OTHER")).get_json()
+
+    assert again["duplicate"] and again["registration_id"] == first["registration_id"]
+    assert same_email["registration_id"] == first["registration_id"]
+    with app.app_context():
+        assert Registration.query.count() == 1
+
+
+def test_idempotency_key_replays_first_response(app, client, event_id):
+    headers = {"Idempotency-Key": "abc-123"}
+    first = client.post("/register-event", data=_form(event_id), headers=headers).get_json()
+
+    from utils.query_counter import QueryCounter
+    with app.app_context():
+        with QueryCounter(db.engine) as qc:
+            retry = client.post("/register-event", data=_form(event_id), headers=headers).get_json()
+    assert retry == first
+    assert qc.count == 1
+
+    with app.app_context():
+        assert Registration.query.one().idempotency_key == "abc-123"
+
+
+def test_duplicates_within_one_batch(app, event_id):
+    from utils.write_behind import insert_registrations
+
+    rows = [{"event_id": event_id, "name": "A", "regno": "R1", "email": "a@x.com"},
+            {"event_id": event_id, "name": "A", "regno": "R1", "email": "a@x.com"},
+            {"event_id": event_id, "name": "B", "regno": "R2", "email": "b@x.com"}]
+    with app.app_context():
+        results = insert_registrations(rows)
+        assert [created for _, created in results] == [True, False, True]
+        assert results[0][0] == results[1][0] != results[2][0]
+        assert Registration.query.count() == 2
+
+
+def test_failed_row_fails_alone_in_its_batch(app, event_id, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+    from utils import write_behind
+
+    real_insert = write_behind.insert_registrations
+
+    def insert_registrations(rows):
+        if any(row["name"] == "bad" for row in rows):
+            raise OperationalError("INSERT", {}, Exception("row rejected"))
+        return real_insert(rows)
+
+    monkeypatch.setattr(write_behind, "insert_registrations", insert_registrations)
+    writer = write_behind.RegistrationWriter(app, batch_size=10, interval=0.2)
+    rows = [dict(_form(event_id, i), name="bad" if i == 2 else f"Student {i}") for i in range(5)]
+    futures = [writer.submit(row) for row in rows]
+    try:
+        with pytest.raises(OperationalError):
+            futures[2].result(timeout=5)
+        assert all(f.result(timeout=5)[1] for i, f in enumerate(futures) if i != 2)
+    finally:
+        writer.stop()
+    with app.app_context():
+        assert Registration.query.count() == 4
+
+
+def test_failed_write_behind_insert_returns_503(app, client, event_id, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+    from utils import write_behind
+
+    def insert_registrations(rows):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(write_behind, "insert_registrations", insert_registrations)
+    app.config.update(REGISTRATION_WRITE_BEHIND=True)
+    write_behind.init_app(app)
+    try:
+        res = client.post("/register-event", data=_form(event_id))
+    finally:
+        app.extensions["registration_writer"].stop()
+    assert res.status_code == 503
+    assert "error" in res.get_json()
+
+
+def test_restarted_flusher_keeps_queued_rows(app, event_id):
+    from concurrent.futures import Future
+    from utils import write_behind
+
+    writer = write_behind.RegistrationWriter(app, interval=0.01)
+    writer.submit(_form(event_id, 0)).result(timeout=5)
+    writer.stop()
+    # Queued while no flusher runs: the next one must pick it up
+    orphan = Future()
+    writer._queue.put((_form(event_id, 1), orphan))
+    writer.submit(_form(event_id, 2)).result(timeout=5)
+    writer.stop()
+    assert orphan.result(timeout=0)[1] is True
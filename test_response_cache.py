@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the public page response cache and its model-change invalidation
+"""
+
+from datetime import date
+
+import pytest
+
+from models import db, Event, Resource
+from utils import response_cache
+from utils.response_cache import MemoryBackend
+
+
+@pytest.fixture(params=["memory", "filesystem"])
+def cached_app(request, app, tmp_path):
+    app.config.update(RESPONSE_CACHE=request.param, RESPONSE_CACHE_DIR=str(tmp_path / "cache"))
+    response_cache.init_app(app)
+    with app.app_context():
+        db.session.add_all([
+            Event(title="Hackathon 2024", category="Hackathons", date=date(2024, 12, 28)),
+            Event(title="Expo 2024", category="Expo", date=date(2024, 12, 27)),
+            Resource(name="Projector", category="AV", quantity=3),
+        ])
+        db.session.commit()
+    return app
+
+
+def _cache(client, url):
+    res = client.get(url)
+    return res.status_code, res.headers.get("X-Cache")
+
+
+def test_second_hit_is_served_from_cache(cached_app):
+    client = cached_app.test_client()
+    for url in ("/", "/events", "/event/1", "/api/event/1", "/resources", "/api/resource/1"):
+        assert _cache(client, url) == (200, "MISS")
+        assert _cache(client, url) == (200, "HIT")
+
+
+def test_key_normalizes_query_args(cached_app):
+    client = cached_app.test_client()
+    assert _cache(client, "/events?q=hack&category=") == (200, "MISS")
+    assert _cache(client, "/events?category=&q=hack") == (200, "HIT")
+    assert _cache(client, "/events?q=expo") == (200, "MISS")
+
+
+def test_commit_invalidates_only_affected_pages(cached_app):
+    client = cached_app.test_client()
+    for url in ("/events", "/event/1", "/event/2", "/resources"):
+        client.get(url)
+
+    with cached_app.app_context():
+        db.session.get(Event, 1).title = "Hackathon 2025"
+        db.session.commit()
+
+    assert _cache(client, "/event/1") == (200, "MISS")
+    assert "Hackathon 2025" in client.get("/events").get_data(as_text=True)
+    assert _cache(client, "/event/2") == (200, "HIT")
+    assert _cache(client, "/resources") == (200, "HIT")
+
+
+def test_rollback_does_not_invalidate(cached_app):
+    client = cached_app.test_client()
+    client.get("/event/1")
+    with cached_app.app_context():
+        db.session.get(Event, 1).title = "Never saved"
+        db.session.flush()
+        db.session.rollback()
+    assert _cache(client, "/event/1") == (200, "HIT")
+
+
+def test_errors_are_not_cached(cached_app):
+    client = cached_app.test_client()
+    assert _cache(client, "/api/event/999") == (404, None)
+    assert _cache(client, "/api/event/999") == (404, None)
+
+
+def test_memory_backend_is_bounded_lru():
+    backend = MemoryBackend(max_bytes=8000)
+    for i in range(20):
+        backend.set(f"k{i}", b"x" * 500, ttl=60, nbytes=500)
+        backend.get("k0")  # keep k0 hot
+    assert backend.size <= 8000
+    assert backend.get("k0") is not None and backend.get("k1") is None
+
+    backend.set("huge", b"x" * 5000, ttl=60, nbytes=5000)
+    assert backend.get("huge") is None
+    backend.set("stale", b"x", ttl=-1, nbytes=1)
+    assert backend.get("stale") is None
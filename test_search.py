@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test full-text search on the event and resource list pages
+"""
+
+from datetime import date
+
+import pytest
+
+from models import db, Event, Resource
+from utils import search
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([
+            Event(title="Hackathon 2024", category="Hackathons", date=date(2024, 12, 28),
+                  description_short="24-hour coding contest."),
+            Event(title="Expo 2024", category="Expo", date=date(2024, 12, 27),
+                  description_short="Showcasing projects from the hackathon winners."),
+            Event(title="DJ Night", category="Social", date=date(2024, 12, 31),
+                  description_short="Dance night with a live DJ."),
+            Resource(name="Projector", category="AV", quantity=3),
+            Resource(name="Projector Screen", category="AV", quantity=4),
+            Resource(name="Wireless Mic", category="Audio", quantity=10),
+        ])
+        db.session.commit()
+
+
+def _titles(app, model, q, ranked=True):
+    with app.test_request_context():
+        query, _ = search.apply(model.query, model, q, ranked)
+        return [getattr(row, "title", None) or row.name for row in query.all()]
+
+
+def test_backend_is_fts5_on_sqlite(app, catalog):
+    with app.app_context():
+        assert search.backend(Event) == "fts5"
+
+
+@pytest.mark.parametrize("backend", ["auto", "like"])
+def test_prefix_search_across_columns(app, catalog, backend):
+    app.config["SEARCH_BACKEND"] = backend
+    assert set(_titles(app, Event, "hack")) == {"Hackathon 2024", "Expo 2024"}
+    assert _titles(app, Event, "night dj") == ["DJ Night"]
+    assert set(_titles(app, Resource, "proj")) == {"Projector", "Projector Screen"}
+    assert _titles(app, Event, "nothing-here") == []
+
+
+def test_title_match_ranks_first(app, catalog):
+    assert _titles(app, Event, "hackathon")[0] == "Hackathon 2024"
+
+
+def test_index_follows_updates_and_deletes(app, catalog):
+    with app.app_context():
+        mic = Resource.query.filter_by(name="Wireless Mic").one()
+        mic.name = "Lapel Microphone"
+        db.session.delete(Resource.query.filter_by(name="Projector Screen").one())
+        db.session.commit()
+
+    assert _titles(app, Resource, "lapel") == ["Lapel Microphone"]
+    assert _titles(app, Resource, "wireless") == []
+    assert _titles(app, Resource, "screen") == []
+
+
+def test_search_punctuation_is_not_query_syntax(app, catalog):
+    assert set(_titles(app, Event, '"hack* (')) == {"Hackathon 2024", "Expo 2024"}
+    assert len(_titles(app, Event, "***")) == 3
+
+
+def test_list_pages_use_search(client, catalog):
+    page = client.get("/events?q=hack").get_data(as_text=True)
+    assert "Hackathon 2024" in page and "DJ Night" not in page
+
+    page = client.get("/resources?q=screen").get_data(as_text=True)
+    assert "Projector Screen" in page and 'value="screen"' in page
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the typeahead prefix index and the suggestion endpoints
+"""
+
+import time
+from datetime import date
+
+import pytest
+
+from models import db, Event, Resource
+from utils.typeahead import PrefixIndex
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([
+            Resource(name="Projector", category="AV", quantity=3),
+            Resource(name="Projector Screen", category="AV", quantity=4),
+            Resource(name="Wireless Mic", category="Audio", quantity=10),
+            Resource(name="PA System", category="Audio", quantity=3),
+            Event(title="Hackathon 2024", category="Hackathons", date=date(2024, 12, 28)),
+            Event(title="DJ Night 2024", category="Social", date=date(2024, 12, 31)),
+        ])
+        db.session.commit()
+
+
+def _names(client, q, kind="resources", key="name"):
+    return [s[key] for s in client.get(f"/api/{kind}/suggestions?q={q}").get_json()["suggestions"]]
+
+
+def test_prefix_index_matches_any_word_first_word_first():
+    index = PrefixIndex([(1, "Wireless Mic"), (2, "Microphone Stand"), (3, "Projector")])
+    assert [label for _, label in index.search("mic")] == ["Microphone Stand", "Wireless Mic"]
+    assert index.search("  PRO") == [(3, "Projector")]
+    assert index.search("") == [] and index.search("zzz") == []
+
+    index.add(3, "Laser Projector")
+    index.remove(2)
+    assert [label for _, label in index.search("mic")] == ["Wireless Mic"]
+    assert index.search("laser pro") == [(3, "Laser Projector")]
+    assert len(index) == 2
+
+
+def test_best_matches_rank_first_whatever_their_key_order():
+    # Long first-word matches sort before "mics" and later-word matches before both
+    index = PrefixIndex([(i, f"Microphone Stand {i}") for i in range(40)]
+                        + [(100 + i, f"Wireless Mic {i}") for i in range(40)] + [(99, "Mics")])
+    assert index.search("mic", limit=3)[0] == (99, "Mics")
+    assert all(label.startswith("Mic") for _, label in index.search("mic", limit=20))
+
+
+def test_suggestion_endpoints(client, catalog):
+    assert _names(client, "proj") == ["Projector", "Projector Screen"]
+    assert _names(client, "mic") == ["Wireless Mic"]
+    assert _names(client, "night", "events", "title") == ["DJ Night 2024"]
+
+
+def test_suggestions_are_cacheable(client, catalog):
+    res = client.get("/api/resources/suggestions?q=pro")
+    assert res.headers["Cache-Control"] == "public, max-age=60"
+    again = client.get("/api/resources/suggestions?q=pro", headers={"If-None-Match": res.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_admin_changes_update_index_incrementally(admin_client, catalog):
+    assert _names(admin_client, "lapel") == []  # builds the index
+
+    admin_client.post("/admin/resource/add", data={"name": "Lapel Mic", "quantity": "2"})
+    assert _names(admin_client, "lapel") == ["Lapel Mic"]
+
+    with admin_client.application.app_context():
+        rid = Resource.query.filter_by(name="Wireless Mic").one().id
+    admin_client.post(f"/admin/resource/{rid}/update", data={"name": "Handheld Mic"})
+    assert _names(admin_client, "wireless") == []
+    assert _names(admin_client, "hand") == ["Handheld Mic"]
+
+    admin_client.get(f"/admin/resource/{rid}/delete")
+    assert _names(admin_client, "hand") == []
+
+
+def test_rolled_back_changes_do_not_reach_index(app, client, catalog):
+    assert _names(client, "proj") == ["Projector", "Projector Screen"]
+    with app.app_context():
+        db.session.add(Resource(name="Projection Booth", quantity=1))
+        db.session.flush()
+        db.session.rollback()
+    assert _names(client, "projection") == []
+
+
+def test_expired_index_is_rebuilt_in_the_background(app, catalog):
+    from utils.typeahead import Typeahead
+
+    typeahead = Typeahead(Resource, "name", ttl=0)
+    with app.app_context():
+        assert typeahead.suggest("lectern") == []
+        # Bulk load: no model events, only the rebuild can see it
+        db.session.execute(Resource.__table__.insert(), [{"name": "Lectern", "quantity": 1}])
+        db.session.commit()
+        assert typeahead.suggest("lectern") == []  # served from the old index meanwhile
+        deadline = time.monotonic() + 5
+        while typeahead._pending is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        typeahead.ttl = 300
+        assert [label for _, label in typeahead.suggest("lectern")] == ["Lectern"]
+
+
+def test_lookup_is_fast_on_large_tables(app):
+    with app.app_context():
+        db.session.execute(Resource.__table__.insert(), [
+            {"name": f"Item {i} Portable Speaker", "category": "Audio", "quantity": 1} for i in range(20000)
+        ])
+        db.session.commit()
+
+    client = app.test_client()
+    client.get("/api/resources/suggestions?q=item")  # build
+    start = time.perf_counter()
+    for q in ("item 12", "port", "speak", "item 19999"):
+        assert client.get(f"/api/resources/suggestions?q={q}").status_code == 200
+    assert (time.perf_counter() - start) / 4 < 0.005
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test serving images from the UPLOADED_IMAGES_ZIP archive
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from utils import zip_store
+
+PHOTO = bytes(range(256)) * 1000          # 256 KB, several chunks
+POSTER = b"poster-" * 50000               # compressible
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "all_event_images.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(zipfile.ZipInfo("events/ripples.jpg", (2024, 12, 1, 10, 30, 0)), PHOTO,
+                    compress_type=zipfile.ZIP_STORED)
+        zf.writestr(zipfile.ZipInfo("posters/expo.png", (2024, 12, 2, 9, 0, 0)), POSTER,
+                    compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr("events/", b"")
+        zf.comment = b"event image bundle"
+    return path
+
+
+@pytest.fixture
+def media_app(app, bundle):
+    app.config["UPLOADED_IMAGES_ZIP"] = str(bundle)
+    zip_store.init_app(app)
+    yield app
+    app.extensions["zip_store"].close()
+
+
+def test_index_matches_zipfile(bundle):
+    store = zip_store.ZipStore(bundle)
+    assert len(store) == 2
+    assert "ripples.jpg" in store and "events/ripples.jpg" in store and "events/" not in store
+    assert store.read("ripples.jpg") == PHOTO
+    assert store.read("expo.png") == POSTER
+    member = store.get("expo.png")
+    assert member.size == len(POSTER) and member.compressed_size < member.size
+    store.close()
+
+
+@pytest.mark.parametrize("name", ["ripples.jpg", "expo.png"])
+@pytest.mark.parametrize("start, stop", [(0, 10), (65530, 65550), (100000, None)])
+def test_partial_reads(bundle, name, start, stop):
+    store = zip_store.ZipStore(bundle)
+    data = PHOTO if name == "ripples.jpg" else POSTER
+    assert b"".join(store.iter_bytes(store.get(name), start, stop or len(data))) == data[start:stop]
+    store.close()
+
+
+def test_media_route_serves_with_validators(media_app):
+    client = media_app.test_client()
+    res = client.get("/media/ripples.jpg")
+    assert res.status_code == 200 and res.data == PHOTO
+    assert res.headers["Content-Type"] == "image/jpeg"
+    assert res.headers["Content-Length"] == str(len(PHOTO))
+    assert res.headers["Last-Modified"] == "Sun, 01 Dec 2024 10:30:00 GMT"
+    assert res.headers["Accept-Ranges"] == "bytes"
+
+    assert client.get("/media/ripples.jpg", headers={"If-None-Match": res.headers["ETag"]}).status_code == 304
+    assert client.get("/media/missing.jpg").status_code == 404
+
+
+@pytest.mark.parametrize("name, data", [("ripples.jpg", PHOTO), ("expo.png", POSTER)])
+def test_media_route_ranges(media_app, name, data):
+    client = media_app.test_client()
+    etag = client.get(f"/media/{name}").headers["ETag"]
+
+    res = client.get(f"/media/{name}", headers={"Range": "bytes=100-199"})
+    assert res.status_code == 206 and res.data == data[100:200]
+    assert res.headers["Content-Range"] == f"bytes 100-199/{len(data)}"
+
+    res = client.get(f"/media/{name}", headers={"Range": "bytes=-50"})
+    assert res.status_code == 206 and res.data == data[-50:]
+
+    res = client.get(f"/media/{name}", headers={"Range": f"bytes={len(data) + 5}-"})
+    assert res.status_code == 416 and res.headers["Content-Range"] == f"bytes */{len(data)}"
+
+    # Several ranges: served whole rather than as multipart/byteranges
+    res = client.get(f"/media/{name}", headers={"Range": "bytes=0-1,5-9"})
+    assert res.status_code == 200 and res.data == data and "Content-Range" not in res.headers
+    res = client.get(f"/media/{name}", headers={"Range": f"bytes={len(data) + 1}-{len(data) + 2},{len(data) + 5}-{len(data) + 9}"})
+    assert res.status_code == 416
+
+    # A stale If-Range falls back to the full body
+    res = client.get(f"/media/{name}", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert res.status_code == 200 and res.data == data
+    res = client.get(f"/media/{name}", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert res.status_code == 206 and res.data == data[:10]
+
+
+def test_image_url_prefers_bundle_over_static(media_app, tmp_path):
+    from utils.images import ManifestFile, image_url
+    media_app.extensions["image_manifest"] = ManifestFile(tmp_path / "none.json")
+    with media_app.test_request_context():
+        assert image_url("ripples.jpg") == "/media/ripples.jpg"
+        assert image_url("hall.jpg") == "/static/img/hall.jpg"
+
+
+def test_missing_or_bad_archive_is_ignored(app, tmp_path):
+    app.config["UPLOADED_IMAGES_ZIP"] = str(tmp_path / "nope.zip")
+    zip_store.init_app(app)
+    (tmp_path / "bad.zip").write_bytes(os.urandom(100))
+    app.config["UPLOADED_IMAGES_ZIP"] = str(tmp_path / "bad.zip")
+    zip_store.init_app(app)
+    assert "zip_store" not in app.extensions
@@ -0,0 +1,267 @@
+# utils/aggregates.py
+"""
+Materialized dashboard aggregates: event_stats and resource_usage.
+
+  event_stats     registrations per (event, study year)
+  resource_usage  approved booking-days and unit-days per (resource, month)
+
+Both are kept current inside the writing transaction, so they commit or
+roll back together with the rows they count:
+
+  - ORM writes (registration via the form or seed, admin approve/reject,
+    deletes) are picked up by an after_flush listener that compares old
+    and new attribute values and applies the difference;
+  - Core writes call record_registrations() / record_bookings() next to
+    their INSERT (write_behind.insert_registrations, allocate_many).
+
+Differences are applied as INSERT ... ON CONFLICT DO UPDATE increments, so
+concurrent writers never lose each other's counts. Anything that bypasses
+both paths (manual SQL, restores) is fixed by `flask rebuild-stats`, a
+full recompute; `flask generate-data` runs one after its bulk load.
+Dashboard reads are then O(events + resources) no matter how many
+registrations and bookings exist.
+"""
+
+import calendar
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from models import db, Booking, Event, EventStats, Registration, Resource, ResourceUsage
+
+APPROVED = "Approved"
+
+
+# ------------------------------------------------------------------
+# Deltas
+# ------------------------------------------------------------------
+def month_spans(start, end):
+    """(first day of month, days of [start, end] in that month) for every month the range touches."""
+    if start is None or end is None or end < start:
+        return
+    day = start
+    while day <= end:
+        month = day.replace(day=1)
+        last = month.replace(day=calendar.monthrange(month.year, month.month)[1])
+        stop = min(end, last)
+        yield month, (stop - day).days + 1
+        day = stop + timedelta(days=1)
+
+
+def _add_registration(deltas, event_id, year, sign):
+    if event_id is not None:
+        deltas[(event_id, year or "")] += sign
+
+
+def _add_booking(deltas, resource_id, start, end, quantity, status, sign):
+    if status != APPROVED or resource_id is None:
+        return
+    for month, days in month_spans(start, end):
+        entry = deltas[(resource_id, month)]
+        entry[0] += sign * days
+        entry[1] += sign * days * (quantity or 1)
+
+
+def _increment(conn, table, key_columns, rows):
+    """Add `rows` (dicts of keys + deltas) onto `table`, creating missing rows."""
+    value_columns = [c for c in rows[0] if c not in key_columns]
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={c: table.c[c] + stmt.excluded[c] for c in value_columns},
+        )
+        conn.execute(stmt, rows)
+        return
+
+    # Other backends: update, then insert what was not there yet
+    for row in rows:
+        where = [table.c[k] == row[k] for k in key_columns]
+        result = conn.execute(update(table).where(*where).values(
+            {c: table.c[c] + row[c] for c in value_columns}))
+        if not result.rowcount:
+            conn.execute(insert(table).values(row))
+
+
+def apply(conn, registrations=None, usage=None):
+    """Apply registration deltas {(event_id, year): n} and usage deltas {(resource_id, month): [days, units]}."""
+    rows = [{"event_id": e, "year": y, "registrations": n} for (e, y), n in (registrations or {}).items() if n]
+    if rows:
+        _increment(conn, EventStats.__table__, ["event_id", "year"], rows)
+    rows = [{"resource_id": r, "month": m, "approved_days": d, "unit_days": u}
+            for (r, m), (d, u) in (usage or {}).items() if d or u]
+    if rows:
+        _increment(conn, ResourceUsage.__table__, ["resource_id", "month"], rows)
+
+
+def record_registrations(conn, rows, sign=1):
+    """Count registrations written with Core; rows are mappings with event_id and year."""
+    deltas = Counter()
+    for row in rows:
+        _add_registration(deltas, row["event_id"], row.get("year"), sign)
+    apply(conn, registrations=deltas)
+
+
+def record_bookings(conn, rows, sign=1):
+    """Count bookings written with Core; only Approved ones contribute."""
+    deltas = defaultdict(lambda: [0, 0])
+    for row in rows:
+        _add_booking(deltas, row["resource_id"], row.get("start_date"), row.get("end_date"),
+                     row.get("quantity"), row.get("status"), sign)
+    apply(conn, usage=deltas)
+
+
+# ------------------------------------------------------------------
+# ORM writes
+# ------------------------------------------------------------------
+_REGISTRATION = ("event_id", "year")
+_BOOKING = ("resource_id", "start_date", "end_date", "quantity", "status")
+
+
+def _values(obj, attrs, old):
+    """Attribute values as of the flush: `old` = before this flush's changes."""
+    state = inspect(obj)
+    values = []
+    for key in attrs:
+        history = state.attrs[key].history
+        if old and history.deleted:
+            values.append(history.deleted[0])
+        elif not old and history.added:
+            values.append(history.added[0])
+        else:
+            values.append(state.dict.get(key))
+    return values
+
+
+@event.listens_for(Session, "after_flush")
+def _track(session, flush_context):
+    registrations, usage = Counter(), defaultdict(lambda: [0, 0])
+    gone_events, gone_resources = [], []
+
+    for objects, before, after in ((session.new, False, True), (session.dirty, True, True),
+                                   (session.deleted, True, False)):
+        for obj in objects:
+            if before and after and not session.is_modified(obj):
+                continue
+            if isinstance(obj, Registration):
+                if before:
+                    _add_registration(registrations, *_values(obj, _REGISTRATION, old=True), -1)
+                if after:
+                    _add_registration(registrations, *_values(obj, _REGISTRATION, old=False), 1)
+            elif isinstance(obj, Booking):
+                if before:
+                    _add_booking(usage, *_values(obj, _BOOKING, old=True), -1)
+                if after:
+                    _add_booking(usage, *_values(obj, _BOOKING, old=False), 1)
+            elif not after and isinstance(obj, Event):
+                gone_events.append(obj.id)
+            elif not after and isinstance(obj, Resource):
+                gone_resources.append(obj.id)
+
+    if not (registrations or usage or gone_events or gone_resources):
+        return
+    conn = session.connection()
+    apply(conn, registrations, usage)
+    if gone_events:
+        conn.execute(delete(EventStats.__table__).where(EventStats.event_id.in_(gone_events)))
+    if gone_resources:
+        conn.execute(delete(ResourceUsage.__table__).where(ResourceUsage.resource_id.in_(gone_resources)))
+
+
+# ------------------------------------------------------------------
+# Full recompute
+# ------------------------------------------------------------------
+def rebuild(conn, batch=10000):
+    """Recompute both tables from Registration and Booking. Returns (event_stats rows, resource_usage rows)."""
+    conn.execute(delete(EventStats.__table__))
+    conn.execute(insert(EventStats.__table__).from_select(
+        ["event_id", "year", "registrations"],
+        select(Registration.event_id, func.coalesce(Registration.year, ""), func.count())
+        .group_by(Registration.event_id, func.coalesce(Registration.year, ""))
+    ))
+
+    # Month splitting is easier in Python; only approved bookings are read, in batches
+    usage = defaultdict(lambda: [0, 0])
+    result = conn.execution_options(yield_per=batch).execute(
+        select(Booking.resource_id, Booking.start_date, Booking.end_date, Booking.quantity, Booking.status)
+        .where(Booking.status == APPROVED)
+    )
+    for row in result:
+        _add_booking(usage, *row, 1)
+    conn.execute(delete(ResourceUsage.__table__))
+    apply(conn, usage=usage)
+
+    count = lambda model: conn.execute(select(func.count()).select_from(model)).scalar()  # noqa: E731
+    return count(EventStats), count(ResourceUsage)
+
+
+# ------------------------------------------------------------------
+# Dashboard reads
+# ------------------------------------------------------------------
+def event_summary(limit=10):
+    """Top events by registrations: [{id, title, date, total, by_year: {year: n}}], from event_stats only."""
+    total = func.sum(EventStats.registrations).label("total")
+    top = (
+        select(EventStats.event_id, total)
+        .group_by(EventStats.event_id)
+        .having(total > 0)
+        .order_by(total.desc(), EventStats.event_id)
+        .limit(limit)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Event.id, Event.title, Event.date, top.c.total, EventStats.year, EventStats.registrations)
+        .join(top, top.c.event_id == Event.id)
+        .join(EventStats, EventStats.event_id == Event.id)
+        .where(EventStats.registrations > 0)
+        .order_by(top.c.total.desc(), Event.id, EventStats.year)
+    )
+    events = {}
+    for event_id, title, day, event_total, year, n in rows:
+        entry = events.setdefault(event_id, {"id": event_id, "title": title, "date": day,
+                                             "total": event_total, "by_year": {}})
+        entry["by_year"][year or "—"] = n
+    return list(events.values())
+
+
+def resource_utilization(month=None, limit=10):
+    """Share of unit-days used per resource in `month` (default: this month), busiest first."""
+    month = (month or date.today()).replace(day=1)
+    days = calendar.monthrange(month.year, month.month)[1]
+    rows = db.session.execute(
+        select(Resource.id, Resource.name, Resource.quantity,
+               func.coalesce(ResourceUsage.approved_days, 0), func.coalesce(ResourceUsage.unit_days, 0))
+        .outerjoin(ResourceUsage, (ResourceUsage.resource_id == Resource.id) & (ResourceUsage.month == month))
+    )
+    usage = [
+        {"id": rid, "name": name, "approved_days": booked, "unit_days": units,
+         "utilization": units / ((quantity or 1) * days)}
+        for rid, name, quantity, booked, units in rows
+    ]
+    usage.sort(key=lambda r: (-r["utilization"], r["name"]))
+    return month, usage[:limit]
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+@click.command("rebuild-stats")
+@with_appcontext
+def rebuild_stats_command():
+    """Recompute the dashboard aggregates from scratch."""
+    with db.engine.begin() as conn:
+        event_rows, usage_rows = rebuild(conn)
+    click.echo(f"event_stats: {event_rows} rows, resource_usage: {usage_rows} rows")
+
+
+def init_app(app):
+    app.cli.add_command(rebuild_stats_command)
@@ -0,0 +1,161 @@
+# utils/assets.py
+"""
+Fingerprinted static assets with far-future caching.
+
+`flask build-assets` copies every file under static/css and static/js to
+static/dist with its content hash in the name (css/custom.css ->
+css/custom.3f9a1c2b.css), writes pre-compressed .gz (and .br when the
+`brotli` package is installed) siblings, and records the mapping in
+static/dist/manifest.json.
+
+Templates link assets with `asset_url("css/custom.css")`, which resolves
+the fingerprinted name (or the plain static URL before the first build).
+/static/dist/ is served by `serve_asset`, which picks the best
+pre-compressed sibling the client accepts and marks the response
+`Cache-Control: public, max-age=31536000, immutable`. A changed file gets
+a new name, so browsers never need to revalidate. The content-hashed image
+variants from utils/images.py get the same header.
+
+Earlier builds' files are kept so pages rendered (or cached) before a
+deploy still resolve; `--prune` removes them.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import click
+from flask import current_app, request, send_from_directory, url_for
+from flask.cli import with_appcontext
+
+from utils.images import ManifestFile
+
+ASSET_DIRS = ("css", "js")
+DIST_DIR = "dist"
+MANIFEST = "manifest.json"
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".map"}
+ONE_YEAR = 365 * 24 * 3600
+
+
+def fingerprint(rel_path, digest):
+    path = Path(rel_path)
+    return str(path.with_name(f"{path.stem}.{digest[:8]}{path.suffix}").as_posix())
+
+
+def _compress(path, data):
+    """Write .gz / .br siblings of `path` when they are actually smaller."""
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        Path(f"{path}.gz").write_bytes(gz)
+    try:
+        import brotli
+    except ImportError:
+        return
+    br = brotli.compress(data, quality=11)
+    if len(br) < len(data):
+        Path(f"{path}.br").write_bytes(br)
+
+
+def build(static_dir, asset_dirs=ASSET_DIRS, prune=False, log=print):
+    """Fingerprint static assets into <static_dir>/dist. Returns the manifest."""
+    static_dir = Path(static_dir)
+    dist = static_dir / DIST_DIR
+    dist.mkdir(exist_ok=True)
+
+    manifest = {}
+    for sub in asset_dirs:
+        for source in sorted((static_dir / sub).rglob("*")):
+            if not source.is_file():
+                continue
+            rel = source.relative_to(static_dir).as_posix()
+            data = source.read_bytes()
+            target = fingerprint(rel, hashlib.sha256(data).hexdigest())
+            manifest[rel] = target
+
+            out = dist / target
+            if out.exists():
+                continue  # same content already built
+            out.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, out)
+            if source.suffix in COMPRESSIBLE:
+                _compress(out, data)
+            log(f"  {rel} -> {DIST_DIR}/{target}")
+
+    if prune:
+        keep = set(manifest.values())
+        for path in dist.rglob("*"):
+            name = path.relative_to(dist).as_posix()
+            base = name[:-3] if name.endswith((".gz", ".br")) else name
+            if path.is_file() and name != MANIFEST and base not in keep:
+                path.unlink()
+                log(f"  pruned {DIST_DIR}/{name}")
+
+    fd, tmp = tempfile.mkstemp(dir=dist, prefix=".manifest-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, dist / MANIFEST)
+    return manifest
+
+
+def asset_url(filename):
+    """url_for('static', filename=...) that resolves to the fingerprinted copy when built."""
+    built = current_app.extensions["asset_manifest"].get(filename)
+    if built is None:
+        return url_for("static", filename=filename)
+    return url_for("asset", filename=built)
+
+
+def serve_asset(filename):
+    """Serve a fingerprinted file, pre-compressed when the client accepts it."""
+    dist = Path(current_app.static_folder) / DIST_DIR
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[candidate] and (dist / (filename + suffix)).is_file():
+            encoding = candidate
+            filename += suffix
+            break
+
+    response = send_from_directory(dist, filename, mimetype=mimetype,
+                                   max_age=current_app.config.get("ASSET_MAX_AGE", ONE_YEAR))
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def _immutable_image_variants(response):
+    # Image variant names carry their content hash too (utils/images.py)
+    if (request.endpoint == "static" and response.status_code == 200
+            and request.view_args.get("filename", "").startswith("img/variants/")
+            and not request.view_args["filename"].endswith(".json")):
+        response.cache_control.no_cache = None  # Flask's static default
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config.get("ASSET_MAX_AGE", ONE_YEAR)
+        response.cache_control.immutable = True
+    return response
+
+
+@click.command("build-assets")
+@click.option("--prune", is_flag=True, help="Delete fingerprinted files that are no longer current.")
+@with_appcontext
+def build_assets_command(prune):
+    """Fingerprint and pre-compress static/css and static/js into static/dist."""
+    manifest = build(current_app.static_folder, prune=prune, log=click.echo)
+    click.echo(f"Assets: {len(manifest)} files in {DIST_DIR}/{MANIFEST}.")
+
+
+def init_app(app):
+    app.extensions["asset_manifest"] = ManifestFile(Path(app.static_folder) / DIST_DIR / MANIFEST)
+    app.add_url_rule(f"{app.static_url_path}/{DIST_DIR}/<path:filename>", "asset", serve_asset)
+    app.after_request(_immutable_image_variants)
+    app.add_template_global(asset_url)
+    app.cli.add_command(build_assets_command)
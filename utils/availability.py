@@ -0,0 +1,234 @@
+# utils/availability.py
+"""
+Booking availability.
+
+`approved_overlaps` is the indexed SQL overlap query and `peak_units` turns
+the overlapping bookings into the most units reserved on any single day.
+On top of it there is an optional per-resource interval tree cache
+(AVAILABILITY_CACHE=1) that answers the same question in memory, so a
+resource with hundreds of thousands of historical bookings still checks in
+well under a millisecond.
+
+The cache lives in each worker process. It is invalidated locally whenever
+a booking of that resource is approved or rejected, and rebuilt after
+AVAILABILITY_CACHE_TTL seconds so other workers' approvals are picked up.
+It only ever serves as a fast pre-check; the booking engine re-reads the
+database under a lock before anything is written.
+
+`daily_free_units` is the calendar view: free units per resource and day
+over a window, from one overlap query and a NumPy difference array.
+"""
+
+import threading
+import time
+from itertools import chain
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import Integer, cast, func, select
+
+from models import db, Booking
+
+
+def approved_overlaps(resource_id, sd, ed):
+    """Approved bookings of a resource whose [start, end] overlaps [sd, ed].
+
+    Two closed ranges overlap exactly when each starts before the other ends,
+    which the (resource_id, status, start_date, end_date) index can serve.
+    """
+    return Booking.query.filter(
+        Booking.resource_id == resource_id,
+        Booking.status == "Approved",
+        Booking.start_date <= ed,
+        Booking.end_date >= sd,
+    )
+
+
+# Units held by a booking (rows created before the quantity column count as 1)
+booked_units = func.coalesce(Booking.quantity, 1)
+
+
+class IntervalTree:
+    """
+    Static augmented interval tree over closed intervals (start, end, payload).
+
+    The intervals are sorted by start and the tree is implicit in that array:
+    the middle element of every range is the subtree root and `_max_end`
+    stores the largest end in its subtree, so whole subtrees that end before
+    the query or start after it are skipped. Queries are O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        items = sorted(intervals, key=lambda iv: iv[0])
+        self._starts = [iv[0] for iv in items]
+        self._ends = [iv[1] for iv in items]
+        self._payloads = [iv[2] if len(iv) > 2 else None for iv in items]
+        self._max_end = [None] * len(items)
+        self._build(0, len(items))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._ends[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_end[mid] = best
+        return best
+
+    def overlapping(self, start, end):
+        """Yield payloads of every interval overlapping [start, end]."""
+        stack = [(0, len(self._starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] < start:
+                continue  # everything in this subtree ends too early
+            stack.append((lo, mid))
+            if self._starts[mid] > end:
+                continue  # this node and its right subtree start too late
+            if self._ends[mid] >= start:
+                yield self._payloads[mid]
+            stack.append((mid + 1, hi))
+
+    def first_overlap(self, start, end):
+        return next(self.overlapping(start, end), None)
+
+
+class AvailabilityCache:
+    """Per-resource interval trees of approved bookings."""
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._trees = {}
+        self._lock = threading.Lock()
+
+    def tree(self, resource_id):
+        entry = self._trees.get(resource_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        rows = db.session.query(Booking.start_date, Booking.end_date, booked_units).filter(
+            Booking.resource_id == resource_id,
+            Booking.status == "Approved",
+        ).all()
+        tree = IntervalTree([(sd, ed, (sd, ed, units)) for sd, ed, units in rows])
+        with self._lock:
+            self._trees[resource_id] = (tree, time.monotonic())
+        return tree
+
+    def invalidate(self, resource_id=None):
+        with self._lock:
+            if resource_id is None:
+                self._trees.clear()
+            else:
+                self._trees.pop(resource_id, None)
+
+
+def init_app(app):
+    if app.config.get("AVAILABILITY_CACHE"):
+        app.extensions["availability_cache"] = AvailabilityCache(
+            ttl=app.config.get("AVAILABILITY_CACHE_TTL", 30)
+        )
+
+
+def approved_intervals(resource_id, sd, ed, cached=True, exclude_id=None):
+    """(start, end, units) of approved bookings overlapping [sd, ed]."""
+    cache = current_app.extensions.get("availability_cache") if cached else None
+    if cache is not None and exclude_id is None:
+        return list(cache.tree(resource_id).overlapping(sd, ed))
+
+    query = approved_overlaps(resource_id, sd, ed)
+    if exclude_id is not None:
+        query = query.filter(Booking.id != exclude_id)
+    return query.with_entities(Booking.start_date, Booking.end_date, booked_units).all()
+
+
+def peak_units(intervals, sd, ed):
+    """Most units reserved on any single day of [sd, ed] (difference-array sweep)."""
+    span = (ed - sd).days + 1
+    diff = [0] * (span + 1)
+    for start, end, units in intervals:
+        diff[max((start - sd).days, 0)] += units
+        diff[min((end - sd).days, span - 1) + 1] -= units
+
+    running = peak = 0
+    for delta in diff[:span]:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+# daily_free_units: up to this many resources filter with IN (...), more scan all approved bookings
+IN_LIST_LIMIT = 50
+
+
+def _day_offset(column, origin, dialect):
+    """SQL for whole days from `origin` to a date column, or None where Python has to do it."""
+    if dialect == "sqlite":
+        return cast(func.julianday(column) - func.julianday(origin.isoformat()), Integer)
+    if dialect == "postgresql":
+        return column - origin  # date - date is an integer
+    return None
+
+
+def daily_free_units(resources, sd, ed):
+    """
+    Free units per day of [sd, ed] for each (resource_id, quantity) in
+    `resources`, as an int array of shape (len(resources), days).
+
+    All approved bookings overlapping the window come back in one query,
+    as day offsets from `sd` (computed by the database, so no date objects
+    are built per row). Each adds +units at its clipped first day and
+    -units after its last in a per-resource difference array; a cumulative
+    sum along the days turns that into units held per day.
+    """
+    span = (ed - sd).days + 1
+    ids = np.array([rid for rid, _ in resources], dtype=np.int64)
+    diff = np.zeros((len(resources), span + 1), dtype=np.int64)
+    if not len(ids):
+        return diff[:, :span]
+
+    # Core rows on the session's connection (replica-routed like any read); ORM
+    # result processing would cost more than the query for a year of bookings
+    overlap = (Booking.status == "Approved", Booking.start_date <= ed, Booking.end_date >= sd)
+    conn = db.session.connection(bind_arguments={"mapper": Booking.__mapper__,
+                                                 "clause": select(Booking.id).where(*overlap)})
+    first = _day_offset(Booking.start_date, sd, conn.dialect.name)
+    last = _day_offset(Booking.end_date, sd, conn.dialect.name)
+    in_sql = first is not None
+    query = select(Booking.resource_id, first if in_sql else Booking.start_date,
+                   last if in_sql else Booking.end_date, booked_units).where(*overlap)
+    if len(ids) <= IN_LIST_LIMIT:  # past that a scan is cheaper; other resources are dropped below
+        query = query.where(Booking.resource_id.in_(ids.tolist()))
+    rows = conn.execute(query).all()
+    if not in_sql:
+        rows = [(rid, (s - sd).days, (e - sd).days, units) for rid, s, e, units in rows]
+
+    if rows:
+        # fromiter over the flattened rows: np.array() on Row objects probes each one for array protocols
+        data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=4 * len(rows)).reshape(-1, 4)
+        order = np.argsort(ids)
+        pos = np.minimum(np.searchsorted(ids, data[:, 0], sorter=order), len(ids) - 1)
+        known = ids[order[pos]] == data[:, 0]
+        data, row = data[known], order[pos[known]]
+        first = np.maximum(data[:, 1], 0)
+        last = np.minimum(data[:, 2], span - 1)
+        np.add.at(diff, (row, first), data[:, 3])
+        np.add.at(diff, (row, last + 1), -data[:, 3])
+
+    held = np.cumsum(diff[:, :span], axis=1)
+    quantity = np.array([q or 1 for _, q in resources], dtype=np.int64)
+    return np.maximum(quantity[:, None] - held, 0)
+
+
+def invalidate(resource_id):
+    cache = current_app.extensions.get("availability_cache")
+    if cache is not None:
+        cache.invalidate(resource_id)
@@ -0,0 +1,297 @@
+# utils/booking_engine.py
+"""
+Quantity-aware booking allocation.
+
+Invariant: on every day, the units held by Approved bookings of a resource
+never exceed Resource.quantity.
+
+The check and the write run in one transaction that first serializes all
+allocations touching the same resource:
+  - PostgreSQL / MySQL: SELECT ... FOR UPDATE on the resource row(s)
+  - SQLite: BEGIN IMMEDIATE (takes the database write lock up front)
+so two gunicorn workers can no longer both see "1 unit left" and both
+take it.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import insert, select, update
+
+from models import db, Resource, Booking
+from utils import aggregates, availability, outbox
+
+
+class CapacityError(Exception):
+    """Raised when a request needs more units than are free on some day."""
+
+    def __init__(self, resource, requested, available):
+        self.resource = resource
+        self.requested = requested
+        self.available = max(available, 0)
+        super().__init__(
+            f"Only {self.available} of {resource.quantity or 1} '{resource.name}' "
+            f"free for the selected dates ({requested} requested)"
+        )
+
+
+def lock_resources(resource_ids):
+    """
+    Start the locked section of the current transaction and return the
+    resources, keyed by id. Missing ids are simply absent from the result.
+    """
+    ids = sorted(set(resource_ids))
+    conn = db.session.connection()
+
+    if conn.dialect.name == "sqlite":
+        # pysqlite only BEGINs lazily before DML; take the write lock now.
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        query = Resource.query.filter(Resource.id.in_(ids))
+    else:
+        # Lock in id order so concurrent multi-resource requests cannot deadlock
+        query = Resource.query.filter(Resource.id.in_(ids)).order_by(Resource.id).with_for_update()
+
+    # populate_existing: re-read quantity inside the lock, not from the identity map
+    return {r.id: r for r in query.populate_existing()}
+
+
+def free_units(resource, sd, ed, exclude_id=None, cached=False):
+    intervals = availability.approved_intervals(resource.id, sd, ed, cached=cached, exclude_id=exclude_id)
+    return (resource.quantity or 1) - availability.peak_units(intervals, sd, ed)
+
+
+def check_capacity(resource, sd, ed, units, exclude_id=None, cached=False):
+    available = free_units(resource, sd, ed, exclude_id=exclude_id, cached=cached)
+    if units > available:
+        raise CapacityError(resource, units, available)
+
+
+def allocate(resource_id, sd, ed, units=1, status="Pending", **fields):
+    """
+    Create a booking for `units` of a resource if they fit, and commit.
+
+    Raises LookupError for an unknown resource and CapacityError when the
+    approved bookings already use too many units on one of the days.
+    """
+    # Cheap pre-check (possibly from the in-memory cache) before taking the lock
+    resource = db.session.get(Resource, resource_id)
+    if resource is None:
+        raise LookupError(f"Resource {resource_id} not found")
+    check_capacity(resource, sd, ed, units, cached=True)
+
+    try:
+        resource = lock_resources([resource_id]).get(resource_id)
+        if resource is None:
+            raise LookupError(f"Resource {resource_id} not found")
+        check_capacity(resource, sd, ed, units)
+
+        booking = Booking(resource_id=resource_id, start_date=sd, end_date=ed,
+                          quantity=units, status=status, **fields)
+        db.session.add(booking)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if status == "Approved":
+        availability.invalidate(resource_id)
+    return booking
+
+
+def approve(booking):
+    """Approve a pending booking if its units still fit, and commit."""
+    try:
+        resource = lock_resources([booking.resource_id])[booking.resource_id]
+        db.session.refresh(booking)
+        if booking.status != "Approved":
+            check_capacity(resource, booking.start_date, booking.end_date,
+                           booking.quantity or 1, exclude_id=booking.id)
+            booking.status = "Approved"
+            outbox.enqueue(outbox.booking_notices([booking], "Approved"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    availability.invalidate(booking.resource_id)
+    return booking
+
+
+def _lock_bookings(booking_ids):
+    """Lock the resources of the given bookings, then read the bookings themselves."""
+    resource_ids = db.session.scalars(
+        select(Booking.resource_id).where(Booking.id.in_(booking_ids)).distinct()
+    ).all()
+    resources = lock_resources(resource_ids)
+    rows = db.session.execute(
+        select(Booking.id, Booking.resource_id, Booking.start_date, Booking.end_date,
+               availability.booked_units.label("quantity"), Booking.status, Booking.event_name, Booking.email)
+        .where(Booking.id.in_(booking_ids))
+        .order_by(Booking.created_at, Booking.id)
+    ).all()
+    return resources, rows
+
+
+def approve_many(booking_ids):
+    """
+    Approve many bookings in one transaction, oldest request first.
+
+    Free units per resource and day over the bookings' whole date range
+    come from one query (availability.daily_free_units); each booking is
+    then checked against that grid and, if it fits, takes its units out
+    of it, so bookings of the same batch count against each other. All
+    that fit are approved with a single UPDATE ... WHERE id IN (...);
+    the rest stay as they are.
+
+    Returns (approved ids, conflicts) where each conflict is a dict with
+    the booking id, the free units and an error message; bookings whose
+    resource no longer exists are conflicts too. Unknown ids and bookings
+    that were already approved are ignored.
+    """
+    ids = sorted(set(booking_ids))
+    approved, conflicts, rows_approved = [], [], []
+    try:
+        resources, rows = _lock_bookings(ids)
+        dated = []
+        for r in rows:
+            if r.status == "Approved":
+                continue
+            if r.resource_id not in resources:
+                conflicts.append({"id": r.id, "available": 0, "error": "Resource not found"})
+            elif r.start_date and r.end_date and r.start_date <= r.end_date:
+                dated.append(r)
+            else:
+                conflicts.append({"id": r.id, "available": 0, "error": "Booking has no valid dates"})
+
+        if dated:
+            start = min(r.start_date for r in dated)
+            end = max(r.end_date for r in dated)
+            order = list(resources)
+            free = availability.daily_free_units([(rid, resources[rid].quantity) for rid in order], start, end)
+            row_of = {rid: i for i, rid in enumerate(order)}
+
+            for r in dated:
+                days = free[row_of[r.resource_id], (r.start_date - start).days:(r.end_date - start).days + 1]
+                available = int(days.min())
+                if r.quantity > available:
+                    conflicts.append({"id": r.id, "available": max(available, 0),
+                                      "error": str(CapacityError(resources[r.resource_id], r.quantity, available))})
+                    continue
+                days -= r.quantity  # a view into `free`: later bookings see these units as taken
+                approved.append(r.id)
+                rows_approved.append(r)
+
+        if approved:
+            db.session.execute(update(Booking).where(Booking.id.in_(approved)).values(status="Approved"))
+            aggregates.record_bookings(db.session.connection(),
+                                       [dict(r._mapping, status="Approved") for r in rows_approved])
+            outbox.enqueue(outbox.booking_notices(rows_approved, "Approved"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for resource_id in {r.resource_id for r in rows_approved}:
+        availability.invalidate(resource_id)
+    return approved, conflicts
+
+
+def reject_many(booking_ids):
+    """Reject many bookings with one UPDATE in one transaction. Returns the ids that changed."""
+    ids = sorted(set(booking_ids))
+    try:
+        _, rows = _lock_bookings(ids)
+        rows = [r for r in rows if r.status != "Rejected"]
+        if rows:
+            db.session.execute(update(Booking).where(Booking.id.in_([r.id for r in rows])).values(status="Rejected"))
+            # Approved -> Rejected gives the units back in the usage aggregates
+            aggregates.record_bookings(db.session.connection(),
+                                       [r._mapping for r in rows if r.status == "Approved"], sign=-1)
+            outbox.enqueue(outbox.booking_notices(rows, "Rejected"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for resource_id in {r.resource_id for r in rows if r.status == "Approved"}:
+        availability.invalidate(resource_id)
+    return [r.id for r in rows]
+
+
+def allocate_many(items, status="Pending", **fields):
+    """
+    All-or-nothing allocation of a whole cart in one transaction.
+
+    `items` is a list of dicts with resource_id, start_date, end_date and
+    quantity (dates already parsed). Every conflict is found with a single
+    query over all the resources involved; earlier items of the same cart
+    count against later ones. Nothing is written unless every item fits.
+
+    Returns (ok, results) where results has one dict per item, in order,
+    carrying the new booking id on success or the free units on conflict.
+    Raises LookupError when a resource does not exist.
+    """
+    try:
+        resources = lock_resources(item["resource_id"] for item in items)
+        missing = sorted({item["resource_id"] for item in items} - set(resources))
+        if missing:
+            raise LookupError(f"Resource {', '.join(map(str, missing))} not found")
+
+        window_start = min(item["start_date"] for item in items)
+        window_end = max(item["end_date"] for item in items)
+        held = defaultdict(list)
+        rows = db.session.query(
+            Booking.resource_id, Booking.start_date, Booking.end_date, availability.booked_units
+        ).filter(
+            Booking.resource_id.in_(list(resources)),
+            Booking.status == "Approved",
+            Booking.start_date <= window_end,
+            Booking.end_date >= window_start,
+        )
+        for resource_id, sd, ed, units in rows:
+            held[resource_id].append((sd, ed, units))
+
+        results, ok = [], True
+        for item in items:
+            resource = resources[item["resource_id"]]
+            sd, ed, units = item["start_date"], item["end_date"], item["quantity"]
+            intervals = [iv for iv in held[resource.id] if iv[0] <= ed and iv[1] >= sd]
+            available = (resource.quantity or 1) - availability.peak_units(intervals, sd, ed)
+            if units > available:
+                results.append({"resource_id": resource.id, "ok": False, "available": max(available, 0),
+                                "error": str(CapacityError(resource, units, available))})
+                ok = False
+            else:
+                held[resource.id].append((sd, ed, units))
+                results.append({"resource_id": resource.id, "ok": True})
+
+        if not ok:
+            db.session.rollback()
+            return False, results
+
+        rows = [dict(fields, resource_id=item["resource_id"], start_date=item["start_date"],
+                     end_date=item["end_date"], quantity=item["quantity"], status=status)
+                for item in items]
+        # One multi-row INSERT. RETURNING order is not guaranteed (SQLite), so
+        # match ids back by value; identical cart lines are interchangeable.
+        inserted = db.session.execute(
+            insert(Booking).returning(Booking.id, Booking.resource_id, Booking.start_date,
+                                      Booking.end_date, Booking.quantity),
+            rows
+        ).all()
+        aggregates.record_bookings(db.session.connection(), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    ids_by_line = defaultdict(list)
+    for booking_id, *line in inserted:
+        ids_by_line[tuple(line)].append(booking_id)
+    for item, result in zip(items, results):
+        line = (item["resource_id"], item["start_date"], item["end_date"], item["quantity"])
+        result["booking_id"] = ids_by_line[line].pop()
+    if status == "Approved":
+        for resource_id in resources:
+            availability.invalidate(resource_id)
+    return True, results
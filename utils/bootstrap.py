@@ -0,0 +1,219 @@
+# utils/bootstrap.py
+"""
+One-shot database bootstrap: bring the schema up to date, then seed demo data.
+
+Importing app.py or calling create_app() never touches the database; this
+runs once per deploy instead, from `flask bootstrap` or from gunicorn's
+on_starting hook (gunicorn.conf.py), i.e. in the master before any worker
+forks. Concurrent runs, such as several instances sharing one database or
+a manual run during a deploy, serialize on a lock and the later ones find
+nothing to do: a session advisory lock on PostgreSQL, flock() on a file
+next to the database on SQLite.
+
+Schema step:
+    empty database           create_all() and stamp the migration head
+    migrated database        alembic upgrade to head
+    pre-migration database   (tables from the old import-time create_all, no
+                             alembic_version) stamped 0001 and upgraded when it
+                             matches that revision; anything else raises
+                             SchemaError rather than starting on a schema the
+                             code does not fit
+
+Flask-Migrate (and with it Alembic) is only imported when a migration
+command actually runs; `flask db ...` is registered as a lazy group.
+"""
+
+import os
+import zlib
+from contextlib import contextmanager, nullcontext
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+
+from models import db, Event, Resource, User
+
+try:
+    import fcntl
+except ImportError:  # Windows: no gunicorn there, so no concurrent workers to guard against
+    fcntl = None
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+ADVISORY_LOCK_KEY = zlib.crc32(b"event_hub.bootstrap")
+
+# Tables and columns of revision 0001, i.e. what the old import-time create_all() built
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = {
+    "event": {"id", "title", "category", "date", "location", "image", "description_short", "description_long",
+              "team_size", "fee"},
+    "resource": {"id", "name", "category", "image", "quantity"},
+    "user": {"id", "name", "email", "password_hash", "is_admin"},
+    "booking": {"id", "resource_id", "user_id", "event_name", "purpose", "start_date", "end_date", "status",
+                "created_at"},
+    "registration": {"id", "event_id", "user_id", "name", "regno", "email", "mobile", "year", "created_at"},
+}
+
+
+class SchemaError(RuntimeError):
+    """The database has tables but no migration history, and they are not the baseline revision."""
+
+
+# ------------------------------------------------------------------
+# Locking
+# ------------------------------------------------------------------
+@contextmanager
+def _file_lock(path):
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _advisory_lock(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            conn.commit()
+
+
+def bootstrap_lock(engine):
+    """Exclusive lock shared by every process bootstrapping this database."""
+    url = engine.url
+    if url.get_backend_name() == "postgresql":
+        return _advisory_lock(engine)
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") and fcntl:
+        return _file_lock(f"{url.database}.bootstrap.lock")
+    return nullcontext()
+
+
+# ------------------------------------------------------------------
+# Schema
+# ------------------------------------------------------------------
+def ensure_migrate(app):
+    """Initialize Flask-Migrate on first use; also replaces the lazy `db` group."""
+    if "migrate" not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=MIGRATIONS_DIR)
+
+
+def _matches_baseline(inspector, existing):
+    if existing - {"sqlite_sequence"} != set(BASELINE_TABLES):
+        return False
+    return all({c["name"] for c in inspector.get_columns(table)} == columns
+               for table, columns in BASELINE_TABLES.items())
+
+
+def ensure_schema(log=print):
+    app = current_app._get_current_object()
+    inspector = inspect(db.engine)
+    existing = set(inspector.get_table_names())
+
+    if "alembic_version" in existing:
+        from flask_migrate import upgrade
+        ensure_migrate(app)
+        upgrade(directory=MIGRATIONS_DIR)
+        log("Schema: migrations applied up to head.")
+    elif not existing & set(db.metadata.tables):
+        from flask_migrate import stamp
+        ensure_migrate(app)
+        db.create_all()
+        stamp(directory=MIGRATIONS_DIR)
+        log("Schema: created tables and stamped the migration head.")
+    elif _matches_baseline(inspector, existing):
+        from flask_migrate import stamp, upgrade
+        ensure_migrate(app)
+        stamp(directory=MIGRATIONS_DIR, revision=BASELINE_REVISION)
+        upgrade(directory=MIGRATIONS_DIR)
+        log(f"Schema: pre-migration database stamped {BASELINE_REVISION} and migrated up to head.")
+    else:
+        raise SchemaError(
+            "Database has tables but no migration history, and they do not match revision "
+            f"{BASELINE_REVISION}. Run `flask db stamp <revision>` with the revision it matches, "
+            "then `flask db upgrade` (see \"Database Migrations\" in the README)."
+        )
+
+
+# ------------------------------------------------------------------
+# Demo data
+# ------------------------------------------------------------------
+def seed_demo(log=print):
+    """Admin account, events and resources from seed/demo.json; each only when missing."""
+    from utils.datagen import demo_rows
+    data = demo_rows()
+
+    admin = data["admin"]
+    if not User.query.filter_by(email=admin["email"]).first():
+        user = User(name=admin["name"], email=admin["email"], is_admin=True)
+        user.set_password(admin["password"])
+        db.session.add(user)
+        log(f"Created admin: {admin['email']} / {admin['password']}")
+
+    if db.session.query(Event.id).first() is None:
+        db.session.add_all(Event(**row) for row in data["events"])
+        log("Seeded sample events.")
+
+    if db.session.query(Resource.id).first() is None:
+        db.session.add_all(Resource(**row) for row in data["resources"])
+        log("Seeded sample resources.")
+
+    db.session.commit()
+
+
+def run(app, seed=None, log=print):
+    """Schema + (optionally) demo data, under the bootstrap lock. Safe to repeat."""
+    if seed is None:
+        seed = app.config.get("BOOTSTRAP_SEED_DEMO", True)
+    with app.app_context():
+        try:
+            with bootstrap_lock(db.engine):
+                ensure_schema(log)
+                if seed:
+                    seed_demo(log)
+        finally:
+            db.session.remove()
+            # Don't hand pooled connections to forked workers
+            db.engine.dispose()
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+class LazyMigrateGroup(click.Group):
+    """`flask db ...` that imports Flask-Migrate only when it is invoked."""
+
+    def __init__(self, app):
+        super().__init__("db", help="Perform database migrations.")
+        self.app = app
+
+    def _commands(self):
+        ensure_migrate(self.app)
+        from flask_migrate.cli import db as group
+        return group
+
+    def list_commands(self, ctx):
+        return self._commands().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._commands().get_command(ctx, name)
+
+
+@click.command("bootstrap")
+@click.option("--seed/--no-seed", default=None,
+              help="Insert demo data when missing (default: BOOTSTRAP_SEED_DEMO).")
+@with_appcontext
+def bootstrap_command(seed):
+    """Create or migrate the schema and seed demo data, once per database."""
+    run(current_app._get_current_object(), seed=seed, log=click.echo)
+
+
+def init_app(app):
+    app.cli.add_command(LazyMigrateGroup(app))
+    app.cli.add_command(bootstrap_command)
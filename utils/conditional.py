@@ -0,0 +1,73 @@
+# utils/conditional.py
+"""
+ETag / Last-Modified validators for event and resource pages.
+
+The validators come from the `updated_at` column alone: a detail view asks
+for one row's updated_at, a list view for COUNT(*) and MAX(updated_at)
+(both answered from the updated_at index). When the client's
+If-None-Match / If-Modified-Since still match, the view is never called,
+so a 304 costs one indexed lookup and no template rendering.
+
+Responses are marked `Cache-Control: no-cache`: clients may keep them but
+must revalidate, which is exactly what a polling modal wants.
+"""
+
+import functools
+import hashlib
+
+from flask import current_app, make_response, request
+from sqlalchemy import func
+from werkzeug.http import is_resource_modified
+
+from models import db
+
+
+def _etag(*parts):
+    return hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:20]
+
+
+def row_version(model, id_arg):
+    """Validators for a single row, looked up by the `id_arg` view argument."""
+    def validators(**view_args):
+        row_id = view_args[id_arg]
+        row = db.session.query(model.updated_at).filter(model.id == row_id).first()
+        if row is None:
+            return None  # let the view produce its 404
+        return _etag(model.__tablename__, row_id, row.updated_at), row.updated_at
+    return validators
+
+
+def table_version(model):
+    """Validators for a list page: changes, inserts and deletes all move them."""
+    def validators(**view_args):
+        count, latest = db.session.query(func.count(model.id), func.max(model.updated_at)).one()
+        return _etag(model.__tablename__, count, latest), latest
+    return validators
+
+
+def conditional(validators):
+    """Answer GET/HEAD with 304 when the client's copy is current, else tag the response."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            if request.method not in ("GET", "HEAD"):
+                return view(**view_args)
+            current = validators(**view_args)
+            if current is None:
+                return view(**view_args)
+
+            etag, last_modified = current
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(**view_args))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
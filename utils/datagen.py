@@ -0,0 +1,365 @@
+# utils/datagen.py
+"""
+Synthetic data for load and performance testing: `flask generate-data`.
+
+Appends N users, resources, events, registrations and bookings with
+skewed, campus-like distributions: a few events draw most registrations
+(Zipf), sign-ups cluster in the weeks before an event, most bookings are
+short and approved. The same --seed against the same starting database
+produces the same rows.
+
+Rows are produced lazily in chunks and written with one executemany per
+chunk, in one transaction per table, so memory stays flat at a million
+rows. Core `insert()` is the portable path. --fast goes through the
+driver instead: COPY on PostgreSQL (psycopg2), raw executemany on other
+databases with secondary indexes dropped for the load and rebuilt once at
+the end, and `synchronous=OFF` on SQLite.
+
+Bulk loads bypass the ORM, so commit hooks don't see them; the response
+cache's collection tags are bumped at the end, other per-process caches
+catch up within their TTL.
+"""
+
+import csv
+import io
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from operator import methodcaller
+from pathlib import Path
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import Date, DateTime, func, select
+from werkzeug.security import generate_password_hash
+
+from models import db, Booking, Event, Registration, Resource, User
+
+DEMO_FILE = Path(__file__).resolve().parent.parent / "seed" / "demo.json"
+
+FIRST_NAMES = ("Aarav Aditi Arjun Ananya Dev Diya Ishaan Kavya Kiran Meera Nikhil Priya Rahul Riya "
+               "Rohan Sahil Sanya Shreya Tanvi Varun Vikram Zara Aisha Kabir Neha Omar Pooja Ravi").split()
+LAST_NAMES = ("Sharma Verma Iyer Reddy Nair Gupta Mehta Khan Das Rao Patel Singh Joshi Menon Bose "
+              "Kapoor Pillai Shah Ghosh Kulkarni").split()
+EVENT_KINDS = ("Hackathon Workshop Quiz Expo Contest Seminar Symposium Showcase Fest Night Meetup "
+               "Championship Bootcamp Summit").split()
+EVENT_TOPICS = ("Robotics AI Cloud Coding Design Startup Music Dance Drama Photography Film Debate "
+                "Chess Gaming Cricket Football Art Poetry Quantum Blockchain Data Web Mobile").split()
+WORDS = ("teams compete prizes mentors hands-on sessions industry experts networking finals stage "
+         "live judges open registration certificates workshop talks demos food music games").split()
+CATEGORIES = {"Technical": 30, "Hackathons": 12, "Workshops": 15, "Non-Technical": 18,
+              "Social": 10, "Sports": 8, "Expo": 7}
+LOCATIONS = ("Main Auditorium", "Exhibition Hall D", "Coding Lab", "Amphitheater", "Open Ground",
+             "Seminar Hall 1", "Seminar Hall 2", "Convention Center", "Library Atrium", "Sports Complex")
+IMAGES = ("ripples.jpg", "expo.jpg", "hack.jpg", "djnight.jpg", "freshers.jpg")
+RESOURCE_KINDS = {
+    "Projector": "AV", "Projector Screen": "AV", "Wireless Mic": "Audio", "Sound System": "Audio",
+    "PA System": "Audio", "Decoration Lights": "Decoration", "Stage Setup": "Furniture",
+    "Folding Chairs": "Furniture", "Power Strips": "Equipment", "Laptop Stand": "Equipment",
+    "Seminar Hall": "Hall", "Banner Stand": "Decoration",
+}
+RESOURCE_IMAGES = {"AV": "projector.jpg", "Audio": "mic.jpg", "Decoration": "lights.jpg",
+                   "Furniture": "stage.jpg", "Equipment": "power.jpg", "Hall": "hall.jpg"}
+FULL_NAMES = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+YEARS = {"1st": 35, "2nd": 28, "3rd": 22, "4th": 15}
+BOOKING_STATUS = {"Approved": 60, "Pending": 28, "Rejected": 12}
+BLOCK = 10000
+
+
+def zipf_weights(n, s=1.1):
+    """Cumulative weights for picking among n items, rank r with probability ~ 1/r^s."""
+    return list(accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+def _weighted(rnd, table):
+    return rnd.choices(list(table), weights=list(table.values()))[0]
+
+
+# ------------------------------------------------------------------
+# Row generators (tuples in the order of each COLUMNS entry)
+# ------------------------------------------------------------------
+COLUMNS = {
+    User: ("name", "email", "password_hash", "is_admin"),
+    Resource: ("name", "category", "image", "quantity", "updated_at"),
+    Event: ("title", "category", "date", "location", "image", "description_short",
+            "description_long", "team_size", "fee", "updated_at"),
+    Registration: ("event_id", "user_id", "name", "regno", "email", "mobile", "year", "created_at"),
+    Booking: ("resource_id", "user_id", "event_name", "purpose", "start_date", "end_date",
+              "quantity", "status", "created_at"),
+}
+
+
+def users(rnd, n, base, password_hash):
+    for i in range(base, base + n):
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        yield (f"{first} {last}", f"{first}.{last}.{i}@students.example.edu".lower(), password_hash, False)
+
+
+def resources(rnd, n, base, now):
+    kinds = list(RESOURCE_KINDS)
+    for i in range(base, base + n):
+        kind = rnd.choice(kinds)
+        category = RESOURCE_KINDS[kind]
+        quantity = 1 if category == "Hall" else rnd.choice((1, 2, 3, 4, 5, 8, 10, 15, 20))
+        yield (f"{kind} {i}", category, RESOURCE_IMAGES[category], quantity, now)
+
+
+def events(rnd, n, base, anchor, now):
+    for i in range(base, base + n):
+        kind, topic = rnd.choice(EVENT_KINDS), rnd.choice(EVENT_TOPICS)
+        # Most events are a few weeks out, with a long tail of past ones
+        day = anchor + timedelta(days=round(rnd.triangular(-365, 180, 30)))
+        short = f"{topic} {kind.lower()}: " + " ".join(rnd.choices(WORDS, k=6))
+        yield (f"{topic} {kind} {i}", _weighted(rnd, CATEGORIES), day, rnd.choice(LOCATIONS),
+               rnd.choice(IMAGES), short, " ".join(rnd.choices(WORDS, k=40)),
+               rnd.choice(("Individual", "2-3 Members", "3-5 Members", "5-8 Members", "Unlimited")),
+               rnd.choice(("Free", "100", "200", "500 per Team", "$15 per Person")), now)
+
+
+def _blocks(start, stop, size=BLOCK):
+    for lo in range(start, stop, size):
+        yield lo, min(size, stop - lo)
+
+
+def registrations(rnd, n, base, event_ids, event_dates, user_ids):
+    # Draws are made a block at a time: rnd.choices(k=...) is far cheaper than per-row calls
+    cum = zipf_weights(len(event_ids))
+    midnights = [datetime.combine(d, datetime.min.time()) for d in event_dates]
+    for lo, m in _blocks(base, base + n):
+        picks = rnd.choices(range(len(event_ids)), cum_weights=cum, k=m)
+        people = rnd.choices(user_ids, k=m) if user_ids else [None] * m
+        names = rnd.choices(FULL_NAMES, k=m)
+        years = rnd.choices(list(YEARS), list(YEARS.values()), k=m)
+        for j, k in enumerate(picks):
+            i = lo + j
+            # Sign-ups pile up in the last days before the event
+            before = int(min(rnd.expovariate(1 / 7), 90) * 86400)
+            yield (event_ids[k], people[j], names[j], f"GEN{i:08d}", f"reg{i}@students.example.edu",
+                   f"9{rnd.getrandbits(32) % 10 ** 9:09d}", years[j], midnights[k] - timedelta(seconds=before))
+
+
+def bookings(rnd, n, resource_ids, resource_qty, event_titles, user_ids, anchor, now):
+    cum = zipf_weights(len(resource_ids), 0.8)
+    for _, m in _blocks(0, n):
+        picks = rnd.choices(range(len(resource_ids)), cum_weights=cum, k=m)
+        people = rnd.choices(user_ids, k=m) if user_ids else [None] * m
+        titles = rnd.choices(event_titles, k=m) if event_titles else ["Department event"] * m
+        statuses = rnd.choices(list(BOOKING_STATUS), list(BOOKING_STATUS.values()), k=m)
+        for j, k in enumerate(picks):
+            start = anchor + timedelta(days=rnd.randint(-120, 120))
+            end = start + timedelta(days=min(int(rnd.expovariate(1.2)), 6))
+            yield (resource_ids[k], people[j], titles[j], " ".join(rnd.choices(WORDS, k=8)), start, end,
+                   rnd.randint(1, min(resource_qty[k], 3)), statuses[j],
+                   now - timedelta(minutes=rnd.randrange(60 * 24 * 120)))
+
+
+# ------------------------------------------------------------------
+# Loading
+# ------------------------------------------------------------------
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy(conn, table, columns, chunks):
+    """PostgreSQL COPY FROM STDIN (psycopg2), one CSV buffer per chunk."""
+    cursor = conn.connection.dbapi_connection.cursor()
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    for chunk in chunks:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(tuple("\\N" if v is None else v for v in row) for row in chunk)
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+
+
+def _converter(column, dialect):
+    """The column's bind processing for raw executemany, or None when values pass through."""
+    processor = column.type.dialect_impl(dialect).bind_processor(dialect)
+    if processor is None:
+        return None
+    # SQLite stores DATETIME/DATE as ISO text; when the dialect's output is
+    # exactly isoformat(), use the C method instead of its %-formatting
+    candidates = ((DateTime, datetime(2001, 2, 3, 4, 5, 6, 7), methodcaller("isoformat", " ", "microseconds")),
+                  (Date, date(2001, 2, 3), methodcaller("isoformat")))
+    for kind, sample, fast in candidates:
+        if isinstance(column.type, kind) and processor(sample) == fast(sample):
+            return fast
+    return processor
+
+
+def _executemany(conn, table, columns, chunks):
+    """Driver-level executemany, with the columns' bind processing applied column-wise."""
+    placeholder = {"qmark": "?", "format": "%s", "pyformat": "%s"}[conn.dialect.paramstyle]
+    sql = (f"INSERT INTO {table.name} ({', '.join(columns)}) "
+           f"VALUES ({', '.join([placeholder] * len(columns))})")
+    converters = [(i, conv) for i, conv in enumerate(_converter(table.c[c], conn.dialect) for c in columns)
+                  if conv is not None]
+    for chunk in chunks:
+        if converters:
+            cols = list(zip(*chunk))
+            for i, conv in converters:
+                cols[i] = [None if v is None else conv(v) for v in cols[i]]
+            chunk = list(zip(*cols))
+        conn.exec_driver_sql(sql, chunk)
+
+
+def insert_rows(conn, model, rows, chunk=10000, fast=False, expected=None):
+    """
+    Insert an iterable of COLUMNS[model] tuples in executemany chunks and
+    return the row count. `expected` (the number of rows coming) lets the
+    fast path decide whether rebuilding the indexes afterwards pays off.
+    """
+    table, columns = model.__table__, COLUMNS[model]
+    counted = []
+    chunks = (counted.append(len(c)) or c for c in _chunks(rows, chunk))
+
+    if not fast:
+        for c in chunks:
+            conn.execute(table.insert(), [dict(zip(columns, row)) for row in c])
+        return sum(counted)
+
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        _copy(conn, table, columns, chunks)
+        return sum(counted)
+
+    # Building indexes once after the load beats updating them per row, but
+    # only while the load is large compared to what is already there
+    existing = conn.execute(select(func.count()).select_from(table)).scalar()
+    indexes = list(table.indexes) if expected and expected > existing else []
+    for ix in indexes:
+        ix.drop(conn)
+    _executemany(conn, table, columns, chunks)
+    for ix in indexes:
+        ix.create(conn)
+    return sum(counted)
+
+
+def _max_id(conn, model):
+    return conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar()
+
+
+def generate(engine, counts, seed=42, chunk=10000, fast=False, anchor=None, log=print):
+    """
+    Append synthetic rows. `counts` maps "users", "resources", "events",
+    "registrations" and "bookings" to how many to create. Registrations and
+    bookings reference the users/events/resources generated in the same
+    run, or every existing row when none were. Returns {table: (rows, seconds)}.
+    """
+    rnd = random.Random(seed)
+    anchor = anchor or date.today()
+    now = datetime.utcnow().replace(microsecond=0)
+    password_hash = generate_password_hash("password")  # one hash for every generated user
+    stats = {}
+
+    def load(model, n, make_rows):
+        """Insert n rows; returns the id the new rows start after."""
+        with engine.connect() as conn:
+            before = _max_id(conn, model)
+            if not n:
+                return 0
+            relax = fast and conn.dialect.name == "sqlite"
+            if relax:
+                synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.commit()
+            try:
+                started = time.perf_counter()
+                inserted = insert_rows(conn, model, make_rows(before + 1), chunk, fast, expected=n)
+                conn.commit()
+                seconds = time.perf_counter() - started
+            finally:
+                conn.rollback()  # no-op after the commit; never commit half a load below
+                if relax:
+                    conn.exec_driver_sql(f"PRAGMA synchronous={int(synchronous)}")
+                    conn.commit()
+        stats[model.__tablename__] = (inserted, seconds)
+        log(f"  {model.__tablename__:<13} {inserted:>9,} rows {seconds:7.2f} s"
+            f"  {inserted / max(seconds, 1e-9):>10,.0f} rows/s")
+        return before
+
+    def referenced(*columns, after):
+        with engine.connect() as conn:
+            return conn.execute(select(*columns).where(columns[0] > after).order_by(columns[0])).all()
+
+    n = counts.get("users", 0)
+    after = load(User, n, lambda base: users(rnd, n, base, password_hash))
+    user_ids = [r.id for r in referenced(User.id, after=after)]
+
+    n = counts.get("resources", 0)
+    after = load(Resource, n, lambda base: resources(rnd, n, base, now))
+    resource_rows = referenced(Resource.id, Resource.quantity, after=after)
+
+    n = counts.get("events", 0)
+    after = load(Event, n, lambda base: events(rnd, n, base, anchor, now))
+    event_rows = referenced(Event.id, Event.date, Event.title, after=after)
+
+    n = counts.get("registrations", 0) if event_rows else 0
+    load(Registration, n, lambda base: registrations(
+        rnd, n, base, [r.id for r in event_rows], [r.date or anchor for r in event_rows], user_ids))
+
+    n = counts.get("bookings", 0) if resource_rows else 0
+    load(Booking, n, lambda base: bookings(
+        rnd, n, [r.id for r in resource_rows], [r.quantity or 1 for r in resource_rows],
+        [r.title for r in event_rows], user_ids, anchor, now))
+
+    if counts.get("registrations") or counts.get("bookings"):
+        # Rows went in through Core, past the incremental counters
+        from utils import aggregates
+        with engine.begin() as conn:
+            aggregates.rebuild(conn)
+
+    from utils import response_cache
+    response_cache.invalidate("event", "resource")
+    return stats
+
+
+# ------------------------------------------------------------------
+# Demo seed
+# ------------------------------------------------------------------
+def demo_rows(path=DEMO_FILE):
+    """The small showcase dataset from seed/demo.json, as model keyword dicts."""
+    data = json.loads(Path(path).read_text())
+    for row in data["events"]:
+        if row.get("date"):
+            row["date"] = date.fromisoformat(row["date"])
+    return data
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+@click.command("generate-data")
+@click.option("--users", type=int, default=1000, show_default=True)
+@click.option("--resources", type=int, default=100, show_default=True)
+@click.option("--events", type=int, default=500, show_default=True)
+@click.option("--registrations", type=int, default=100000, show_default=True)
+@click.option("--bookings", type=int, default=10000, show_default=True)
+@click.option("--seed", type=int, default=42, show_default=True, help="Random seed; same seed, same rows.")
+@click.option("--chunk", type=int, default=10000, show_default=True, help="Rows per executemany.")
+@click.option("--fast/--portable", default=False,
+              help="Driver-level load (COPY on PostgreSQL, deferred index builds) instead of Core inserts.")
+@click.option("--anchor", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="'Today' for generated dates (default: today).")
+@with_appcontext
+def generate_data_command(users, resources, events, registrations, bookings, seed, chunk, fast, anchor):
+    """Append synthetic users, resources, events, registrations and bookings."""
+    counts = {"users": users, "resources": resources, "events": events,
+              "registrations": registrations, "bookings": bookings}
+    click.echo(f"Generating ({'fast' if fast else 'portable'} path, seed {seed}):")
+    stats = generate(db.engine, counts, seed=seed, chunk=chunk, fast=fast,
+                     anchor=anchor.date() if anchor else None, log=click.echo)
+    rows = sum(n for n, _ in stats.values())
+    seconds = sum(s for _, s in stats.values())
+    click.echo(f"Done: {rows:,} rows in {seconds:.1f} s. Generated users log in with password 'password'.")
+
+
+def init_app(app):
+    app.cli.add_command(generate_data_command)
@@ -0,0 +1,111 @@
+# utils/db_routing.py
+"""
+Read-replica routing for db.session.
+
+With DATABASE_REPLICA_URLS set, each replica gets its own engine (pool
+profile and SQLite PRAGMAs from utils/engine_profile) and RoutingSession
+decides per statement where it goes:
+
+  - GET/HEAD/OPTIONS requests send their SELECTs to one replica, picked
+    at random when the request starts and kept for the whole request;
+  - flushes, INSERT/UPDATE/DELETE, session.connection() (row locks,
+    BEGIN IMMEDIATE) and everything outside a request (CLI commands,
+    the write-behind thread) use the primary;
+  - views that write on GET (admin approve/reject/delete links) opt out
+    with @use_primary.
+
+Read-your-writes: once a request writes, the rest of it reads from the
+primary, and the response sets a short-lived cookie (REPLICA_STICKY_SECONDS)
+so the same browser keeps reading from the primary until the replicas
+have caught up, e.g. the dashboard shown after approving a booking.
+
+Without replicas nothing is registered and the session behaves exactly
+like Flask-SQLAlchemy's.
+"""
+
+import random
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.sql.dml import UpdateBase
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+STICKY_COOKIE = "db_primary"
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or not has_request_context():
+            return engine
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            _wrote()
+            return engine
+        if clause is None:
+            return engine  # a bare lookup (dialect, metadata) is not a write; connection() decides
+
+        replica = g.get("db_replica")
+        if replica is not None and engine is self._db.engines.get(None):
+            return replica
+        return engine
+
+    def connection(self, bind_arguments=None, execution_options=None):
+        # Without a statement to route, an explicit connection is for locks / raw DML
+        if has_request_context() and not (bind_arguments and "clause" in bind_arguments):
+            _wrote()
+        return super().connection(bind_arguments=bind_arguments, execution_options=execution_options)
+
+
+def _wrote():
+    if g.get("db_replica") is not None:
+        g.db_replica = None  # this request has written: read it back from the primary
+    g.db_wrote = True
+
+
+def use_primary(view):
+    """Mark a view that writes on a safe method; its reads stay on the primary."""
+    view.use_primary = True
+    return view
+
+
+def _choose_replica():
+    replicas = current_app.extensions["db_routing"]
+    view = current_app.view_functions.get(request.endpoint)
+    if (request.method in SAFE_METHODS
+            and not getattr(view, "use_primary", False)
+            and STICKY_COOKIE not in request.cookies):
+        g.db_replica = random.choice(replicas)
+
+
+def _stick_after_write(response):
+    if g.get("db_wrote") or request.method not in SAFE_METHODS:
+        seconds = current_app.config.get("REPLICA_STICKY_SECONDS", 10)
+        response.set_cookie(STICKY_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
+    return response
+
+
+def _read_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def init_app(app):
+    from utils import engine_profile  # imports models, which imports this module
+
+    engines = []
+    for url in app.config.get("DATABASE_REPLICA_URLS") or []:
+        engine = create_engine(url, **engine_profile.engine_options(url, app.config))
+        engine_profile.tune(engine, app.config)
+        if engine.dialect.name == "sqlite":
+            # A replica stand-in file must never be written to by the app
+            event.listen(engine, "connect", _read_only)
+        engines.append(engine)
+    if not engines:
+        return
+
+    app.extensions["db_routing"] = engines
+    app.before_request(_choose_replica)
+    app.after_request(_stick_after_write)
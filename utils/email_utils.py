@@ -1,3 +1,131 @@
+# utils/email_utils.py
+"""
+Outgoing mail transport.
+
+Requests never talk to SMTP: they queue messages in the notification
+outbox (utils/outbox.py) and a worker delivers them through a mailer
+from here. SMTPMailer keeps one connection open across messages and
+batches and reconnects when the server has dropped it; without
+MAIL_SERVER, ConsoleMailer only logs what would have been sent.
+"""
+
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+
+log = logging.getLogger(__name__)
+
+# The server answered (smtplib errors are OSErrors too); anything else is a broken connection
+REPLY_ERRORS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+def is_connection_error(error):
+    return isinstance(error, OSError) and not isinstance(error, REPLY_ERRORS)
+
+
+def is_permanent(error):
+    """5xx replies and refused recipients will not succeed on a retry."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class SMTPMailer:
+    def __init__(self, host, port=25, use_tls=False, username=None, password=None,
+                 sender="events@college.local", timeout=10, idle_timeout=60):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connections = 0  # opened so far; each one serves many messages
+        self._smtp = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+        except Exception:
+            smtp.close()
+            raise
+        self.connections += 1
+        self._smtp = smtp
+
+    def send(self, recipient, subject, body):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+
+        reused = self._smtp is not None
+        if not reused:
+            self._connect()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server closed a connection we kept open: one fresh try
+            self.close()
+            if not reused:
+                raise
+            self._connect()
+            self._smtp.send_message(message)
+        except REPLY_ERRORS:
+            raise  # message-level; the connection stays usable
+        except OSError:
+            self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self):
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+
+    def close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+class ConsoleMailer:
+    """Development stand-in: logs messages instead of sending them."""
+
+    def send(self, recipient, subject, body):
+        log.info("Email to %s: %s\n%s", recipient, subject, body)
+
+    def close_if_idle(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def mailer_from_config(config):
+    if not config.get("MAIL_SERVER"):
+        return ConsoleMailer()
+    return SMTPMailer(
+        config["MAIL_SERVER"],
+        port=config.get("MAIL_PORT", 25),
+        use_tls=config.get("MAIL_USE_TLS", False),
+        username=config.get("MAIL_USERNAME"),
+        password=config.get("MAIL_PASSWORD"),
+        sender=config.get("MAIL_DEFAULT_SENDER", "events@college.local"),
+        timeout=config.get("MAIL_TIMEOUT", 10),
+    )
+
+
 def send_email(to_address, subject, body):
-    """Stub email sender. Replace with real implementation before production."""
-    print(f"Sending email to {to_address}: {subject}\n{body}")
+    """Queue a plain email in the notification outbox; it is sent once the caller's transaction commits."""
+    from utils import outbox  # outbox imports this module for the transport
+    outbox.enqueue([{"kind": "plain", "recipient": to_address, "payload": {"subject": subject, "body": body}}])
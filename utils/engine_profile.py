@@ -0,0 +1,73 @@
+# utils/engine_profile.py
+"""
+Engine tuning from config: SQLite PRAGMAs and server-database pool sizing.
+
+SQLite keeps most of its settings per connection, so SQLITE_PRAGMAS are
+applied from a "connect" event on every connection the pool opens
+(journal_mode=WAL is stored in the database file, the rest is not).
+Server databases get pool_size / max_overflow / pool_recycle from
+DB_POOL_* and pool_pre_ping, so connections dropped by a restart or an
+idle timeout are replaced instead of failing the next request.
+
+    engine_profile.configure(app)   # before db.init_app(): engine options
+    db.init_app(app)
+    engine_profile.init_app(app)    # after: PRAGMA listeners on the engines
+"""
+
+from functools import partial
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from models import db
+
+
+def pool_options(config):
+    """Engine options for a server database, from DB_POOL_* (unset ones keep SQLAlchemy's defaults)."""
+    options = {"pool_pre_ping": True}
+    for key, option in (("DB_POOL_SIZE", "pool_size"), ("DB_MAX_OVERFLOW", "max_overflow"),
+                        ("DB_POOL_RECYCLE", "pool_recycle")):
+        if config.get(key) is not None:
+            options[option] = config[key]
+    return options
+
+
+def engine_options(uri, config):
+    """Pool options for an engine on `uri`: the DB_POOL_* profile for server databases, none for SQLite."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}  # SQLite is tuned per connection instead; its pool defaults already fit
+    return pool_options(config)
+
+
+def configure(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS with the pool profile; explicit options win."""
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if not uri:
+        return
+    options = engine_options(uri, app.config)
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def apply_pragmas(dbapi_connection, connection_record, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def tune(engine, config):
+    """Apply SQLITE_PRAGMAS to every new connection of `engine` (no-op for other databases)."""
+    pragmas = config.get("SQLITE_PRAGMAS")
+    if pragmas and engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", partial(apply_pragmas, pragmas=dict(pragmas)))
+
+
+def init_app(app):
+    if not app.config.get("SQLITE_PRAGMAS"):
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            tune(engine, app.config)
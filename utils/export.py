@@ -0,0 +1,99 @@
+# utils/export.py
+"""
+Streaming CSV exports for the admin.
+
+Rows come from a Core SELECT run with yield_per, so the driver hands them
+over in batches (a server-side cursor on PostgreSQL, incremental
+fetchmany on SQLite) and nothing holds the whole table: memory stays flat
+whatever the row count, and the first bytes leave before the last row is
+read. Each batch is written through csv.writer into a small buffer that
+is yielded as one chunk.
+
+Text cells that a spreadsheet would evaluate as formulas (=, +, -, @
+prefixes) are always neutralised by quoting them with ', since names and
+event titles come from public forms. `excel=True` only adds a UTF-8 byte
+order mark, so Excel picks the right encoding for non-ASCII names.
+"""
+
+import csv
+import io
+from datetime import date, datetime, time
+
+from sqlalchemy import select
+
+from models import db, Booking, Event, Registration, Resource
+
+BATCH = 1000
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def registrations(event_id=None, date_from=None, date_to=None):
+    """Registrations with their event title, oldest first; dates filter on created_at."""
+    stmt = (
+        select(Registration.id, Registration.event_id, Event.title.label("event"), Registration.name,
+               Registration.regno, Registration.email, Registration.mobile, Registration.year,
+               Registration.created_at)
+        .outerjoin(Event, Event.id == Registration.event_id)
+        .order_by(Registration.id)
+    )
+    if event_id:
+        stmt = stmt.where(Registration.event_id == event_id)
+    if date_from:
+        stmt = stmt.where(Registration.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        stmt = stmt.where(Registration.created_at <= datetime.combine(date_to, time.max))
+    return stmt
+
+
+def bookings(status=None, resource_id=None, event=None, date_from=None, date_to=None):
+    """Bookings with their resource name; dates keep bookings that overlap the range."""
+    stmt = (
+        select(Booking.id, Booking.resource_id, Resource.name.label("resource"), Booking.event_name,
+               Booking.purpose, Booking.quantity, Booking.start_date, Booking.end_date, Booking.status,
+               Booking.created_at)
+        .outerjoin(Resource, Resource.id == Booking.resource_id)
+        .order_by(Booking.id)
+    )
+    if status:
+        stmt = stmt.where(Booking.status == status)
+    if resource_id:
+        stmt = stmt.where(Booking.resource_id == resource_id)
+    if event:
+        stmt = stmt.where(Booking.event_name == event)
+    if date_from:
+        stmt = stmt.where(Booking.end_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Booking.start_date <= date_to)
+    return stmt
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(stmt, excel=False, batch=BATCH):
+    """Yield the result of `stmt` as CSV text chunks, header first, one chunk per batch of rows."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def take():
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
+    result = db.session.execute(stmt.execution_options(yield_per=batch))
+    try:
+        writer.writerow(result.keys())
+        yield ("\ufeff" if excel else "") + take()
+        for rows in result.partitions():
+            writer.writerows([_cell(v) for v in row] for row in rows)
+            yield take()
+    finally:
+        result.close()
@@ -0,0 +1,209 @@
+# utils/images.py
+"""
+Responsive image variants for static/img.
+
+`flask build-images` resizes every source image in static/img to a few
+fixed widths, in WebP plus a JPEG fallback (PNG for images with
+transparency), and writes them to static/img/variants together with a
+manifest.json. Output names carry a content hash, so variants never go
+stale in a browser cache. Sources whose hash is unchanged since the last
+build are skipped, and the rest are processed on a process pool.
+
+Templates call `image_url(name, width)` and `image_srcset(name, fmt)`
+(registered as Jinja globals). Without a manifest entry both fall back to
+the original file (served from the UPLOADED_IMAGES_ZIP bundle when it has
+it, see utils/zip_store.py), so a fresh checkout works before the first
+build.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import click
+from flask import current_app, url_for
+from flask.cli import with_appcontext
+
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+DEFAULT_WIDTHS = (160, 320, 640, 1280)
+VARIANTS_DIR = "variants"
+MANIFEST = "manifest.json"
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def render_variants(source, out_dir, widths, digest):
+    """Worker: write every variant of one source image and return its manifest entry."""
+    from PIL import Image, ImageOps  # only needed by the build step
+
+    source, out_dir = Path(source), Path(out_dir)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    fallback = "png" if has_alpha else "jpeg"
+
+    # Never upscale; an image narrower than every width gets one variant at its own size
+    targets = sorted({w for w in widths if w < image.width} | {min(max(widths), image.width)})
+    entry = {"hash": digest, "width": image.width, "height": image.height,
+             "fallback": fallback, "variants": {"webp": {}, fallback: {}}}
+
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        for fmt in ("webp", fallback):
+            name = f"{source.stem}-{width}-{digest[:10]}.{'jpg' if fmt == 'jpeg' else fmt}"
+            if fmt == "webp":
+                resized.save(out_dir / name, "WEBP", quality=80, method=6)
+            elif fmt == "png":
+                resized.save(out_dir / name, "PNG", optimize=True)
+            else:
+                resized.save(out_dir / name, "JPEG", quality=82, optimize=True, progressive=True)
+            entry["variants"][fmt][str(width)] = f"{VARIANTS_DIR}/{name}"
+    return source.name, entry
+
+
+def _variant_files(entry):
+    return [path for by_width in entry["variants"].values() for path in by_width.values()]
+
+
+def build(source_dir, widths=DEFAULT_WIDTHS, workers=None, force=False, log=print):
+    """Bring <source_dir>/variants up to date. Returns (built, skipped, removed) counts."""
+    source_dir = Path(source_dir)
+    out_dir = source_dir / VARIANTS_DIR
+    out_dir.mkdir(exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    try:
+        old = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        old = {}
+
+    manifest, jobs, skipped = {}, [], 0
+    for source in sorted(source_dir.iterdir()):
+        if not source.is_file() or source.suffix.lower() not in SOURCE_EXTENSIONS:
+            continue
+        digest = file_hash(source)
+        entry = old.get(source.name)
+        if (not force and entry and entry["hash"] == digest
+                and all((source_dir / p).exists() for p in _variant_files(entry))):
+            manifest[source.name] = entry
+            skipped += 1
+        else:
+            jobs.append((str(source), str(out_dir), tuple(widths), digest))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_variants, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    name, entry = future.result()
+                except Exception as e:  # a corrupt source must not stop the build
+                    log(f"  ! failed {Path(job[0]).name}: {e}")
+                    continue
+                manifest[name] = entry
+                log(f"  built {name} -> {len(_variant_files(entry))} variants")
+
+    # Drop variants that no longer belong to any source
+    keep = {Path(p).name for entry in manifest.values() for p in _variant_files(entry)}
+    removed = 0
+    for path in out_dir.iterdir():
+        if path.name != MANIFEST and path.name not in keep:
+            path.unlink()
+            removed += 1
+
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=".manifest-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return len(manifest) - skipped, skipped, removed
+
+
+# ------------------------------------------------------------------
+# Template helpers
+# ------------------------------------------------------------------
+class ManifestFile:
+    """A JSON manifest written by a build step, re-read whenever its mtime changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._data = {}
+
+    def get(self, name):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._mtime:
+            try:
+                self._data = json.loads(Path(self.path).read_text())
+            except (OSError, ValueError):
+                self._data = {}
+            self._mtime = mtime
+        return self._data.get(name)
+
+
+def _manifest():
+    return current_app.extensions["image_manifest"]
+
+
+def image_url(name, width=None):
+    """URL of the fallback-format variant at least `width` wide (or the widest)."""
+    entry = _manifest().get(name) if name else None
+    if entry is None:
+        # Not built from static/img: the UPLOADED_IMAGES_ZIP bundle, then the plain file
+        store = current_app.extensions.get("zip_store")
+        if store is not None and name in store:
+            return url_for("media", name=name)
+        return url_for("static", filename=f"img/{name}")
+    by_width = entry["variants"][entry["fallback"]]
+    widths = sorted(int(w) for w in by_width)
+    chosen = next((w for w in widths if width and w >= width), widths[-1])
+    return url_for("static", filename=f"img/{by_width[str(chosen)]}")
+
+
+def image_srcset(name, fmt="webp"):
+    """`url 320w, url 640w, ...` for one format, or "" when no variants exist."""
+    entry = _manifest().get(name) if name else None
+    if entry is None:
+        return ""
+    fmt = entry["fallback"] if fmt == "fallback" else fmt
+    by_width = entry["variants"].get(fmt, {})
+    return ", ".join(f"{url_for('static', filename='img/' + path)} {w}w"
+                     for w, path in sorted(by_width.items(), key=lambda kv: int(kv[0])))
+
+
+def image_type(name):
+    entry = _manifest().get(name) if name else None
+    return f"image/{entry['fallback']}" if entry else ""
+
+
+@click.command("build-images")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+@click.option("--force", is_flag=True, help="Rebuild every image even if unchanged.")
+@with_appcontext
+def build_images_command(workers, force):
+    """Generate resized WebP/JPEG variants of static/img."""
+    widths = current_app.config.get("IMAGE_WIDTHS", DEFAULT_WIDTHS)
+    source_dir = Path(current_app.static_folder) / "img"
+    built, skipped, removed = build(source_dir, widths, workers, force, log=click.echo)
+    click.echo(f"Images: {built} built, {skipped} unchanged, {removed} stale variants removed.")
+
+
+def init_app(app):
+    app.extensions["image_manifest"] = ManifestFile(Path(app.static_folder) / "img" / VARIANTS_DIR / MANIFEST)
+    app.add_template_global(image_url)
+    app.add_template_global(image_srcset)
+    app.add_template_global(image_type)
+    app.cli.add_command(build_images_command)
@@ -0,0 +1,253 @@
+# utils/instrumentation.py
+"""
+Per-request cost accounting: SQL, templates, response size.
+
+SQLAlchemy's before/after_cursor_execute events time every statement;
+Flask's template signals time render_template(). Per request the totals
+land in `g` and come back to the client as a Server-Timing header
+(visible in the browser's network panel):
+
+    Server-Timing: db;dur=12.4;desc="5 queries", db-max;dur=9.8, tpl;dur=3.1, app;dur=21.7
+
+In debug mode db-max also carries the (truncated) slowest statement. The
+same totals feed per-endpoint counters and histograms served in
+Prometheus text format at METRICS_PATH (default /metrics), to an admin
+session or a scraper sending `Authorization: Bearer <METRICS_TOKEN>`.
+Metrics are per process; with several gunicorn workers each scrape sees
+the worker that answered it.
+
+Any statement slower than SLOW_QUERY_MS is logged as a warning, also
+outside requests (CLI commands, the write-behind flusher). Parameters are
+never logged.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+
+from flask import (abort, before_render_template, current_app, g, has_app_context, has_request_context, request,
+                   session, template_rendered)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+# ------------------------------------------------------------------
+# Metric registry
+# ------------------------------------------------------------------
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+    """Thread-safe counters and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, kind, text):
+        self._help[name] = (kind, text)
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, buckets, labels, value):
+        with self._lock:
+            key = (name, labels)
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (h.buckets, list(h.counts), h.sum)) for k, h in self._histograms.items())
+
+        lines, seen = [], set()
+
+        def header(name):
+            if name not in seen and name in self._help:
+                kind, text = self._help[name]
+                lines.extend((f"# HELP {name} {text}", f"# TYPE {name} {kind}"))
+            seen.add(name)
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), (buckets, counts, total) in histograms:
+            header(name)
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _number(value):
+    return value if isinstance(value, str) else repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _describe(metrics):
+    metrics.describe("http_requests_total", "counter", "Requests served, by endpoint, method and status.")
+    metrics.describe("http_request_duration_seconds", "histogram", "Wall time per request.")
+    metrics.describe("http_response_size_bytes", "histogram", "Response body size, when known up front.")
+    metrics.describe("db_queries_per_request", "histogram", "SQL statements executed per request.")
+    metrics.describe("db_time_seconds_total", "counter", "Time spent in SQL statements during requests.")
+    metrics.describe("template_render_seconds_total", "counter", "Time spent in render_template().")
+    metrics.describe("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_MS.")
+
+
+# ------------------------------------------------------------------
+# SQL timing
+# ------------------------------------------------------------------
+def _enabled():
+    return has_app_context() and "instrumentation" in current_app.extensions
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if not _enabled():
+        return
+
+    if has_request_context() and "request_cost" in g:
+        cost = g.request_cost
+        cost["queries"] += 1
+        cost["db"] += elapsed
+        if elapsed >= cost["db_max"]:
+            cost["db_max"], cost["slowest"] = elapsed, statement
+
+    threshold = current_app.config.get("SLOW_QUERY_MS", 200)
+    if threshold and elapsed * 1000 >= threshold:
+        current_app.extensions["instrumentation"].inc("db_slow_queries_total")
+        where = f" during {request.method} {request.path}" if has_request_context() else ""
+        current_app.logger.warning("Slow query (%.1f ms)%s: %s", elapsed * 1000, where,
+                                   " ".join(statement.split())[:1000])
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+# ------------------------------------------------------------------
+# Request and template timing
+# ------------------------------------------------------------------
+def _start_request():
+    g.request_cost = {"start": time.perf_counter(), "queries": 0, "db": 0.0, "db_max": 0.0,
+                      "slowest": None, "tpl": 0.0, "tpl_start": []}
+
+
+def _before_render(sender, template, context, **extra):
+    if "request_cost" in g:
+        g.request_cost["tpl_start"].append(time.perf_counter())
+
+
+def _rendered(sender, template, context, **extra):
+    if "request_cost" in g and g.request_cost["tpl_start"]:
+        g.request_cost["tpl"] += time.perf_counter() - g.request_cost["tpl_start"].pop()
+
+
+def _finish_request(response):
+    cost = g.pop("request_cost", None)
+    if cost is None:
+        return response
+    total = time.perf_counter() - cost["start"]
+
+    timings = [f'db;dur={cost["db"] * 1000:.1f};desc="{cost["queries"]} queries"']
+    if cost["queries"]:
+        slowest = f'db-max;dur={cost["db_max"] * 1000:.1f}'
+        if current_app.debug:  # statement text only where nobody else reads the headers
+            text = " ".join(cost["slowest"].split())[:120].replace("\\", "").replace('"', "'")
+            slowest += f';desc="{text}"'
+        timings.append(slowest)
+    if cost["tpl"]:
+        timings.append(f'tpl;dur={cost["tpl"] * 1000:.1f}')
+    timings.append(f"app;dur={total * 1000:.1f}")
+    response.headers.add("Server-Timing", ", ".join(timings))
+
+    metrics = current_app.extensions["instrumentation"]
+    endpoint = request.url_rule.rule if request.url_rule else "<unmatched>"
+    labels = (("endpoint", endpoint),)
+    metrics.inc("http_requests_total", labels + (("method", request.method), ("status", str(response.status_code))))
+    metrics.observe("http_request_duration_seconds", DURATION_BUCKETS, labels, total)
+    metrics.observe("db_queries_per_request", QUERY_BUCKETS, labels, cost["queries"])
+    metrics.inc("db_time_seconds_total", labels, cost["db"])
+    if cost["tpl"]:
+        metrics.inc("template_render_seconds_total", labels, cost["tpl"])
+    # Never for streamed bodies: measuring them would buffer the whole stream
+    size = response.content_length if response.is_streamed else response.calculate_content_length()
+    if size is not None:
+        metrics.observe("http_response_size_bytes", SIZE_BUCKETS, labels, size)
+    return response
+
+
+def _may_scrape():
+    if session.get("is_admin"):
+        return True
+    token = current_app.config.get("METRICS_TOKEN")
+    sent = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return bool(token) and hmac.compare_digest(sent.encode(), token.encode())
+
+
+def metrics_view():
+    if not _may_scrape():
+        abort(403)
+    body = current_app.extensions["instrumentation"].render()
+    return current_app.response_class(body, mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+def init_app(app):
+    if not app.config.get("INSTRUMENTATION", True):
+        return
+    metrics = Metrics()
+    _describe(metrics)
+    app.extensions["instrumentation"] = metrics
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+    path = app.config.get("METRICS_PATH", "/metrics")
+    if path:
+        app.add_url_rule(path, "metrics", metrics_view)
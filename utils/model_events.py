@@ -0,0 +1,75 @@
+# utils/model_events.py
+"""
+Commit-time change notifications for in-process caches and indexes.
+
+Handlers subscribe to a model and are called once per committed
+transaction with the rows of that model that were inserted, updated or
+deleted in it. Changes are captured at flush time (while the column
+values are still loaded) and only delivered after the commit succeeds,
+so a rolled-back transaction never reaches a cache.
+
+Writes that bypass the ORM unit of work (Core inserts, bulk updates) are
+not seen here; code doing those can call `notify()` itself.
+"""
+
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+Change = namedtuple("Change", "op id values")  # op: "insert" | "update" | "delete"
+
+_handlers = {}  # model -> [handler(changes)]
+_PENDING = "model_events.pending"
+
+
+def subscribe(model, handler):
+    """Call handler(changes) after every commit that touched `model`."""
+    _handlers.setdefault(model, [])
+    if handler not in _handlers[model]:
+        _handlers[model].append(handler)
+
+
+def notify(model, changes):
+    """Deliver changes made outside the ORM (e.g. Core bulk writes)."""
+    for handler in _handlers.get(model, ()):
+        try:
+            handler(changes)
+        except Exception:
+            current_app.logger.exception("model_events handler %r failed", handler)
+
+
+def _snapshot(obj):
+    state = inspect(obj)
+    values = {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+    return type(obj), values.get("id", state.identity[0] if state.identity else None), values
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session, flush_context):
+    if not _handlers:
+        return
+    pending = session.info.setdefault(_PENDING, [])
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if type(obj) in _handlers and (op != "update" or session.is_modified(obj)):
+                model, row_id, values = _snapshot(obj)
+                pending.append((model, Change(op, row_id, values)))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    by_model = {}
+    for model, change in pending:
+        by_model.setdefault(model, []).append(change)
+    for model, changes in by_model.items():
+        notify(model, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING, None)
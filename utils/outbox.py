@@ -0,0 +1,321 @@
+# utils/outbox.py
+"""
+Notification outbox: emails leave after the request, never during it.
+
+Registration and booking status changes insert their notices into
+notification_outbox inside the same transaction (enqueue()), so a notice
+exists exactly when the change committed and a request only ever pays
+for one extra INSERT. A worker then drains the table:
+
+  - claim: one UPDATE marks up to OUTBOX_BATCH_SIZE due rows "sending"
+    with a lease (next_attempt_at = now + OUTBOX_LEASE), so parallel
+    workers never pick the same rows and rows of a crashed worker come
+    back once the lease runs out;
+  - send: the whole batch goes through one SMTP connection, which the
+    mailer keeps open for the next batch (utils/email_utils.py);
+  - record: sent rows are marked "sent"; failed ones get exponential
+    backoff (OUTBOX_RETRY_BASE * 2^(attempt-1), capped at OUTBOX_RETRY_MAX,
+    with jitter) and end up "failed" after OUTBOX_MAX_ATTEMPTS or on a
+    permanent (5xx) SMTP reply.
+
+Delivery is at least once: a worker that dies between sending and
+recording resends that batch after the lease.
+
+The worker runs either as `flask run-outbox` (a separate process) or, with
+OUTBOX_WORKER=thread, as a daemon thread in each web process. The thread
+starts with the process's first request, drains what is already due,
+then polls every OUTBOX_POLL_INTERVAL seconds and wakes up right after
+every commit that queued something.
+"""
+
+import atexit
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import db, Event, NotificationOutbox, Resource
+from utils import email_utils
+
+ACTIVE = ("pending", "sending")
+_WAKE = "outbox.wake"
+
+table = NotificationOutbox.__table__
+
+
+# ------------------------------------------------------------------
+# Messages
+# ------------------------------------------------------------------
+def _registration_confirmed(payload):
+    event = db.session.get(Event, payload["event_id"])
+    title = event.title if event else "the event"
+    when = f" on {event.date:%d %b %Y}" if event and event.date else ""
+    where = f" at {event.location}" if event and event.location else ""
+    return (f"Registration confirmed: {title}",
+            f"Hi {payload.get('name') or 'there'},\n\n"
+            f"you are registered for {title}{when}{where}.\n"
+            f"Registration number: {payload['registration_id']}\n")
+
+
+def _booking_status(payload, decision):
+    resource = db.session.get(Resource, payload["resource_id"])
+    name = resource.name if resource else "resource"
+    units = f"{payload.get('quantity') or 1} x {name}"
+    event_name = f" for {payload['event_name']}" if payload.get("event_name") else ""
+    return (f"Booking #{payload['booking_id']} {decision}: {name}",
+            f"Your booking of {units}{event_name} from {payload['start_date']} to {payload['end_date']} "
+            f"has been {decision}.\n")
+
+
+MESSAGES = {
+    "plain": lambda p: (p["subject"], p["body"]),
+    "registration_confirmed": _registration_confirmed,
+    "booking_approved": lambda p: _booking_status(p, "approved"),
+    "booking_rejected": lambda p: _booking_status(p, "rejected"),
+}
+
+
+def registration_confirmations(created):
+    """Notices for new registrations: (row as given to insert_registrations, registration id) pairs."""
+    return [{"kind": "registration_confirmed", "recipient": row.get("email"),
+             "payload": {"registration_id": rid, "event_id": row["event_id"], "name": row.get("name")}}
+            for row, rid in created]
+
+
+def booking_notices(bookings, status):
+    """Notices for bookings that just became Approved / Rejected (objects or rows with booking columns)."""
+    kind = {"Approved": "booking_approved", "Rejected": "booking_rejected"}[status]
+    return [{"kind": kind, "recipient": b.email,
+             "payload": {"booking_id": b.id, "resource_id": b.resource_id, "event_name": b.event_name,
+                         "quantity": b.quantity or 1, "start_date": str(b.start_date),
+                         "end_date": str(b.end_date)}}
+            for b in bookings]
+
+
+# ------------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------------
+def enqueue(messages):
+    """
+    Insert messages ({kind, recipient, payload}) within the current
+    transaction of db.session; messages without a recipient are dropped.
+    The caller commits.
+    """
+    now = datetime.utcnow()
+    rows = [dict(m, status="pending", attempts=0, next_attempt_at=now, created_at=now)
+            for m in messages if m.get("recipient")]
+    if rows:
+        db.session.execute(insert(table), rows)
+        db.session.info[_WAKE] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker(session):
+    if session.info.pop(_WAKE, False) and has_app_context():
+        worker = current_app.extensions.get("outbox_worker")
+        if worker is not None:
+            worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_WAKE, None)
+
+
+# ------------------------------------------------------------------
+# Draining
+# ------------------------------------------------------------------
+def claim(conn, batch, lease):
+    """Mark up to `batch` due rows as being sent by us and return them."""
+    now = datetime.utcnow()
+    due = (table.c.status.in_(ACTIVE), table.c.next_attempt_at <= now)
+    if conn.execute(select(table.c.id).where(*due).limit(1)).first() is None:
+        return []  # idle polls stay reads; an UPDATE would take the SQLite write lock
+    oldest = select(table.c.id).where(*due).order_by(table.c.id).limit(batch)
+    # `due` again on the outer statement: a row taken by a concurrent claim no longer matches
+    return conn.execute(
+        update(table)
+        .where(table.c.id.in_(oldest.scalar_subquery()), *due)
+        .values(status="sending", next_attempt_at=now + timedelta(seconds=lease))
+        .returning(table.c.id, table.c.kind, table.c.recipient, table.c.payload, table.c.attempts)
+    ).all()
+
+
+def backoff(attempt, base, cap):
+    """Seconds before retry number `attempt` (1-based), with +-20% jitter so retries spread out."""
+    return min(base * 2 ** (attempt - 1), cap) * random.uniform(0.8, 1.2)
+
+
+def _preload(rows):
+    """
+    Load the events and resources a batch refers to with one query each.
+    The session's identity map only holds weak references, so the caller
+    keeps the returned list alive while the messages are rendered.
+    """
+    wanted = {Event: set(), Resource: set()}
+    for row in rows:
+        if row.kind == "registration_confirmed":
+            wanted[Event].add(row.payload["event_id"])
+        elif row.kind.startswith("booking_"):
+            wanted[Resource].add(row.payload["resource_id"])
+    return [obj for model, ids in wanted.items() if ids for obj in model.query.filter(model.id.in_(ids))]
+
+
+def deliver(mailer, rows):
+    """Send claimed rows; returns (sent ids, [(row, error)])."""
+    sent, failed = [], []
+    for i, row in enumerate(rows):
+        try:
+            subject, body = MESSAGES[row.kind](row.payload)
+            mailer.send(row.recipient, subject, body)
+        except Exception as e:
+            failed.append((row, e))
+            if email_utils.is_connection_error(e):
+                # Server unreachable: the rest of the batch would only wait for the same timeout
+                failed.extend((rest, e) for rest in rows[i + 1:])
+                break
+        else:
+            sent.append(row.id)
+    return sent, failed
+
+
+def record(conn, sent, failed, config):
+    now = datetime.utcnow()
+    if sent:
+        conn.execute(update(table).where(table.c.id.in_(sent))
+                     .values(status="sent", sent_at=now, attempts=table.c.attempts + 1, last_error=None))
+    if failed:
+        max_attempts = config.get("OUTBOX_MAX_ATTEMPTS", 8)
+        base, cap = config.get("OUTBOX_RETRY_BASE", 30), config.get("OUTBOX_RETRY_MAX", 3600)
+        params = []
+        for row, error in failed:
+            attempt = row.attempts + 1
+            give_up = attempt >= max_attempts or email_utils.is_permanent(error)
+            params.append({
+                "row_id": row.id,
+                "new_status": "failed" if give_up else "pending",
+                "retry_at": now + timedelta(seconds=0 if give_up else backoff(attempt, base, cap)),
+                "error": f"{type(error).__name__}: {error}"[:1000],
+            })
+        conn.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(
+                status=bindparam("new_status"), next_attempt_at=bindparam("retry_at"),
+                attempts=table.c.attempts + 1, last_error=bindparam("error")),
+            params,
+        )
+
+
+def run_once(mailer, config):
+    """Claim, send and record one batch. Returns how many rows were claimed."""
+    with db.engine.begin() as conn:
+        rows = claim(conn, config.get("OUTBOX_BATCH_SIZE", 50), config.get("OUTBOX_LEASE", 300))
+    if not rows:
+        return 0
+    referenced = _preload(rows)
+    sent, failed = deliver(mailer, rows)
+    referenced.clear()
+    with db.engine.begin() as conn:
+        record(conn, sent, failed, config)
+    db.session.remove()  # drop message lookups (events, resources) between batches
+    for row, error in failed:
+        current_app.logger.warning("Outbox message %s to %s failed: %s", row.id, row.recipient, error)
+    return len(rows)
+
+
+def drain(mailer, config):
+    """Send everything that is due now. Returns the number of rows processed."""
+    total = 0
+    while True:
+        claimed = run_once(mailer, config)
+        total += claimed
+        if claimed < config.get("OUTBOX_BATCH_SIZE", 50):
+            return total
+
+
+class OutboxWorker:
+    """Background thread draining the outbox inside a web process (OUTBOX_WORKER=thread)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.poll_interval = app.config.get("OUTBOX_POLL_INTERVAL", 1.0)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def wake(self):
+        self._ensure_started()
+        self._wake.set()
+
+    def _ensure_started(self):
+        # Threads do not survive a fork, so (re)start lazily in each worker
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+
+    def _run(self):
+        mailer = email_utils.mailer_from_config(self.app.config)
+        try:
+            while not self._stop.is_set():
+                try:
+                    with self.app.app_context():
+                        drain(mailer, self.app.config)
+                except Exception:
+                    self.app.logger.exception("Outbox batch failed")
+                mailer.close_if_idle()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            mailer.close()
+
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+@click.command("run-outbox")
+@click.option("--once", is_flag=True, help="Send what is due now and exit.")
+@with_appcontext
+def run_outbox_command(once):
+    """Send queued notification emails (runs until interrupted)."""
+    app = current_app._get_current_object()
+    mailer = email_utils.mailer_from_config(app.config)
+    try:
+        while True:
+            sent = drain(mailer, app.config)
+            if sent:
+                click.echo(f"Processed {sent} message(s)")
+            if once:
+                return
+            mailer.close_if_idle()
+            time.sleep(app.config.get("OUTBOX_POLL_INTERVAL", 1.0))
+    finally:
+        mailer.close()
+
+
+def init_app(app):
+    app.cli.add_command(run_outbox_command)
+    if app.config.get("OUTBOX_WORKER") == "thread":
+        worker = OutboxWorker(app)
+        app.extensions["outbox_worker"] = worker
+        # Not at import: a preloading server would fork the thread away. The check is a pid compare.
+        app.before_request(worker._ensure_started)
+        atexit.register(worker.stop)
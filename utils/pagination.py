@@ -0,0 +1,81 @@
+# utils/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+Instead of OFFSET/LIMIT (which gets slower the deeper you page), every page
+continues from the last row of the previous one using a cursor built from
+the sort column and the primary key, e.g. (created_at, id).
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(value, row_id):
+    """Turn (sort value, id) into an opaque url-safe token."""
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, sort_col):
+    """Inverse of encode_cursor. Returns (value, id) or raises ValueError."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        row_id = int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    python_type = sort_col.type.python_type
+    try:
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None and python_type is date:
+            value = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return value, row_id
+
+
+def page_size(raw, default=DEFAULT_PAGE_SIZE):
+    """Parse the ?limit= argument, clamped to 1..MAX_PAGE_SIZE."""
+    try:
+        size = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, sort_col, id_col, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """
+    Fetch one page of `query` ordered by (sort_col, id_col).
+
+    Returns (rows, next_cursor). next_cursor is None on the last page.
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_col)
+        key = tuple_(sort_col, id_col)
+        query = query.filter(key < (value, last_id) if descending else key > (value, last_id))
+
+    if descending:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+
+    return rows, next_cursor
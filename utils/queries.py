@@ -0,0 +1,35 @@
+# utils/queries.py
+"""
+Query shapes for the admin and list views.
+
+Each function returns a ready-to-filter query that already knows which
+related rows it needs, so templates and JSON serializers never trigger a
+lazy load per row (the classic N+1 problem).
+"""
+
+from sqlalchemy.orm import defer, joinedload
+
+from models import Event, Resource, Booking, Registration
+
+
+def admin_bookings():
+    """Bookings with their resource name joined in (many-to-one, no row fan-out)."""
+    return Booking.query.options(
+        joinedload(Booking.resource).load_only(Resource.name)
+    )
+
+
+def admin_registrations():
+    """Registrations with their event title joined in."""
+    return Registration.query.options(
+        joinedload(Registration.event).load_only(Event.title)
+    )
+
+
+def listed_events():
+    """Event cards only show the short description; skip the long text column."""
+    return Event.query.options(defer(Event.description_long))
+
+
+def listed_resources():
+    return Resource.query
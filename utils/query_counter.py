@@ -0,0 +1,34 @@
+# utils/query_counter.py
+"""
+Count the SQL statements an engine executes inside a `with` block.
+
+    with QueryCounter(db.engine) as qc:
+        client.get("/admin/api/bookings")
+    assert qc.count <= 3
+
+Used by the tests to make sure views run a constant number of queries.
+"""
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return False
@@ -0,0 +1,96 @@
+# utils/resource_import.py
+"""
+Bulk resource import for the admin: CSV or JSON in, one INSERT out.
+
+Columns / keys: name (required), category, quantity (positive integer,
+default 1) and image (file name, default placeholder.jpg); anything else
+is ignored. Every row is validated before anything is written, and one
+bad row rejects the whole import with per-row errors, so a fixed file can
+simply be sent again without creating duplicates.
+
+The rows go in as a single executemany INSERT in one transaction. That
+bypasses the ORM unit of work, so the commit is announced through
+model_events.notify() for the response cache and the typeahead index.
+"""
+
+import csv
+import io
+
+from sqlalchemy import insert
+
+from models import db, Resource
+from utils import model_events
+
+FIELDS = ("name", "category", "quantity", "image")
+MAX_ROWS = 5000
+
+
+class ImportRowsError(ValueError):
+    """Raised with one message per bad row (row numbers count from 1, header excluded)."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s)")
+
+
+def read_csv(text):
+    """Records from CSV text with a header line; header names are case-insensitive."""
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    return [{(k or "").strip().lower(): v for k, v in record.items()} for record in reader]
+
+
+def read_json(data):
+    """Records from a JSON list, or an object with a "resources" list."""
+    if isinstance(data, dict):
+        data = data.get("resources")
+    if not isinstance(data, list):
+        raise ImportRowsError(['Expected a list of resources or {"resources": [...]}'])
+    return data
+
+
+def validate(records):
+    """Turn records into rows for INSERT, or raise ImportRowsError listing every problem."""
+    if not records:
+        raise ImportRowsError(["No resources to import"])
+    if len(records) > MAX_ROWS:
+        raise ImportRowsError([f"At most {MAX_ROWS} resources per import"])
+
+    rows, errors = [], []
+    for n, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            errors.append(f"Row {n}: expected an object")
+            continue
+        values = {f: str(record[f]).strip() if record.get(f) is not None else "" for f in FIELDS}
+        if not values["name"]:
+            errors.append(f"Row {n}: name is required")
+            continue
+        try:
+            quantity = int(values["quantity"] or 1)
+        except ValueError:
+            quantity = 0
+        if quantity < 1:
+            errors.append(f"Row {n}: quantity must be a positive integer")
+            continue
+        rows.append({"name": values["name"][:200], "category": values["category"][:100] or None,
+                     "quantity": quantity, "image": values["image"][:255] or "placeholder.jpg"})
+
+    if errors:
+        raise ImportRowsError(errors)
+    return rows
+
+
+def import_resources(rows):
+    """Insert validated rows in one transaction and return the new ids, in no particular order."""
+    try:
+        inserted = db.session.execute(
+            insert(Resource).returning(Resource.id, Resource.name, Resource.category,
+                                       Resource.quantity, Resource.image),
+            rows
+        ).all()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    model_events.notify(Resource, [model_events.Change("insert", row.id, dict(row._mapping)) for row in inserted])
+    return [row.id for row in inserted]
@@ -0,0 +1,202 @@
+# utils/response_cache.py
+"""
+Response cache for the public pages and JSON endpoints.
+
+A view decorated with `@cached("event", "event:{event_id}")` is stored
+under its path plus normalized query string, together with the current
+version of each of its tags. When a commit touches an Event or Resource,
+utils.model_events bumps the collection tag ("event") and the row tag
+("event:<id>"); the next request then builds a new key and re-renders, so
+only pages that can show the changed row are invalidated.
+
+Backends (RESPONSE_CACHE):
+    memory      per-process LRU bounded by RESPONSE_CACHE_MAX_BYTES
+    filesystem  pickled entries under RESPONSE_CACHE_DIR, shared by every
+                worker on the host (tag versions live there too)
+
+Only 200 responses to GET/HEAD are stored, and never ones that set a
+cookie or whose rendering read the session (those are per-visitor).
+Entries expire after RESPONSE_CACHE_TTL seconds regardless, which also
+covers writes that bypass the ORM.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request, session
+
+from models import Event, Resource
+from utils import model_events
+
+
+class MemoryBackend:
+    """Thread-safe LRU with a per-entry TTL and a cap on total body bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (expires, nbytes, value)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, ttl, nbytes):
+        if nbytes > self.max_bytes // 8:
+            return  # one huge page must not flush everything else
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, nbytes, value)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        self.size -= self._entries.pop(key)[1]
+
+    def version(self, tag):
+        return self._versions.get(tag, 0)
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class FileSystemBackend:
+    """One file per entry; tag versions are random tokens in small files."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        (self.directory / "tags").mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name, sub=""):
+        return self.directory / sub / hashlib.sha1(name.encode()).hexdigest()
+
+    def _write(self, path, data):
+        # Atomic replace so readers in other workers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            expires, value = pickle.loads(path.read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key, value, ttl, nbytes):
+        self._write(self._path(key), pickle.dumps((time.time() + ttl, value), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def version(self, tag):
+        try:
+            return self._path(tag, "tags").read_text()
+        except OSError:
+            return "0"
+
+    def bump(self, tag):
+        # A fresh random token rather than a counter: concurrent bumps from
+        # two workers can never land on the same value
+        self._write(self._path(tag, "tags"), os.urandom(8).hex().encode())
+
+    def clear(self):
+        for path in self.directory.iterdir():
+            if path.is_file():
+                path.unlink(missing_ok=True)
+
+
+def init_app(app):
+    kind = app.config.get("RESPONSE_CACHE")
+    if kind == "memory":
+        backend = MemoryBackend(app.config.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    elif kind == "filesystem":
+        backend = FileSystemBackend(app.config.get("RESPONSE_CACHE_DIR")
+                                    or os.path.join(app.instance_path, "response_cache"))
+    else:
+        return
+    app.extensions["response_cache"] = backend
+
+
+def _cache_key(backend, tags):
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if v != "")
+    versions = ",".join(f"{tag}={backend.version(tag)}" for tag in tags)
+    return f"{request.path}?{urlencode(args)}|{versions}"
+
+
+def cached(*tag_templates, ttl=None):
+    """
+    Cache a GET view's response. Tags are format strings over the view
+    arguments, e.g. cached("event", "event:{event_id}").
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**view_args):
+            backend = current_app.extensions.get("response_cache")
+            if backend is None or request.method not in ("GET", "HEAD"):
+                return view(**view_args)
+
+            tags = [t.format(**view_args) for t in tag_templates]
+            key = _cache_key(backend, tags)
+            hit = backend.get(key)
+            if hit is not None:
+                status, headers, body = hit
+                response = current_app.response_class(body, status=status, headers=headers)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = make_response(view(**view_args))
+            if (response.status_code == 200 and not response.direct_passthrough
+                    and "Set-Cookie" not in response.headers and not session.accessed):
+                body = response.get_data()
+                headers = [(k, v) for k, v in response.headers.items() if k != "Content-Length"]
+                backend.set(key, (200, headers, body),
+                            ttl or current_app.config.get("RESPONSE_CACHE_TTL", 300), len(body))
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate(*tags):
+    backend = current_app.extensions.get("response_cache")
+    if backend is not None:
+        for tag in tags:
+            backend.bump(tag)
+
+
+def _on_commit(tag):
+    def handler(changes):
+        invalidate(tag, *{f"{tag}:{change.id}" for change in changes})
+    return handler
+
+
+model_events.subscribe(Event, _on_commit("event"))
+model_events.subscribe(Resource, _on_commit("resource"))
@@ -0,0 +1,103 @@
+# utils/search.py
+"""
+Full-text search for the event and resource list pages.
+
+On SQLite the searchable columns are mirrored into FTS5 tables
+(`event_fts`, `resource_fts`, see models.py) and matched with a prefix
+query ranked by bm25, so "hack" finds "Hackathon 2024" with the title
+weighted above the descriptions. On PostgreSQL the same columns go through
+to_tsvector/to_tsquery against a GIN expression index and are ranked with
+ts_rank. Anything else, or a database whose FTS tables have not been
+created yet, falls back to ILIKE.
+
+SEARCH_BACKEND=like forces the fallback everywhere.
+"""
+
+import re
+import weakref
+
+from flask import current_app
+from sqlalchemy import and_, column, func, literal_column, or_, table, text
+
+from models import db, Event, Resource, FTS_COLUMNS, tsvector_sql
+
+# bm25 weight per FTS column, in FTS_COLUMNS order
+WEIGHTS = {
+    "event": (10.0, 4.0, 2.0, 1.0),
+    "resource": (10.0, 2.0),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_fts_tables = weakref.WeakKeyDictionary()
+
+
+def tokens(q):
+    return _TOKEN.findall((q or "").lower())
+
+
+def backend(model):
+    """'fts5', 'postgres' or 'like' for the database `model` lives in."""
+    if current_app.config.get("SEARCH_BACKEND", "auto") == "like":
+        return "like"
+    engine = db.session.get_bind(mapper=model.__mapper__)
+    if engine.dialect.name == "postgresql":
+        return "postgres"
+    if engine.dialect.name == "sqlite" and _has_fts_table(engine, model.__tablename__):
+        return "fts5"
+    return "like"
+
+
+def _has_fts_table(engine, name):
+    known = _fts_tables.setdefault(engine, {})
+    if name not in known:
+        with engine.connect() as conn:
+            known[name] = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{name}_fts",)
+            ).first() is not None
+    return known[name]
+
+
+def apply(query, model, q, ranked=True):
+    """
+    Restrict `query` to rows of `model` matching every word of `q`.
+
+    Words match as prefixes. With ranked=True the best matches come first;
+    the ILIKE fallback has no ranking and leaves the order to the caller.
+    Returns (query, is_ranked).
+    """
+    words = tokens(q)
+    if not words:
+        return query, False
+
+    kind = backend(model)
+    name = model.__tablename__
+
+    if kind == "fts5":
+        fts = table(f"{name}_fts", column("rowid"))
+        query = query.join(fts, fts.c.rowid == model.id).filter(
+            text(f"{name}_fts MATCH :fts_query").bindparams(fts_query=" ".join(f'"{w}"*' for w in words))
+        )
+        if ranked:
+            weights = ", ".join(str(w) for w in WEIGHTS[name])
+            query = query.order_by(literal_column(f"bm25({name}_fts, {weights})"))
+        return query, ranked
+
+    if kind == "postgres":
+        document = literal_column(tsvector_sql(name))
+        tsquery = func.to_tsquery("english", " & ".join(f"{w}:*" for w in words))
+        query = query.filter(document.op("@@")(tsquery))
+        if ranked:
+            query = query.order_by(func.ts_rank(document, tsquery).desc())
+        return query, ranked
+
+    columns = [getattr(model, c) for c in FTS_COLUMNS[name]]
+    query = query.filter(and_(*[or_(*[c.ilike(f"%{w}%") for c in columns]) for w in words]))
+    return query, False
+
+
+def events(query, q, ranked=True):
+    return apply(query, Event, q, ranked)
+
+
+def resources(query, q, ranked=True):
+    return apply(query, Resource, q, ranked)
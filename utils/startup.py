@@ -0,0 +1,104 @@
+# utils/startup.py
+"""
+Startup cost accounting.
+
+create_app() wraps each of its steps in a `PhaseTimer` and leaves the
+result in app.extensions["startup_phases"]. `flask startup-profile` starts
+fresh interpreters with `python -X importtime`, imports app.py and calls
+create_app(), then reports the import and per-phase init cost together
+with the packages that dominate import time. Measuring in a new process
+matters: inside the running CLI every module is already imported.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+# Runs in the child interpreter; prints one JSON line on stdout
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app as module
+t1 = time.perf_counter()
+application = module.create_app()
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1,
+                  "phases": application.extensions["startup_phases"]}))
+"""
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase: `with timer("models"): ...`."""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+
+def parse_importtime(stderr):
+    """Self time (seconds) per top-level package from `-X importtime` output."""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        totals[name.strip().split(".")[0]] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def measure(root, runs=3):
+    """Profile `runs` cold starts; returns medians plus the import breakdown of the last run."""
+    samples, packages = [], {}
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE],
+                              cwd=root, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise click.ClickException(f"startup probe failed:\n{proc.stderr[-2000:]}")
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        packages = parse_importtime(proc.stderr)
+
+    phase_names = [name for name, _ in samples[0]["phases"]]
+    return {
+        "import": statistics.median(s["import"] for s in samples),
+        "create_app": statistics.median(s["create_app"] for s in samples),
+        "phases": [(name, statistics.median(dict(s["phases"])[name] for s in samples))
+                   for name in phase_names],
+        "packages": packages,
+    }
+
+
+@click.command("startup-profile")
+@click.option("--runs", type=click.IntRange(min=1), default=3, show_default=True, help="Cold starts to take the median of.")
+@click.option("--top", type=int, default=12, show_default=True, help="Packages to list by import time.")
+@with_appcontext
+def startup_profile_command(runs, top):
+    """Report cold-start import time and per-phase create_app() cost."""
+    result = measure(current_app.root_path, runs)
+    ms = lambda seconds: f"{seconds * 1000:8.1f} ms"  # noqa: E731
+    click.echo(f"Cold start, median of {runs}:")
+    click.echo(f"  import app      {ms(result['import'])}")
+    click.echo(f"  create_app()    {ms(result['create_app'])}")
+    for name, seconds in result["phases"]:
+        click.echo(f"    {name:<13} {ms(seconds)}")
+    click.echo(f"  total           {ms(result['import'] + result['create_app'])}")
+
+    click.echo(f"Import time by package (self time, top {top}):")
+    for name, seconds in sorted(result["packages"].items(), key=lambda kv: -kv[1])[:top]:
+        click.echo(f"  {name:<20} {ms(seconds)}")
@@ -0,0 +1,222 @@
+# utils/typeahead.py
+"""
+In-memory typeahead for resource names and event titles.
+
+Every word of every name is a key in a sorted array ("wireless mic" is
+stored under "wireless mic" and "mic"), so a prefix lookup is one bisect
+plus a forward scan, whatever the size of the table. First words and
+later words are kept in separate arrays: matches on the first word rank
+above matches later in the name, shorter names first, and later-word
+matches are only scanned when there are not enough first-word ones. Each
+scan stops after SCAN_LIMIT matches, which bounds the cost of one-letter
+prefixes.
+
+The index is built from the database on first use in each worker and kept
+current by utils.model_events as rows are added, renamed or deleted through
+the ORM. Every TYPEAHEAD_TTL seconds it is rebuilt in a background thread,
+so changes made by other workers or by bulk loads show up; lookups keep
+using the current index until the new one is ready.
+"""
+
+import bisect
+import re
+import threading
+import time
+
+from flask import current_app, jsonify, request
+
+from models import db, Event, Resource
+from utils import model_events
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+SCAN_LIMIT = 1000
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text):
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+class PrefixIndex:
+    """Sorted (key, word position, id) entries over the words of each label, first words apart."""
+
+    def __init__(self, items=()):
+        self._labels = {}
+        self._lock = threading.Lock()
+        entries = ([], [])  # first words, later words
+        for item_id, label in items:
+            self._labels[item_id] = label
+            for entry in self._entries_for(item_id, label):
+                entries[entry[1] > 0].append(entry)
+        self._entries = [sorted(part) for part in entries]
+        self._keys = [[e[0] for e in part] for part in self._entries]
+
+    def __len__(self):
+        return len(self._labels)
+
+    @staticmethod
+    def _entries_for(item_id, label):
+        words = normalize(label).split(" ")
+        return [(" ".join(words[i:]), i, item_id) for i in range(len(words)) if words[i]]
+
+    def add(self, item_id, label):
+        with self._lock:
+            self._remove(item_id)
+            self._labels[item_id] = label
+            for entry in self._entries_for(item_id, label):
+                entries, keys = self._entries[entry[1] > 0], self._keys[entry[1] > 0]
+                pos = bisect.bisect_left(entries, entry)
+                entries.insert(pos, entry)
+                keys.insert(pos, entry[0])
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id):
+        label = self._labels.pop(item_id, None)
+        if label is None:
+            return
+        for entry in self._entries_for(item_id, label):
+            entries, keys = self._entries[entry[1] > 0], self._keys[entry[1] > 0]
+            pos = bisect.bisect_left(entries, entry)
+            if pos < len(entries) and entries[pos] == entry:
+                del entries[pos]
+                del keys[pos]
+
+    def _scan(self, part, prefix):
+        """Ids of up to SCAN_LIMIT entries of one array whose key starts with `prefix`."""
+        keys, entries = self._keys[part], self._entries[part]
+        start = bisect.bisect_left(keys, prefix)
+        ids = []
+        for i in range(start, min(start + SCAN_LIMIT, len(keys))):
+            if not keys[i].startswith(prefix):
+                break
+            ids.append(entries[i][2])
+        return ids
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        """[(id, label)] whose name has a word starting with `prefix`."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            labels = self._labels
+            rank = lambda item_id: (len(labels[item_id]), labels[item_id])  # noqa: E731
+            results, seen = [], set()
+            for part in (0, 1):
+                for item_id in sorted(set(self._scan(part, prefix)) - seen, key=rank):
+                    seen.add(item_id)
+                    results.append((item_id, labels[item_id]))
+                if len(results) >= limit:
+                    break
+            return results[:limit]
+
+
+class Typeahead:
+    """A lazily built PrefixIndex over one text column of a model, refreshed in the background."""
+
+    def __init__(self, model, column, ttl=300):
+        self.model = model
+        self.column = column
+        self.ttl = ttl
+        self._index = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._pending = None  # changes seen while a background rebuild runs
+
+    def _build(self):
+        rows = db.session.query(self.model.id, getattr(self.model, self.column)).all()
+        return PrefixIndex(rows)
+
+    def index(self):
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build()
+                    self._built_at = time.monotonic()
+                index = self._index
+        elif time.monotonic() - self._built_at > self.ttl and self._pending is None:
+            with self._lock:
+                if self._pending is None and time.monotonic() - self._built_at > self.ttl:
+                    self._pending = []
+                    threading.Thread(target=self._rebuild, args=(current_app._get_current_object(),),
+                                     name="typeahead-rebuild", daemon=True).start()
+        return index
+
+    def _rebuild(self, app):
+        index = None
+        try:
+            with app.app_context():
+                index = self._build()
+        except Exception:
+            app.logger.exception("Typeahead rebuild for %s failed", self.model.__tablename__)
+        with self._lock:
+            if index is not None:
+                # Commits announced while the table was read may be missing from it
+                for changes in self._pending:
+                    self._apply(index, changes)
+                self._index = index
+            self._built_at = time.monotonic()  # after a failure, wait a TTL before the next try
+            self._pending = None
+
+    def apply(self, changes):
+        with self._lock:
+            if self._index is None:
+                return  # not built yet; the first lookup reads the table
+            if self._pending is not None:
+                self._pending.append(changes)
+            index = self._index
+        self._apply(index, changes)
+
+    def _apply(self, index, changes):
+        for change in changes:
+            if change.op == "delete":
+                index.remove(change.id)
+            elif self.column in change.values:
+                index.add(change.id, change.values[self.column])
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        return self.index().search(prefix, limit)
+
+
+def _on_commit(kind):
+    def handler(changes):
+        typeahead = current_app.extensions.get("typeahead", {}).get(kind)
+        if typeahead is not None:
+            typeahead.apply(changes)
+    return handler
+
+
+model_events.subscribe(Resource, _on_commit("resource"))
+model_events.subscribe(Event, _on_commit("event"))
+
+
+def init_app(app):
+    ttl = app.config.get("TYPEAHEAD_TTL", 300)
+    app.extensions["typeahead"] = {
+        "resource": Typeahead(Resource, "name", ttl),
+        "event": Typeahead(Event, "title", ttl),
+    }
+
+
+def suggest(kind, prefix, limit=DEFAULT_LIMIT):
+    return current_app.extensions["typeahead"][kind].suggest(prefix, limit)
+
+
+def suggestions_response(kind, label_key):
+    """JSON for /api/<kind>s/suggestions?q=&limit=; small and browser-cacheable."""
+    q = request.args.get("q", "")
+    try:
+        limit = max(1, min(int(request.args.get("limit", DEFAULT_LIMIT)), MAX_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    items = [{"id": item_id, label_key: label} for item_id, label in suggest(kind, q, limit)]
+    response = jsonify({"query": q, "suggestions": items})
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("TYPEAHEAD_MAX_AGE", 60)
+    response.add_etag()
+    return response.make_conditional(request)
@@ -0,0 +1,27 @@
+# utils/upsert.py
+"""
+Dialect-aware "insert, but skip rows that violate a unique index".
+
+    INSERT ... ON CONFLICT DO NOTHING   (SQLite, PostgreSQL)
+
+The statement supports executemany and RETURNING; only rows that were
+actually inserted come back.
+"""
+
+from sqlalchemy import insert
+
+from models import db
+
+
+def insert_ignore(model):
+    dialect = db.session.get_bind(mapper=model.__mapper__).dialect.name
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(model).on_conflict_do_nothing()
+
+    # Other backends: plain INSERT, duplicates raise IntegrityError
+    return insert(model)
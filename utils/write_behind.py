@@ -0,0 +1,192 @@
+# utils/write_behind.py
+"""
+Write-behind (group commit) ingestion for event registrations.
+
+With REGISTRATION_WRITE_BEHIND=1, /register-event validates the form and
+hands the row to a per-process queue instead of committing it itself. A
+background flusher thread drains the queue and inserts up to
+REGISTRATION_BATCH_SIZE rows per transaction, waiting at most
+REGISTRATION_FLUSH_INTERVAL seconds to fill a batch.
+
+The request blocks until the transaction containing its row has committed
+and then returns the registration id, so the acknowledgement is durable:
+a crash before the commit means the client never got an id.
+Under load one commit (and one SQLite write lock) is shared by a whole
+batch of requests instead of each paying for its own.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import and_, or_
+
+from models import db, Registration
+from utils import aggregates, outbox
+from utils.upsert import insert_ignore
+
+_STOP = object()
+
+
+class RegistrationWriter:
+    def __init__(self, app, batch_size=100, interval=0.05):
+        self.app = app
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, row):
+        """Queue a registration row; returns a Future resolving to (id, created)."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def _ensure_started(self):
+        # Threads do not survive a fork, so (re)start lazily in each worker
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                if self._pid is not None and self._pid != os.getpid():
+                    # Forked: whatever the parent had queued belongs to the parent's requests.
+                    # A flusher that died in this process leaves its queue to the new one.
+                    self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="registration-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5):
+        """Flush whatever is queued and stop the flusher thread."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        """
+        Insert a batch and resolve its futures. A failed batch is split in
+        halves and retried, so one bad row fails only its own request.
+        """
+        rows = [row for row, _ in batch]
+        try:
+            with self.app.app_context():
+                inserted = insert_registrations(rows)
+        except Exception as e:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                self._flush(batch[:middle])
+                self._flush(batch[middle:])
+                return
+            self.app.logger.exception("Registration insert failed")
+            batch[0][1].set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, inserted):
+            future.set_result(result)
+
+
+def insert_registrations(rows):
+    """
+    Insert rows in one transaction, skipping duplicates.
+
+    A row is a duplicate when its (event_id, regno), (event_id, email) or
+    idempotency_key already exists, including earlier in the same batch.
+    Returns one (registration_id, created) pair per row, in input order;
+    duplicates get the id of the existing registration and created=False.
+    """
+    try:
+        inserted = db.session.execute(
+            insert_ignore(Registration).returning(Registration.id, Registration.event_id, Registration.regno),
+            rows
+        ).all()
+
+        # RETURNING order is not guaranteed on SQLite; match rows back by value
+        new_ids = {(event_id, regno): registration_id for registration_id, event_id, regno in inserted}
+        results, missing = [], []
+        for i, row in enumerate(rows):
+            registration_id = new_ids.pop((row["event_id"], row["regno"]), None)
+            results.append((registration_id, True) if registration_id else None)
+            if registration_id is None:
+                missing.append(i)
+
+        if missing:
+            _resolve_duplicates(rows, results, missing)
+        created = [(row, result[0]) for row, result in zip(rows, results) if result[1]]
+        aggregates.record_registrations(db.session.connection(), [row for row, _ in created])
+        outbox.enqueue(outbox.registration_confirmations(created))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return results
+
+
+def _resolve_duplicates(rows, results, missing):
+    """Find the existing registration for each skipped row (one query)."""
+    keys = [rows[i].get("idempotency_key") for i in missing if rows[i].get("idempotency_key")]
+    conditions = [
+        and_(Registration.event_id == rows[i]["event_id"],
+             or_(Registration.regno == rows[i]["regno"], Registration.email == rows[i]["email"]))
+        for i in missing
+    ]
+    if keys:
+        conditions.append(Registration.idempotency_key.in_(keys))
+
+    existing = db.session.query(
+        Registration.id, Registration.event_id, Registration.regno,
+        Registration.email, Registration.idempotency_key
+    ).filter(or_(*conditions)).all()
+
+    by_key = {r.idempotency_key: r.id for r in existing if r.idempotency_key}
+    by_regno = {(r.event_id, r.regno): r.id for r in existing}
+    by_email = {(r.event_id, r.email): r.id for r in existing}
+    for i in missing:
+        row = rows[i]
+        registration_id = (by_key.get(row.get("idempotency_key"))
+                           or by_regno.get((row["event_id"], row["regno"]))
+                           or by_email.get((row["event_id"], row["email"])))
+        results[i] = (registration_id, False)
+
+
+def init_app(app):
+    if app.config.get("REGISTRATION_WRITE_BEHIND"):
+        writer = RegistrationWriter(
+            app,
+            batch_size=app.config.get("REGISTRATION_BATCH_SIZE", 100),
+            interval=app.config.get("REGISTRATION_FLUSH_INTERVAL", 0.05),
+        )
+        app.extensions["registration_writer"] = writer
+        atexit.register(writer.stop)
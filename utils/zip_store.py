@@ -0,0 +1,231 @@
+# utils/zip_store.py
+"""
+Serve images straight out of the UPLOADED_IMAGES_ZIP archive.
+
+The archive is memory-mapped once at startup and its central directory is
+parsed into a name -> member index (ZIP64 included), so nothing is ever
+extracted to disk and startup cost does not grow with the bundle's size.
+Members are addressable by their full path and by their bare file name,
+which is what Event.image / Resource.image store.
+
+Stored (uncompressed) members, which is what zip tools usually pick for
+JPEG/PNG, are sent as slices of the mapping. Deflated members are
+inflated on the fly. Both support conditional GET (ETag from the CRC-32
+and size in the central directory, Last-Modified from the member's
+timestamp) and single byte ranges.
+"""
+
+import mimetypes
+import mmap
+import os
+import posixpath
+import struct
+import zlib
+from collections import namedtuple
+from datetime import datetime
+
+from flask import abort, current_app, request
+from werkzeug.datastructures import Range
+from werkzeug.http import is_resource_modified
+
+EOCD = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR = struct.Struct("<4sLQL")
+ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+CENTRAL = struct.Struct("<4s6H3L5H2L")
+LOCAL = struct.Struct("<4s5H3L2H")
+
+STORED, DEFLATED = 0, 8
+CHUNK = 64 * 1024
+
+Member = namedtuple("Member", "name method crc compressed_size size header_offset modified")
+
+
+class ZipStore:
+    """Read-only, memory-mapped index over one zip archive."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._members = {}
+        self._data_offsets = {}
+        for member in self._read_central_directory():
+            self._members.setdefault(member.name, member)
+            self._members.setdefault(posixpath.basename(member.name), member)
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def __len__(self):
+        return len({m.name for m in self._members.values()})
+
+    def get(self, name):
+        return self._members.get(name)
+
+    def close(self):
+        self._map.close()
+
+    # -- central directory ------------------------------------------------
+    def _read_central_directory(self):
+        mm = self._map
+        # The end record sits in the last 22 bytes plus an optional comment (< 64 KB)
+        pos = mm.rfind(b"PK\x05\x06", max(0, len(mm) - EOCD.size - 0xFFFF))
+        if pos < 0:
+            raise ValueError(f"{self.path} is not a zip archive")
+        _, _, _, _, count, cd_size, cd_offset, _ = EOCD.unpack_from(mm, pos)
+
+        if 0xFFFFFFFF in (cd_size, cd_offset) or count == 0xFFFF:
+            locator = pos - ZIP64_LOCATOR.size
+            sig, _, zip64_offset, _ = ZIP64_LOCATOR.unpack_from(mm, locator)
+            if sig == b"PK\x06\x07":
+                fields = ZIP64_EOCD.unpack_from(mm, zip64_offset)
+                count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+
+        offset = cd_offset
+        for _ in range(count):
+            (sig, _, _, flags, method, mtime, mdate, crc, csize, usize,
+             name_len, extra_len, comment_len, _, _, _, header_offset) = CENTRAL.unpack_from(mm, offset)
+            if sig != b"PK\x01\x02":
+                raise ValueError(f"{self.path}: corrupt central directory")
+            start = offset + CENTRAL.size
+            raw_name = mm[start:start + name_len]
+            name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+            extra = mm[start + name_len:start + name_len + extra_len]
+            offset = start + name_len + extra_len + comment_len
+
+            if 0xFFFFFFFF in (usize, csize, header_offset):
+                usize, csize, header_offset = _zip64_sizes(extra, usize, csize, header_offset)
+            if name.endswith("/") or flags & 0x1 or method not in (STORED, DEFLATED):
+                continue  # directories, encrypted or unsupported members
+            yield Member(name, method, crc, csize, usize, header_offset, _dos_datetime(mdate, mtime))
+
+    def _data_offset(self, member):
+        # The local header's extra field can differ from the central one, so read it
+        offset = self._data_offsets.get(member.header_offset)
+        if offset is None:
+            sig, *_, name_len, extra_len = LOCAL.unpack_from(self._map, member.header_offset)
+            if sig != b"PK\x03\x04":
+                raise ValueError(f"{self.path}: bad local header for {member.name}")
+            offset = member.header_offset + LOCAL.size + name_len + extra_len
+            self._data_offsets[member.header_offset] = offset
+        return offset
+
+    # -- reading ------------------------------------------------------------
+    def iter_bytes(self, member, start=0, stop=None):
+        """Yield the member's uncompressed bytes [start, stop) in chunks."""
+        stop = member.size if stop is None else stop
+        base = self._data_offset(member)
+
+        if member.method == STORED:
+            for pos in range(start, stop, CHUNK):
+                yield self._map[base + pos:base + min(pos + CHUNK, stop)]
+            return
+
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        produced = 0
+        for pos in range(0, member.compressed_size, CHUNK):
+            data = inflater.decompress(self._map[base + pos:base + min(pos + CHUNK, member.compressed_size)])
+            lo, hi = max(start - produced, 0), min(stop - produced, len(data))
+            produced += len(data)
+            if lo < hi:
+                yield data[lo:hi]
+            if produced >= stop:
+                return
+        tail = inflater.flush()
+        lo, hi = max(start - produced, 0), min(stop - produced, len(tail))
+        if lo < hi:
+            yield tail[lo:hi]
+
+    def read(self, name):
+        return b"".join(self.iter_bytes(self._members[name]))
+
+
+def _zip64_sizes(extra, usize, csize, header_offset):
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, size = struct.unpack_from("<2H", extra, pos)
+        if tag == 0x0001:
+            values = iter(struct.unpack_from(f"<{size // 8}Q", extra, pos + 4))
+            if usize == 0xFFFFFFFF:
+                usize = next(values)
+            if csize == 0xFFFFFFFF:
+                csize = next(values)
+            if header_offset == 0xFFFFFFFF:
+                header_offset = next(values)
+            break
+        pos += 4 + size
+    return usize, csize, header_offset
+
+
+def _dos_datetime(d, t):
+    try:
+        return datetime((d >> 9) + 1980, (d >> 5) & 0xF, d & 0x1F, t >> 11, (t >> 5) & 0x3F, (t & 0x1F) * 2)
+    except ValueError:
+        return None
+
+
+# ------------------------------------------------------------------
+# Flask wiring
+# ------------------------------------------------------------------
+def serve_media(name):
+    """GET /media/<name>: one archive member, with ETag, Last-Modified and Range."""
+    store = current_app.extensions.get("zip_store")
+    member = store.get(name) if store is not None else None
+    if member is None:
+        abort(404)
+
+    etag = f"{member.crc:08x}-{member.size:x}"
+    response = current_app.response_class(
+        mimetype=mimetypes.guess_type(member.name)[0] or "application/octet-stream",
+        direct_passthrough=True
+    )
+    response.set_etag(etag)
+    if member.modified:
+        response.last_modified = member.modified
+    response.accept_ranges = "bytes"
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get("MEDIA_MAX_AGE", 86400)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=member.modified):
+        response.status_code = 304
+        return response
+
+    start, stop = 0, member.size
+    if request.range and _if_range_matches(etag, member.modified):
+        # One bounds per requested range; None for a range that lies outside the member
+        bounds = [Range(request.range.units, [r]).range_for_length(member.size) for r in request.range.ranges]
+        if not any(bounds):
+            response.status_code = 416
+            response.headers["Content-Range"] = f"bytes */{member.size}"
+            return response
+        if len(bounds) == 1:
+            start, stop = bounds[0]
+            response.status_code = 206
+            response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{member.size}"
+        # Several ranges would need multipart/byteranges; RFC 9110 lets us send the whole body instead
+
+    response.response = store.iter_bytes(member, start, stop)
+    response.content_length = stop - start
+    return response
+
+
+def _if_range_matches(etag, modified):
+    if_range = request.if_range
+    if if_range.etag is not None:
+        return if_range.etag == etag
+    if if_range.date is not None:
+        return modified is not None and if_range.date.replace(tzinfo=None) == modified
+    return True
+
+
+def init_app(app):
+    path = app.config.get("UPLOADED_IMAGES_ZIP")
+    if not path or not os.path.isfile(path):
+        return
+    try:
+        store = ZipStore(path)
+    except (OSError, ValueError) as e:
+        app.logger.warning("UPLOADED_IMAGES_ZIP %s not usable: %s", path, e)
+        return
+    app.extensions["zip_store"] = store
+    app.add_url_rule("/media/<path:name>", "media", serve_media)